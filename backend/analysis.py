@@ -8,28 +8,13 @@ import cv2
 import numpy as np
 from pathlib import Path
 import json
-from backend.config import PROCESSED_DIR
-
-
-def load_donut_image(image_path):
-    """
-    Load a donut iris image (Safe Zone ring).
-    
-    Args:
-        image_path: Path to the processed iris image
-    
-    Returns:
-        Grayscale image as numpy array
-    """
-    image_path = Path(image_path)
-    if not image_path.exists():
-        raise FileNotFoundError(f"Image not found: {image_path}")
-    
-    img = cv2.imread(str(image_path), cv2.IMREAD_GRAYSCALE)
-    if img is None:
-        raise ValueError(f"Could not load image: {image_path}")
-    
-    return img
+from backend import catalog
+from backend.artifact_writer import write_json, wait_for
+from backend.config import PROCESSED_DIR, WAVEFORMS_PATH, WAVEFORM_LENGTH
+from backend.spectrum import get_spectrum
+from backend.radial_profile import radial_mean_profile
+from backend.resolution import load_analysis_image
+from backend.waveform_bundle import update_waveform
 
 
 def compute_fft_spectrum(image):
@@ -42,20 +27,8 @@ def compute_fft_spectrum(image):
     Returns:
         2D magnitude spectrum (centered, log-scaled)
     """
-    # Convert to float for FFT
-    img_float = image.astype(np.float32)
-    
-    # Compute 2D FFT
-    fft_result = np.fft.fft2(img_float)
-    
-    # Shift zero frequency to center
-    fft_shifted = np.fft.fftshift(fft_result)
-    
-    # Compute magnitude spectrum (log scale for better visualization)
-    magnitude = np.abs(fft_shifted)
-    magnitude_log = np.log1p(magnitude)  # log1p = log(1+x) to avoid log(0)
-    
-    return magnitude_log
+    # Shared with the other consumers, so each image is transformed only once per run
+    return get_spectrum(image)
 
 
 def extract_radial_profile_waveform(spectrum, target_length=64):
@@ -71,53 +44,25 @@ def extract_radial_profile_waveform(spectrum, target_length=64):
         List of floats representing the radial profile waveform (normalized 0-1)
     """
     h, w = spectrum.shape
-    center_y, center_x = h // 2, w // 2
-    
-    # Calculate distance of each pixel from center
-    y, x = np.ogrid[:h, :w]
-    distances = np.sqrt((x - center_x)**2 + (y - center_y)**2)
-    
-    # Convert distances to integer radii
-    radii = distances.astype(int)
-    max_radius = int(np.max(radii))
-    
-    # Bin pixels by radius and calculate average magnitude for each ring
-    spectrum_array = []
-    for r in range(max_radius + 1):
-        # Find all pixels at this radius
-        mask = (radii == r)
-        if np.any(mask):
-            # Calculate average magnitude for this radius ring
-            avg_magnitude = float(np.mean(spectrum[mask]))
-            spectrum_array.append(avg_magnitude)
-        else:
-            # If no pixels at this radius, use 0
-            spectrum_array.append(0.0)
+    
+    # Average magnitude of each integer-radius ring (single pass over the pixels)
+    profile = radial_mean_profile(spectrum, center=(h // 2, w // 2))
     
     # Normalize to 0.0 - 1.0
-    if len(spectrum_array) > 0:
-        min_val = min(spectrum_array)
-        max_val = max(spectrum_array)
-        if max_val > min_val:
-            spectrum_array = [(x - min_val) / (max_val - min_val) for x in spectrum_array]
-        else:
-            # All values are the same, set to 0
-            spectrum_array = [0.0] * len(spectrum_array)
-    
-    # Downsample to target_length (64 data points)
-    if len(spectrum_array) > target_length:
-        # Resample using linear interpolation
-        indices = np.linspace(0, len(spectrum_array) - 1, target_length)
-        waveform = np.interp(indices, range(len(spectrum_array)), spectrum_array)
-        waveform = [float(x) for x in waveform]
-    elif len(spectrum_array) < target_length:
-        # Upsample using linear interpolation
-        indices = np.linspace(0, len(spectrum_array) - 1, target_length)
-        waveform = np.interp(indices, range(len(spectrum_array)), spectrum_array)
-        waveform = [float(x) for x in waveform]
+    min_val = profile.min()
+    max_val = profile.max()
+    if max_val > min_val:
+        profile = (profile - min_val) / (max_val - min_val)
     else:
-        # Already the right length
-        waveform = spectrum_array
+        # All values are the same, set to 0
+        profile = np.zeros_like(profile)
+    
+    # Resample to target_length (64 data points) using linear interpolation
+    if len(profile) != target_length:
+        indices = np.linspace(0, len(profile) - 1, target_length)
+        profile = np.interp(indices, np.arange(len(profile)), profile)
+    
+    waveform = profile.tolist()
     
     return waveform
 
@@ -180,44 +125,67 @@ def analyze_iris(image_path, output_path=None):
     """
     image_path = Path(image_path)
     
-    print(f"Analyzing: {image_path.name}")
+    # Load image at analysis resolution
+    image = load_analysis_image(image_path)
+    
+    # Confidence score from the catalog, or from the metadata sidecar if not catalogued
+    confidence = catalog.get_confidence(image_path.stem)
+    if confidence is None:
+        confidence = 0.0
+        metadata_path = image_path.parent / f"metadata_{image_path.stem}.json"
+        wait_for(metadata_path)
+        if metadata_path.exists():
+            try:
+                with open(metadata_path, 'r') as f:
+                    metadata = json.load(f)
+                    confidence = metadata.get("confidence", 0.0)
+            except:
+                pass
+    
+    return analyze_iris_image(image, output_path, confidence=confidence, label=image_path.name)
+
+
+def analyze_iris_image(image, output_path=None, confidence=0.0, label="in-memory image"):
+    """
+    Analyze an in-memory iris image (no disk read).
+    
+    Args:
+        image: Grayscale iris image at analysis resolution (numpy array, uint8)
+        output_path: Optional path to save JSON results
+        confidence: Pupil detection confidence to record with the features
+        label: Name used in the printed summary
     
-    # Load image
-    image = load_donut_image(image_path)
+    Returns:
+        Dictionary of extracted features including waveform
+    """
+    print(f"Analyzing: {label}")
     
     # Compute FFT spectrum
     spectrum = compute_fft_spectrum(image)
     
     # Extract 1D radial profile waveform
-    waveform = extract_radial_profile_waveform(spectrum, target_length=64)
+    waveform = extract_radial_profile_waveform(spectrum, target_length=WAVEFORM_LENGTH)
     
     # Extract basic features (seed, energy, complexity)
     basic_features = extract_basic_features(image)
     
-    # Load confidence score from metadata if available
-    confidence = 0.0
-    metadata_path = image_path.parent / f"metadata_{image_path.stem}.json"
-    if metadata_path.exists():
-        try:
-            import json
-            with open(metadata_path, 'r') as f:
-                metadata = json.load(f)
-                confidence = metadata.get("confidence", 0.0)
-        except:
-            pass
-    
     # Combine all features
     features = {
         **basic_features,
         "waveform": waveform,
-        "confidence": confidence
+        "confidence": float(confidence)
     }
     
     # Save results if output path provided
     if output_path:
         output_path = Path(output_path)
-        with open(output_path, 'w') as f:
-            json.dump(features, f, indent=2)
+        write_json(output_path, features)
+        iris_id = catalog.iris_id_from_name(output_path.name)
+        catalog.record_artifact(iris_id, "analysis", output_path)
+        try:
+            update_waveform(iris_id, waveform, features["confidence"])
+        except Exception as e:
+            print(f"⚠️  Could not update {WAVEFORMS_PATH.name}: {e}")
         print(f"  Results saved to: {output_path.name}")
     
     # Print summary
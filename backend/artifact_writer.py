@@ -0,0 +1,279 @@
+"""
+IRIS#1 - Digital Biometrics
+Background artifact writer.
+JPEG/PNG encoding and JSON dumps run on a small thread pool behind a bounded
+queue, so the capture path continues as soon as an artifact is computed.
+Every file is written atomically (temp file in the same folder + os.replace):
+readers such as the frontend never see a half-written file. JSON artifacts
+also get a precompressed .gz copy, written after the JSON itself.
+
+Usage:
+    from backend.artifact_writer import write_image, write_json, update_json, wait_for, flush
+
+    write_image(PROCESSED_DIR / "iris-001.jpg", ring)   # returns immediately
+    wait_for(PROCESSED_DIR / "iris-001.jpg")            # before reading it back
+    update_json(metadata_path, add_renditions)          # read-modify-write, after pending writes
+    flush()                                             # before exiting
+"""
+
+import atexit
+import gzip
+import json
+import os
+import threading
+import cv2
+from concurrent.futures import ThreadPoolExecutor
+from pathlib import Path
+from backend.config import (
+    ASYNC_ARTIFACT_WRITES, ARTIFACT_WRITER_WORKERS, ARTIFACT_WRITER_QUEUE_SIZE,
+    PRECOMPRESS_JSON, JSON_GZIP_LEVEL
+)
+
+
+def gzip_path(path):
+    """Path of a file's precompressed copy (codes_index.json -> codes_index.json.gz)"""
+    path = Path(path)
+    return path.with_name(path.name + ".gz")
+
+
+def encode_gzip(data):
+    """gzip bytes reproducibly (no timestamp in the header)"""
+    return gzip.compress(data, compresslevel=JSON_GZIP_LEVEL, mtime=0)
+
+
+def atomic_write_bytes(path, data, gzip_copy=False):
+    """
+    Write bytes to a file atomically: readers see the old file or the new one, never a partial one.
+
+    Args:
+        path: Destination path
+        data: bytes to write
+        gzip_copy: Also write <path>.gz, after the file itself (so the copy is never older)
+    """
+    path = Path(path)
+    tmp_path = path.parent / f".{path.name}.{os.getpid()}.{threading.get_ident()}.tmp"
+    try:
+        with open(tmp_path, 'wb') as f:
+            f.write(data)
+        os.replace(tmp_path, path)
+    except BaseException:
+        tmp_path.unlink(missing_ok=True)
+        raise
+
+    if gzip_copy:
+        atomic_write_bytes(gzip_path(path), encode_gzip(data))
+
+
+def encode_image(path, image, params=None):
+    """Encode an image in the format given by the path's extension (.jpg, .png)"""
+    ok, buffer = cv2.imencode(Path(path).suffix, image, params or [])
+    if not ok:
+        raise ValueError(f"Could not encode image: {Path(path).name}")
+    return buffer.tobytes()
+
+
+def encode_json(data, indent=2):
+    """Serialize data as JSON bytes (same layout as json.dump(..., indent=2))"""
+    return json.dumps(data, indent=indent).encode("utf-8")
+
+
+class ArtifactWriter:
+    """
+    Thread pool that encodes and writes artifacts in the background.
+
+    Submitting blocks while `queue_size` writes are already pending (backpressure),
+    so a burst of captures cannot pile up unbounded images in memory. Writes to
+    the same path land in submission order. Arrays passed in must not be
+    modified afterwards (they are encoded later, on a worker thread).
+    """
+
+    def __init__(self, workers=ARTIFACT_WRITER_WORKERS, queue_size=ARTIFACT_WRITER_QUEUE_SIZE,
+                 enabled=ASYNC_ARTIFACT_WRITES):
+        self.enabled = enabled
+        self._executor = ThreadPoolExecutor(max_workers=workers, thread_name_prefix="artifact-writer") if enabled else None
+        self._slots = threading.BoundedSemaphore(queue_size)
+        self._lock = threading.Lock()
+        self._pending = {}  # resolved path -> latest Future for that path
+        self.stats = {"written": 0, "failed": 0, "max_pending": 0}
+
+    def _write(self, path, encode, previous, gzip_copy):
+        if previous is not None:
+            # Keep writes to the same path in order; the earlier one's failure is reported on its own
+            try:
+                previous.result()
+            except Exception:
+                pass
+        atomic_write_bytes(path, encode(), gzip_copy)
+
+    def _done(self, path, future):
+        self._slots.release()
+        with self._lock:
+            if self._pending.get(path) is future:
+                del self._pending[path]
+            if future.exception() is None:
+                self.stats["written"] += 1
+            else:
+                self.stats["failed"] += 1
+        if future.exception() is not None:
+            print(f"✗ Could not write {path.name}: {future.exception()}")
+
+    def submit(self, path, encode, gzip_copy=False):
+        """
+        Queue a write. `encode` is called on a worker thread and returns the file's bytes.
+
+        Args:
+            path: Destination path
+            encode: Zero-argument callable returning bytes
+            gzip_copy: Also write a precompressed <path>.gz (same job, after the file)
+
+        Returns:
+            Future (None when writes are synchronous)
+        """
+        path = Path(path).resolve()
+
+        if not self.enabled:
+            atomic_write_bytes(path, encode(), gzip_copy)
+            self.stats["written"] += 1
+            return None
+
+        self._slots.acquire()
+        with self._lock:
+            previous = self._pending.get(path)
+            future = self._executor.submit(self._write, path, encode, previous, gzip_copy)
+            self._pending[path] = future
+            self.stats["max_pending"] = max(self.stats["max_pending"], len(self._pending))
+        future.add_done_callback(lambda f: self._done(path, f))
+        return future
+
+    def write_image(self, path, image, params=None):
+        """Queue an image write (format from the extension, optional cv2.imwrite params)"""
+        return self.submit(path, lambda: encode_image(path, image, params))
+
+    def write_json(self, path, data, indent=2, gzip_copy=PRECOMPRESS_JSON):
+        """Queue a JSON write (plus its .gz copy)"""
+        return self.submit(path, lambda: encode_json(data, indent), gzip_copy)
+
+    def write_text(self, path, text):
+        """Queue a UTF-8 text write"""
+        return self.submit(path, lambda: text.encode("utf-8"))
+
+    def update_json(self, path, update, indent=2, gzip_copy=PRECOMPRESS_JSON):
+        """
+        Queue a read-modify-write of a JSON file.
+        It runs in the path's write order: `update` sees the file as left by
+        every earlier write to it, and no later write can slip in between.
+
+        Args:
+            path: JSON file (must exist once the earlier writes have landed)
+            update: Callable that modifies the loaded data in place
+        """
+        def encode():
+            with open(path, 'r') as f:
+                data = json.load(f)
+            update(data)
+            return encode_json(data, indent)
+
+        return self.submit(path, encode, gzip_copy)
+
+    def wait_for(self, path):
+        """
+        Block until the pending write of `path` (if any) has landed.
+
+        Returns:
+            True if the file was written (or nothing was pending), False if the write failed
+        """
+        with self._lock:
+            future = self._pending.get(Path(path).resolve())
+        if future is None:
+            return True
+        try:
+            future.result()
+            return True
+        except Exception:
+            return False
+
+    def pending(self):
+        """Number of writes queued or in progress"""
+        with self._lock:
+            return len(self._pending)
+
+    def flush(self):
+        """
+        Block until every queued write has landed.
+
+        Returns:
+            Number of writes that failed
+        """
+        with self._lock:
+            futures = list(self._pending.values())
+        failed = 0
+        for future in futures:
+            try:
+                future.result()
+            except Exception:
+                failed += 1
+        return failed
+
+    def shutdown(self):
+        """Flush and stop the worker threads"""
+        self.flush()
+        if self._executor is not None:
+            self._executor.shutdown(wait=True)
+
+
+_writer = None
+_writer_pid = None
+
+
+def get_writer():
+    """
+    Return this process's shared writer, creating it on first use.
+    Batch worker processes each get their own (threads do not survive a fork).
+    """
+    global _writer, _writer_pid
+    if _writer is None or _writer_pid != os.getpid():
+        _writer = ArtifactWriter()
+        _writer_pid = os.getpid()
+    return _writer
+
+
+def write_image(path, image, params=None):
+    """Queue an image write on the shared writer"""
+    return get_writer().write_image(path, image, params)
+
+
+def write_json(path, data, indent=2, gzip_copy=PRECOMPRESS_JSON):
+    """Queue a JSON write (plus its .gz copy) on the shared writer"""
+    return get_writer().write_json(path, data, indent, gzip_copy)
+
+
+def write_text(path, text):
+    """Queue a text write on the shared writer"""
+    return get_writer().write_text(path, text)
+
+
+def update_json(path, update, indent=2, gzip_copy=PRECOMPRESS_JSON):
+    """Queue a read-modify-write of a JSON file on the shared writer, after its pending writes"""
+    return get_writer().update_json(path, update, indent, gzip_copy)
+
+
+def wait_for(path):
+    """Block until the shared writer has written `path` (no-op if nothing is pending)"""
+    if _writer is None or _writer_pid != os.getpid():
+        return True
+    return _writer.wait_for(path)
+
+
+def flush():
+    """Block until all queued artifacts are on disk. Returns the number of failed writes."""
+    if _writer is None or _writer_pid != os.getpid():
+        return 0
+    return _writer.flush()
+
+
+@atexit.register
+def _flush_at_exit():
+    if _writer is not None and _writer_pid == os.getpid():
+        failed = _writer.flush()
+        if failed:
+            print(f"⚠️  {failed} artifact(s) could not be written")
@@ -0,0 +1,235 @@
+"""
+IRIS#1 - Digital Biometrics
+Parallel batch runner for the data/renamed/ backlog.
+Sends each incoming-XXX photo through the single-decode pipeline (crop, FFT,
+latent code, analysis) on a process pool, keeping incoming-XXX -> iris-XXX numbering.
+
+Usage:
+    python -m backend.batch
+    python -m backend.batch --workers 6 --cv-threads 1
+"""
+
+import argparse
+import os
+import time
+from concurrent.futures import ProcessPoolExecutor, as_completed
+from backend.config import RENAMED_DIR, PROCESSED_DIR, BATCH_WORKERS, BATCH_CV_THREADS
+from backend.iris_processor import merge_strategy_stats, print_strategy_stats, PupilSessionPrior
+
+# Per-worker pupil prior: photos of one session share the same camera geometry
+_worker_prior = None
+
+
+def find_renamed_images(renamed_dir=RENAMED_DIR):
+    """
+    Find all renamed photos (incoming-XXX.ext) waiting to be processed.
+
+    Args:
+        renamed_dir: Folder holding the renamed photos
+
+    Returns:
+        List of (incoming_number, path) tuples sorted by number
+    """
+    images = []
+    for ext in ["jpg", "jpeg", "png", "webp"]:
+        for path in renamed_dir.glob(f"incoming-*.{ext}"):
+            try:
+                number = int(path.stem.replace("incoming-", ""))
+            except ValueError:
+                continue
+            images.append((number, path))
+
+    images.sort(key=lambda item: item[0])
+    return images
+
+
+def init_worker(cv_threads):
+    """
+    Process pool initializer: cap OpenCV's and the FFT backend's thread pools.
+    Every worker already owns a core, so letting them spawn their own
+    threads on top of that only oversubscribes the machine.
+
+    Args:
+        cv_threads: Number of OpenCV (and FFT) threads per worker process
+    """
+    global _worker_prior
+    import cv2
+    from backend.fft_backend import set_fft_threads
+    cv2.setNumThreads(cv_threads)
+    set_fft_threads(cv_threads)
+    _worker_prior = PupilSessionPrior()
+
+
+def process_one(incoming_number, input_path):
+    """
+    Run the full pipeline for a single renamed photo.
+    Executed inside a worker process.
+
+    Args:
+        incoming_number: Number parsed from incoming-XXX (reused for iris-XXX)
+        input_path: Path to the renamed photo
+
+    Returns:
+        Dictionary with the iris id, confidence, latent code and per-stage timings
+    """
+    from backend.pipeline import run_pipeline
+    from backend.iris_processor import get_strategy_stats, reset_strategy_stats
+    from backend.artifact_writer import flush
+
+    # Counters are per process: reset so this image's numbers can be summed by the parent
+    reset_strategy_stats()
+    roi_hits = _worker_prior.stats["roi_hits"] if _worker_prior else 0
+
+    # The index is rebuilt once at the end of the batch instead of once per code;
+    # each code is still pushed to the displays as soon as it is saved
+    result = run_pipeline(input_path, match_incoming_number=incoming_number,
+                          update_index=False, prior=_worker_prior)
+
+    # Pool workers exit without running atexit hooks: wait for this image's files here
+    start = time.perf_counter()
+    flush()
+    result["timings"]["write"] = time.perf_counter() - start
+
+    return {
+        "iris_id": result["iris_id"],
+        "input_file": result["input_file"],
+        "confidence": result["confidence"],
+        "latent_code": result["latent_code"],
+        "timings": result["timings"],
+        "strategy_stats": get_strategy_stats(),
+        "prior_hit": bool(_worker_prior and _worker_prior.stats["roi_hits"] > roi_hits),
+    }
+
+
+def iris_number(iris_id):
+    """Number of an iris ID (iris-1000 -> 1000), so results sort numerically and not as text"""
+    try:
+        return int(iris_id.rsplit("-", 1)[-1])
+    except ValueError:
+        return -1
+
+
+def pool_size(workers, image_count):
+    """
+    Number of worker processes a batch actually starts: one per CPU core when
+    unset, never more than there are images.
+
+    Args:
+        workers: Requested workers (None = one per CPU core)
+        image_count: Number of images in the batch
+
+    Returns:
+        Worker count as integer
+    """
+    if workers is None:
+        workers = os.cpu_count() or 1
+    return max(1, min(workers, image_count or 1))
+
+
+def run_batch(images, workers=BATCH_WORKERS, cv_threads=BATCH_CV_THREADS):
+    """
+    Process a list of renamed photos on a process pool.
+
+    Args:
+        images: List of (incoming_number, path) tuples
+        workers: Number of worker processes (None = one per CPU core)
+        cv_threads: OpenCV internal threads per worker
+
+    Returns:
+        Dictionary summary with results, failures and throughput
+    """
+    workers = pool_size(workers, len(images))
+
+    results = []
+    failures = []
+
+    start = time.perf_counter()
+    with ProcessPoolExecutor(max_workers=workers, initializer=init_worker,
+                             initargs=(cv_threads,)) as pool:
+        futures = {
+            pool.submit(process_one, number, path): (number, path)
+            for number, path in images
+        }
+        for future in as_completed(futures):
+            number, path = futures[future]
+            try:
+                result = future.result()
+                results.append(result)
+                print(f"  Mapping: incoming-{number:03d} -> {result['iris_id']} "
+                      f"(confidence: {result['confidence']:.2f})")
+            except Exception as e:
+                failures.append((path.name, str(e)))
+                print(f"  ✗ Error processing {path.name}: {e}")
+    elapsed = time.perf_counter() - start
+
+    results.sort(key=lambda r: iris_number(r["iris_id"]))
+
+    strategy_stats = {}
+    for result in results:
+        merge_strategy_stats(strategy_stats, result["strategy_stats"])
+
+    return {
+        "workers": workers,
+        "results": results,
+        "failures": failures,
+        "elapsed": elapsed,
+        "images_per_second": len(results) / elapsed if elapsed > 0 else 0.0,
+        "strategy_stats": strategy_stats,
+    }
+
+
+def print_summary(summary):
+    """Print a throughput summary for a finished batch run"""
+    results = summary["results"]
+    print("\n" + "=" * 60)
+    print("Batch summary")
+    print("=" * 60)
+    print(f"  Workers:     {summary['workers']}")
+    print(f"  Processed:   {len(results)}")
+    print(f"  Failed:      {len(summary['failures'])}")
+    print(f"  Wall time:   {summary['elapsed']:.2f} s")
+    print(f"  Throughput:  {summary['images_per_second']:.2f} images/s")
+
+    if results:
+        for stage in ["crop", "fft", "code", "analysis", "write"]:
+            mean = sum(r["timings"][stage] for r in results) / len(results)
+            print(f"  Mean {stage + ':':<10}{mean * 1000:.0f} ms/image")
+
+    print(f"  Pupil found via session prior ROI: "
+          f"{sum(r['prior_hit'] for r in results)}/{len(results)}")
+    print_strategy_stats(summary["strategy_stats"])
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Process the data/renamed/ backlog in parallel.")
+    parser.add_argument("--workers", type=int, default=BATCH_WORKERS,
+                        help="number of worker processes (default: one per CPU core)")
+    parser.add_argument("--cv-threads", type=int, default=BATCH_CV_THREADS,
+                        help="OpenCV threads per worker (default: %(default)s)")
+    parser.add_argument("--skip-existing", action="store_true",
+                        help="skip photos that already have a processed iris-XXX.jpg")
+    args = parser.parse_args(argv)
+
+    images = find_renamed_images()
+    if args.skip_existing:
+        images = [(n, p) for n, p in images
+                  if not (PROCESSED_DIR / f"iris-{n:03d}.jpg").exists()]
+
+    if not images:
+        print("No renamed images found in data/renamed/")
+        print("Run 'python -m backend.rename_incoming' first to rename photos.")
+        return
+
+    print(f"Processing {len(images)} images from data/renamed/ "
+          f"with {pool_size(args.workers, len(images))} workers:\n")
+    summary = run_batch(images, workers=args.workers, cv_threads=args.cv_threads)
+
+    # Rebuild the frontend index once for the whole batch
+    from backend.generate_codes_index import save_codes_index
+    save_codes_index()
+
+    print_summary(summary)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,248 @@
+"""
+IRIS#1 - Digital Biometrics
+Small benchmarks comparing optimized code paths against the originals.
+
+Usage:
+    python -m backend.benchmark ring      # Safe Zone ring extraction: full-frame vs ROI-first
+    python -m backend.benchmark server    # HTTP server: legacy single-threaded vs concurrent
+"""
+
+import argparse
+import http.client
+import json
+import socket
+import threading
+import time
+import tracemalloc
+import cv2
+import numpy as np
+from backend.config import RENAMED_DIR
+
+
+def legacy_mask_and_crop(image, cx, cy, r_pupil, padding=10):
+    """
+    Original ring extraction: full-frame mask, per-channel bitwise_and over the
+    whole image, and a bounding box from every non-zero mask coordinate.
+    Kept as the reference for crop_ring.
+    """
+    from backend.iris_processor import create_ring_mask
+
+    h, w = image.shape[:2]
+    mask = create_ring_mask(image.shape, cx, cy, r_pupil)
+
+    masked_bgr = np.zeros_like(image)
+    for c in range(image.shape[2]):
+        masked_bgr[:, :, c] = cv2.bitwise_and(image[:, :, c], image[:, :, c], mask=mask)
+
+    coords = np.column_stack(np.where(mask > 0))
+    if len(coords) == 0:
+        return None
+
+    y_min, x_min = coords.min(axis=0)
+    y_max, x_max = coords.max(axis=0)
+    x_min = max(0, x_min - padding)
+    y_min = max(0, y_min - padding)
+    x_max = min(w, x_max + padding)
+    y_max = min(h, y_max + padding)
+
+    return masked_bgr[y_min:y_max, x_min:x_max]
+
+
+def measure(fn, *args, repeat=3):
+    """
+    Time a function and record its peak traced memory.
+
+    Returns:
+        Tuple of (result, best_seconds, peak_bytes)
+    """
+    best = float("inf")
+    result = None
+    for _ in range(repeat):
+        start = time.perf_counter()
+        result = fn(*args)
+        best = min(best, time.perf_counter() - start)
+
+    tracemalloc.start()
+    fn(*args)
+    _, peak = tracemalloc.get_traced_memory()
+    tracemalloc.stop()
+
+    return result, best, peak
+
+
+def benchmark_ring_extraction(image_paths):
+    """Compare full-frame and ROI-first ring extraction on real captures"""
+    from backend.iris_processor import load_image, detect_pupil, crop_ring
+
+    print(f"{'image':<20}{'full-frame':>14}{'ROI-first':>14}{'speedup':>10}"
+          f"{'peak MB old':>14}{'peak MB new':>14}{'identical':>11}")
+
+    for path in image_paths:
+        image = load_image(path)
+        pupil = detect_pupil(image)
+        if pupil is None:
+            print(f"{path.name:<20}  (no pupil detected, skipped)")
+            continue
+        cx, cy, r_pupil, _ = pupil
+
+        old, old_time, old_peak = measure(legacy_mask_and_crop, image, cx, cy, r_pupil)
+        new, new_time, new_peak = measure(crop_ring, image, cx, cy, r_pupil)
+        identical = old is not None and new is not None and np.array_equal(old, new)
+
+        print(f"{path.name:<20}{old_time * 1000:>11.1f} ms{new_time * 1000:>11.1f} ms"
+              f"{old_time / new_time:>9.1f}x{old_peak / 1e6:>14.1f}{new_peak / 1e6:>14.1f}"
+              f"{str(identical):>11}")
+
+
+def slow_download(port, url_path, rate, results):
+    """
+    Download a file the way a slow display on a weak network does: a small
+    receive buffer, read at `rate` bytes/second. Records (bytes, seconds).
+    """
+    start = time.perf_counter()
+    received = 0
+    with socket.create_connection(("127.0.0.1", port), timeout=120) as sock:
+        sock.setsockopt(socket.SOL_SOCKET, socket.SO_RCVBUF, 32 * 1024)
+        sock.sendall(f"GET {url_path} HTTP/1.1\r\nHost: localhost\r\nConnection: close\r\n\r\n".encode())
+        chunk_size = 16 * 1024
+        while True:
+            chunk = sock.recv(chunk_size)
+            if not chunk:
+                break
+            received += len(chunk)
+            time.sleep(len(chunk) / rate)
+    results.append((received, time.perf_counter() - start))
+
+
+def poll_index(port, until, latencies):
+    """Poll /api/codes like a display does, recording each request's latency"""
+    conn = http.client.HTTPConnection("127.0.0.1", port, timeout=120)
+    cursor = 0
+    try:
+        while time.perf_counter() < until:
+            start = time.perf_counter()
+            conn.request("GET", f"/api/codes?since={cursor}")
+            response = conn.getresponse()
+            body = response.read()
+            latencies.append(time.perf_counter() - start)
+            if response.status == 200:
+                cursor = json.loads(body).get("cursor", cursor)
+    finally:
+        conn.close()
+
+
+def run_server_load(legacy, clients, duration, large_path=None, rate=1e6, link_buffer=64 * 1024):
+    """
+    Start a server on a free port, poll it from `clients` threads for `duration`
+    seconds (optionally while a slow client downloads `large_path`).
+    Accepted sockets get a `link_buffer` send buffer: on loopback the kernel would
+    otherwise buffer a whole photo at once, which a slow Wi-Fi display never does.
+
+    Returns:
+        Dictionary with requests, throughput and latency percentiles
+    """
+    from start_server import make_server
+
+    server = make_server(0, legacy=legacy)
+    server.RequestHandlerClass.log_message = lambda *args: None
+    accept = server.get_request
+
+    def get_request():
+        request, client_address = accept()
+        if link_buffer:
+            request.setsockopt(socket.SOL_SOCKET, socket.SO_SNDBUF, link_buffer)
+        return request, client_address
+
+    server.get_request = get_request
+    port = server.server_address[1]
+    threading.Thread(target=server.serve_forever, daemon=True).start()
+
+    downloads = []
+    downloader = None
+    if large_path is not None:
+        downloader = threading.Thread(target=slow_download, args=(port, large_path, rate, downloads))
+        downloader.start()
+        time.sleep(0.2)  # The download is in flight before the polls start
+
+    latencies = []
+    start = time.perf_counter()
+    until = start + duration
+    pollers = [threading.Thread(target=poll_index, args=(port, until, latencies)) for _ in range(clients)]
+    for t in pollers:
+        t.start()
+    for t in pollers:
+        t.join()
+    elapsed = time.perf_counter() - start
+
+    if downloader is not None:
+        downloader.join()
+    server.shutdown()
+    server.server_close()
+
+    latencies.sort()
+    pick = lambda q: latencies[min(len(latencies) - 1, int(q * len(latencies)))] if latencies else float("nan")
+    return {
+        "requests": len(latencies),
+        "rps": len(latencies) / elapsed,
+        "p50": pick(0.50),
+        "p95": pick(0.95),
+        "max": latencies[-1] if latencies else float("nan"),
+        "download": downloads[0] if downloads else None,
+    }
+
+
+def benchmark_server(large_file, clients=8, duration=3.0, rate=1e6, link_buffer=64 * 1024):
+    """Compare the legacy and concurrent servers: index polls alone, then next to a slow download"""
+    from backend.config import DATA_DIR
+
+    large_path = "/data/" + large_file.relative_to(DATA_DIR).as_posix() if large_file else None
+
+    print(f"{clients} pollers for {duration:g}s"
+          + (f", slow download of {large_file.name} ({large_file.stat().st_size / 1e6:.1f} MB at {rate / 1e6:g} MB/s)"
+             if large_file else ""))
+    print(f"{'server':<12}{'scenario':<18}{'requests':>10}{'req/s':>10}"
+          f"{'p50 ms':>10}{'p95 ms':>10}{'max ms':>10}{'download s':>12}")
+
+    scenarios = [("polls", None)] + ([("polls+download", large_path)] if large_path else [])
+    for legacy in (True, False):
+        for scenario, path in scenarios:
+            r = run_server_load(legacy, clients, duration, path, rate, link_buffer)
+            download = f"{r['download'][1]:.1f}" if r["download"] else "-"
+            print(f"{'legacy' if legacy else 'concurrent':<12}{scenario:<18}{r['requests']:>10}{r['rps']:>10.0f}"
+                  f"{r['p50'] * 1000:>10.1f}{r['p95'] * 1000:>10.1f}{r['max'] * 1000:>10.1f}{download:>12}")
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Benchmark optimized code paths against the originals.")
+    subparsers = parser.add_subparsers(dest="benchmark", required=True)
+
+    ring = subparsers.add_parser("ring", help="Safe Zone ring extraction (full-frame vs ROI-first)")
+    ring.add_argument("--limit", type=int, default=5, help="number of renamed photos to use")
+
+    server = subparsers.add_parser("server", help="HTTP server (legacy single-threaded vs concurrent)")
+    server.add_argument("--clients", type=int, default=8, help="concurrent index pollers")
+    server.add_argument("--duration", type=float, default=3.0, help="seconds of polling per run")
+    server.add_argument("--rate", type=float, default=1e6, help="slow download speed in bytes/second")
+    server.add_argument("--link-buffer", type=int, default=64 * 1024,
+                        help="server send buffer per connection in bytes (0 = kernel default)")
+
+    args = parser.parse_args(argv)
+
+    if args.benchmark == "ring":
+        image_paths = sorted(RENAMED_DIR.glob("incoming-*.jpg"))[:args.limit]
+        if not image_paths:
+            print("No renamed images found in data/renamed/")
+            return
+        benchmark_ring_extraction(image_paths)
+
+    elif args.benchmark == "server":
+        # Largest original on disk stands in for a full-resolution download
+        originals = sorted(RENAMED_DIR.glob("incoming-*.jpg"), key=lambda p: p.stat().st_size)
+        if not originals:
+            print("No renamed images found in data/renamed/: measuring index polls only")
+        benchmark_server(originals[-1] if originals else None, args.clients, args.duration, args.rate,
+                         args.link_buffer)
+
+
+if __name__ == "__main__":
+    main()
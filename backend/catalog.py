@@ -0,0 +1,403 @@
+"""
+IRIS#1 - Digital Biometrics
+SQLite catalog of captures and their artifacts (data/catalog.db).
+Every stage registers what it produced, so lineage
+(incoming -> renamed -> iris -> fft -> code -> analysis), confidence, seed and
+features are one indexed query away instead of a directory walk over sidecars.
+The sidecar JSON files are still written for the frontend.
+
+    python -m backend.catalog list [--first 10] [--min-confidence 0.8]
+    python -m backend.catalog show iris-001
+    python -m backend.catalog import      # backfill from existing sidecars
+"""
+
+import argparse
+import json
+import os
+import sqlite3
+import threading
+import time
+from pathlib import Path
+from backend.config import CATALOG_PATH, CATALOG_ENABLED, PROCESSED_DIR, CODES_DIR, FFT_DIR
+
+SCHEMA = """
+CREATE TABLE IF NOT EXISTS captures (
+    iris_id      TEXT PRIMARY KEY,  -- iris-001
+    number       INTEGER,           -- 1 (shared with incoming-001)
+    input_file   TEXT,              -- original photo name
+    renamed_file TEXT,              -- incoming-001.jpg
+    confidence   REAL,
+    seed         INTEGER,
+    latent_code  TEXT,
+    features     TEXT,              -- JSON
+    created_at   REAL NOT NULL,
+    updated_at   REAL NOT NULL
+);
+CREATE INDEX IF NOT EXISTS captures_number ON captures(number);
+CREATE INDEX IF NOT EXISTS captures_updated ON captures(updated_at);
+CREATE INDEX IF NOT EXISTS captures_confidence ON captures(confidence);
+CREATE INDEX IF NOT EXISTS captures_seed ON captures(seed);
+
+CREATE TABLE IF NOT EXISTS artifacts (
+    iris_id    TEXT NOT NULL,
+    kind       TEXT NOT NULL,  -- iris, polar, metadata, fft, code, analysis, iris_256, ...
+    path       TEXT NOT NULL,  -- relative to data/
+    created_at REAL NOT NULL,  -- stage timestamp
+    PRIMARY KEY (iris_id, kind)
+);
+CREATE INDEX IF NOT EXISTS artifacts_kind ON artifacts(kind, created_at);
+"""
+
+_local = threading.local()
+
+
+def iris_id_from_name(filename):
+    """
+    Iris ID from any artifact filename (iris-001.jpg, fft_iris-001.jpg, code_iris-001.json -> iris-001).
+
+    Returns:
+        Iris ID string
+    """
+    stem = Path(filename).stem
+    for prefix in ("fft_", "code_", "analysis_", "metadata_", "polar_"):
+        if stem.startswith(prefix):
+            return stem[len(prefix):]
+    return stem
+
+
+def _number(iris_id):
+    try:
+        return int(iris_id.split("-")[-1])
+    except ValueError:
+        return None
+
+
+def connect(db_path=CATALOG_PATH):
+    """
+    Per-thread connection to the catalog, creating the schema on first use.
+    A new catalog is backfilled once from the sidecar files already on disk.
+
+    Args:
+        db_path: Path of the SQLite database
+
+    Returns:
+        sqlite3.Connection (rows as sqlite3.Row)
+    """
+    db_path = Path(db_path)
+    connections = getattr(_local, "connections", None)
+    if connections is None or getattr(_local, "pid", None) != os.getpid():
+        connections = _local.connections = {}
+        _local.pid = os.getpid()
+
+    conn = connections.get(db_path)
+    if conn is None:
+        # Only the real catalog is backfilled (not test or scratch databases)
+        backfill = not db_path.exists() and db_path == Path(CATALOG_PATH)
+        db_path.parent.mkdir(parents=True, exist_ok=True)
+        conn = sqlite3.connect(str(db_path), timeout=10, isolation_level=None)
+        conn.row_factory = sqlite3.Row
+        # WAL: readers (server, CLI) never block the writers (batch workers)
+        conn.execute("PRAGMA journal_mode=WAL")
+        conn.execute("PRAGMA synchronous=NORMAL")
+        conn.executescript(SCHEMA)
+        connections[db_path] = conn
+        if backfill:
+            imported = import_sidecars(db_path=db_path)
+            if imported:
+                print(f"✓ Catalog created, imported {imported} existing captures")
+    return conn
+
+
+def _execute(sql, params, db_path=CATALOG_PATH):
+    """
+    Run one write; the catalog must never break processing, so errors only warn.
+    The warning names the capture (params[0] is always the iris ID), so a lost
+    record can be traced and backfilled with `python -m backend.catalog import`.
+    """
+    if not CATALOG_ENABLED:
+        return False
+    try:
+        connect(db_path).execute(sql, params)
+        return True
+    except sqlite3.Error as e:
+        print(f"⚠️  Catalog update for {params[0]} failed: {e} "
+              f"(backfill with: python -m backend.catalog import)")
+        return False
+
+
+def register_capture(iris_id, input_file=None, renamed_file=None, confidence=None, db_path=CATALOG_PATH):
+    """
+    Create or update a capture. Fields left as None keep their stored value.
+    An input_file named incoming-XXX is the renamed photo and is stored as renamed_file.
+
+    Args:
+        iris_id: Iris ID (e.g. "iris-001")
+        input_file: Name of the original photo
+        renamed_file: Name of the renamed photo (incoming-XXX.jpg)
+        confidence: Pupil detection confidence
+        db_path: Path of the SQLite database
+    """
+    if input_file is not None and input_file.startswith("incoming-") and renamed_file is None:
+        input_file, renamed_file = None, input_file
+    
+    now = time.time()
+    return _execute(
+        """INSERT INTO captures (iris_id, number, input_file, renamed_file, confidence, created_at, updated_at)
+           VALUES (?, ?, ?, ?, ?, ?, ?)
+           ON CONFLICT(iris_id) DO UPDATE SET
+               input_file = COALESCE(excluded.input_file, input_file),
+               renamed_file = COALESCE(excluded.renamed_file, renamed_file),
+               confidence = COALESCE(excluded.confidence, confidence),
+               updated_at = excluded.updated_at""",
+        (iris_id, _number(iris_id), input_file, renamed_file,
+         None if confidence is None else float(confidence), now, now),
+        db_path,
+    )
+
+
+def record_code(iris_id, latent_code, seed, features, db_path=CATALOG_PATH):
+    """Store the latent code, seed and features of a capture"""
+    now = time.time()
+    return _execute(
+        """INSERT INTO captures (iris_id, number, latent_code, seed, features, created_at, updated_at)
+           VALUES (?, ?, ?, ?, ?, ?, ?)
+           ON CONFLICT(iris_id) DO UPDATE SET
+               latent_code = excluded.latent_code, seed = excluded.seed,
+               features = excluded.features, updated_at = excluded.updated_at""",
+        (iris_id, _number(iris_id), latent_code, int(seed), json.dumps(features), now, now),
+        db_path,
+    )
+
+
+def record_artifact(iris_id, kind, path, db_path=CATALOG_PATH, created_at=None):
+    """
+    Record an artifact written by a stage (the time of the call is the stage timestamp).
+
+    Args:
+        iris_id: Iris ID (e.g. "iris-001")
+        kind: Artifact kind ("iris", "fft", "code", "analysis", "iris_256", ...)
+        path: Path of the file (stored relative to data/)
+        db_path: Path of the SQLite database
+        created_at: Stage timestamp (Unix time, default now)
+    """
+    from backend.renditions import data_relative
+
+    now = time.time() if created_at is None else created_at
+    ok = _execute(
+        """INSERT INTO artifacts (iris_id, kind, path, created_at) VALUES (?, ?, ?, ?)
+           ON CONFLICT(iris_id, kind) DO UPDATE SET path = excluded.path, created_at = excluded.created_at""",
+        (iris_id, kind, data_relative(path), now),
+        db_path,
+    )
+    if ok:
+        # Make sure the capture exists so artifacts never dangle
+        _execute("""INSERT INTO captures (iris_id, number, created_at, updated_at) VALUES (?, ?, ?, ?)
+                    ON CONFLICT(iris_id) DO UPDATE SET updated_at = excluded.updated_at""",
+                 (iris_id, _number(iris_id), now, now), db_path)
+    return ok
+
+
+def record_rendition_artifacts(iris_id, kind, renditions, db_path=CATALOG_PATH):
+    """Record the sized renditions from renditions.save_renditions as <kind>_<size> artifacts"""
+    from backend.config import DATA_DIR
+
+    for size, path in renditions.items():
+        if size != "full":
+            record_artifact(iris_id, f"{kind}_{size}", DATA_DIR / path, db_path)
+
+
+def _capture_dict(row):
+    capture = dict(row)
+    if capture.get("features"):
+        capture["features"] = json.loads(capture["features"])
+    return capture
+
+
+def get_capture(iris_id, db_path=CATALOG_PATH):
+    """
+    Look up one capture with all its artifacts.
+
+    Returns:
+        Dictionary of capture fields plus "artifacts" {kind: {"path", "created_at"}}, or None
+    """
+    conn = connect(db_path)
+    row = conn.execute("SELECT * FROM captures WHERE iris_id = ?", (iris_id,)).fetchone()
+    if row is None:
+        return None
+    capture = _capture_dict(row)
+    capture["artifacts"] = {
+        a["kind"]: {"path": a["path"], "created_at": a["created_at"]}
+        for a in conn.execute("SELECT kind, path, created_at FROM artifacts WHERE iris_id = ?", (iris_id,))
+    }
+    return capture
+
+
+def get_confidence(iris_id, db_path=CATALOG_PATH):
+    """
+    Pupil detection confidence of a capture.
+
+    Returns:
+        float, or None if the capture or its confidence is not in the catalog
+    """
+    if not CATALOG_ENABLED:
+        return None
+    try:
+        row = connect(db_path).execute(
+            "SELECT confidence FROM captures WHERE iris_id = ?", (iris_id,)).fetchone()
+    except sqlite3.Error as e:
+        print(f"⚠️  Catalog lookup failed: {e}")
+        return None
+    return None if row is None else row["confidence"]
+
+
+def list_captures(first=None, last=None, min_confidence=None, updated_since=None,
+                  with_code=False, limit=None, db_path=CATALOG_PATH):
+    """
+    Range query over captures, ordered by number.
+
+    Args:
+        first, last: Inclusive range of capture numbers
+        min_confidence: Only captures with at least this confidence
+        updated_since: Only captures updated after this Unix time
+        with_code: Only captures that have a latent code
+        limit: Maximum number of rows
+        db_path: Path of the SQLite database
+
+    Returns:
+        List of capture dictionaries (without artifacts)
+    """
+    clauses, params = [], []
+    if first is not None:
+        clauses.append("number >= ?")
+        params.append(first)
+    if last is not None:
+        clauses.append("number <= ?")
+        params.append(last)
+    if min_confidence is not None:
+        clauses.append("confidence >= ?")
+        params.append(min_confidence)
+    if updated_since is not None:
+        clauses.append("updated_at > ?")
+        params.append(updated_since)
+    if with_code:
+        clauses.append("latent_code IS NOT NULL")
+
+    sql = "SELECT * FROM captures"
+    if clauses:
+        sql += " WHERE " + " AND ".join(clauses)
+    sql += " ORDER BY number, iris_id"
+    if limit is not None:
+        sql += " LIMIT ?"
+        params.append(limit)
+
+    return [_capture_dict(row) for row in connect(db_path).execute(sql, params)]
+
+
+def list_codes(db_path=CATALOG_PATH):
+    """
+    All captures with a latent code, in iris ID order, with the time the code was saved.
+
+    Returns:
+        List of dictionaries with iris_id, latent_code, seed, features and code_saved_at
+    """
+    rows = connect(db_path).execute(
+        """SELECT c.iris_id, c.latent_code, c.seed, c.features, a.created_at AS code_saved_at
+           FROM captures c LEFT JOIN artifacts a ON a.iris_id = c.iris_id AND a.kind = 'code'
+           WHERE c.latent_code IS NOT NULL
+           ORDER BY c.iris_id""")
+    return [_capture_dict(row) for row in rows]
+
+
+def import_sidecars(db_path=CATALOG_PATH):
+    """
+    Backfill the catalog from the files already on disk (metadata, code and
+    analysis sidecars). Safe to run more than once.
+
+    Returns:
+        Number of captures imported
+    """
+    iris_ids = set()
+    conn = connect(db_path)
+    conn.execute("BEGIN")
+    try:
+        for metadata_path in sorted(PROCESSED_DIR.glob("metadata_*.json")):
+            iris_id = iris_id_from_name(metadata_path.name)
+            try:
+                with open(metadata_path, 'r') as f:
+                    metadata = json.load(f)
+            except (ValueError, OSError):
+                continue
+            register_capture(iris_id, input_file=metadata.get("input_file"),
+                             confidence=metadata.get("confidence"), db_path=db_path)
+            record_artifact(iris_id, "metadata", metadata_path, db_path, metadata_path.stat().st_mtime)
+            iris_ids.add(iris_id)
+
+        for code_path in sorted(CODES_DIR.glob("code_*.json")):
+            iris_id = iris_id_from_name(code_path.name)
+            try:
+                with open(code_path, 'r') as f:
+                    code = json.load(f)
+                record_code(iris_id, code["latent_code"], code["seed"], code.get("features", {}), db_path)
+            except (ValueError, KeyError, OSError):
+                continue
+            record_artifact(iris_id, "code", code_path, db_path, code.get("timestamp"))
+            iris_ids.add(iris_id)
+
+        for kind, directory, pattern in [("iris", PROCESSED_DIR, "iris-*.jpg"),
+                                         ("polar", PROCESSED_DIR, "polar_iris-*.png"),
+                                         ("analysis", PROCESSED_DIR, "analysis_*.json"),
+                                         ("fft", FFT_DIR, "fft_*.jpg")]:
+            for path in sorted(directory.glob(pattern)):
+                iris_id = iris_id_from_name(path.name)
+                record_artifact(iris_id, kind, path, db_path, path.stat().st_mtime)
+                iris_ids.add(iris_id)
+    except BaseException:
+        # Leave no transaction open on the shared per-thread connection
+        conn.execute("ROLLBACK")
+        raise
+
+    conn.execute("COMMIT")
+    return len(iris_ids)
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Query the capture catalog (data/catalog.db).")
+    subparsers = parser.add_subparsers(dest="command", required=True)
+
+    list_parser = subparsers.add_parser("list", help="list captures")
+    list_parser.add_argument("--first", type=int, help="first capture number")
+    list_parser.add_argument("--last", type=int, help="last capture number")
+    list_parser.add_argument("--min-confidence", type=float, help="minimum pupil confidence")
+    list_parser.add_argument("--limit", type=int)
+
+    show_parser = subparsers.add_parser("show", help="show one capture and its artifacts")
+    show_parser.add_argument("iris_id", help="e.g. iris-001")
+
+    subparsers.add_parser("import", help="backfill from existing sidecar files")
+
+    args = parser.parse_args(argv)
+
+    if args.command == "import":
+        print(f"✓ Imported {import_sidecars()} captures into {CATALOG_PATH.name}")
+
+    elif args.command == "show":
+        capture = get_capture(args.iris_id)
+        if capture is None:
+            print(f"✗ {args.iris_id} not in catalog")
+            return
+        print(json.dumps(capture, indent=2))
+
+    else:
+        captures = list_captures(args.first, args.last, args.min_confidence, limit=args.limit)
+        print(f"{'iris':<12}{'confidence':>12}{'seed':>14}  input")
+        for capture in captures:
+            confidence = capture["confidence"]
+            print(f"{capture['iris_id']:<12}"
+                  f"{confidence if confidence is not None else float('nan'):>12.2f}"
+                  f"{capture['seed'] if capture['seed'] is not None else '':>14}  "
+                  f"{capture['input_file'] or capture['renamed_file'] or ''}")
+        print(f"\n{len(captures)} captures")
+
+
+if __name__ == "__main__":
+    main()
@@ -17,6 +17,11 @@ PROCESSED_DIR = DATA_DIR / "processed"    # Cropped 1:1 iris images
 FFT_DIR = DATA_DIR / "fft"                # FFT spectrum visualization images
 CODES_DIR = DATA_DIR / "codes"            # Latent code JSON/txt files
 LOGS_DIR = DATA_DIR / "logs"              # Backend logs
+SEQUENCE_STATE_PATH = DATA_DIR / "sequences.json"  # Last iris/incoming numbers handed out
+CATALOG_PATH = DATA_DIR / "catalog.db"    # SQLite catalog of captures and artifacts (backend/catalog.py)
+CATALOG_ENABLED = True
+EVENTS_LOG_PATH = DATA_DIR / "events.log"  # Append-only new-code events, streamed by start_server (/api/events)
+EVENTS_LOG_MAX_BYTES = 1024 * 1024  # events.log is rotated to events.log.1 past this size
 
 # Ensure all data directories exist
 for dir_path in [INCOMING_DIR, RENAMED_DIR, PROCESSED_DIR, FFT_DIR, CODES_DIR, LOGS_DIR]:
@@ -27,9 +32,45 @@ IRIS_CROP_SIZE = 2048  # Size of the 1:1 square crop (pixels) - High resolution
 IRIS_CENTER_OFFSET_X = 0  # For now, we'll do center crop (no pupil detection yet)
 IRIS_CENTER_OFFSET_Y = 0
 
+# Pupil detection settings
+PUPIL_DETECTION_MODE = "pyramid"  # "pyramid" (coarse-to-fine) or "full" (full-resolution search)
+PUPIL_PYRAMID_SIZE = 640  # Longer side of the downsampled copy used for the coarse search
+PUPIL_STRATEGY_ORDER = ["otsu", "adaptive", "fixed"]  # Threshold strategies, tried lazily in this order
+PUPIL_REFINE_WINDOW = 1.5  # Refinement window half-size, in pupil radii around the coarse estimate
+
+# Session prior: in the booth the camera and chin rest are fixed, so recent pupil
+# positions predict the next one. The ROI around them is searched first.
+PUPIL_PRIOR_HISTORY = 10  # Number of recent detections remembered
+PUPIL_PRIOR_WINDOW = 2.0  # ROI half-size, in pupil radii around the remembered position
+PUPIL_PRIOR_MIN_CONFIDENCE = 0.6  # Below this, the ROI result is discarded and the full search runs
+
+# Analysis resolution: FFT and all spectral/statistical features are computed on the
+# ring downsampled (area averaging) to this size. The saved iris-XXX.jpg stays at
+# IRIS_CROP_SIZE. None = analyse at full crop resolution.
+# See `python -m backend.resolution` for how much each latent-code field drifts.
+ANALYSIS_SIZE = 512
+
+# Polar (rubber-sheet) strip: the Safe Zone annulus unwrapped into a fixed-size
+# rectangle (rows = radius from inner to outer edge, columns = angle).
+# Saved as processed/polar_iris-XXX.png next to iris-XXX.jpg.
+POLAR_STRIP_HEIGHT = 64
+POLAR_STRIP_WIDTH = 512
+SAVE_POLAR_STRIP = True
+FEATURE_SOURCE = "ring"  # Input for FFT/latent code/analysis: "ring" (square crop) or "polar" (strip)
+
+# Renditions: smaller copies of iris, FFT and original images for the frontend
+# (renditions/<name>_<size>.jpg next to each full-size file, see backend/renditions.py)
+SAVE_RENDITIONS = True
+RENDITION_SIZES = [256, 512]  # Longer side in pixels ("full" is the original file)
+RENDITION_JPEG_QUALITY = 85
+
 # FFT settings
 FFT_IMAGE_SIZE = 512  # Output size for FFT visualization
 FFT_COLORMAP = "viridis"  # Matplotlib colormap for spectrum visualization
+FFT_BACKEND = "auto"  # "auto", "pyfftw", "scipy" or "numpy" (auto picks the fastest installed)
+FFT_THREADS = None  # Threads per FFT for multi-threaded backends (None = one per CPU core)
+FFT_PAD_TO_FAST_SIZE = False  # Zero-pad to a fast DFT size (changes the spectrum shape)
+SPECTRUM_CACHE_SIZE = 4  # Spectra kept in memory per process (shared by FFT, analysis and latent code)
 
 # Latent code settings
 LATENT_CODE_VERSION = "I"  # IRIS/I? (matching original design)
@@ -38,4 +79,30 @@ LATENT_SEED_BASE = 1000000000  # Base for seed generation (not used in new forma
 # File watching settings
 WATCH_PATTERNS = ["*.jpg", "*.jpeg", "*.png"]  # File patterns to watch
 WATCH_INTERVAL = 1.0  # Check interval in seconds (for polling fallback)
+WATCH_WORKERS = 2  # Photos processed at the same time (a visitor never waits for the previous one)
+WATCH_QUEUE_SIZE = 8  # Photos waiting for a worker before new events block (backpressure)
+WATCH_SETTLE_SECONDS = 0.5  # Wait for the camera to finish writing a new file
+
+# Packed waveforms of every iris for the frontend (backend/waveform_bundle.py)
+WAVEFORMS_PATH = DATA_DIR / "waveforms.bin"
+WAVEFORM_LENGTH = 64  # Points per radial profile waveform
+
+# On-demand resized images (start_server.py: /data/...jpg?w=256)
+RESIZE_CACHE_DIR = DATA_DIR / "cache" / "resized"
+RESIZE_CACHE_MAX_BYTES = 256 * 1024 * 1024  # Least recently used files are evicted above this
+RESIZE_MAX_WIDTH = 4096
+
+# Artifact writing: images and JSON are encoded/written on background threads
+# (backend/artifact_writer.py) so the capture path never waits on JPEG encoding
+ASYNC_ARTIFACT_WRITES = True  # False = write synchronously (still atomic)
+ARTIFACT_WRITER_WORKERS = 2  # Encoder threads
+ARTIFACT_WRITER_QUEUE_SIZE = 16  # Pending writes before submitting blocks (backpressure)
+# JSON artifacts (codes index, analysis, metadata, codes) also get a gzip copy
+# (codes_index.json.gz) that start_server.py sends to clients accepting gzip
+PRECOMPRESS_JSON = True
+JSON_GZIP_LEVEL = 9  # Compressed once at write time, downloaded many times
+
+# Batch processing settings (python -m backend.batch)
+BATCH_WORKERS = None  # Number of worker processes (None = one per CPU core)
+BATCH_CV_THREADS = 1  # OpenCV internal threads per worker (avoids oversubscribing cores)
 
@@ -0,0 +1,132 @@
+"""
+IRIS#1 - Digital Biometrics
+Append-only event log (data/events.log) for pushing new codes to displays.
+The backend appends one JSON line per event; start_server.py tails the file
+and forwards each line as a Server-Sent Event. The byte offset after a line
+is its event id, so a reconnecting display resumes exactly where it stopped.
+No broker or socket is involved: the log file is the channel.
+
+Past EVENTS_LOG_MAX_BYTES the log is rotated to events.log.1. The new log
+starts with a {"type": "log", "base": N} line, N being the bytes written to
+earlier logs, so event ids keep increasing across rotations. A display whose
+id is no longer in the log (rotated away, or from a log that was deleted)
+gets an "index" event with {"reset": true} and refetches the codes index.
+"""
+
+import json
+import os
+import time
+from pathlib import Path
+from backend.config import EVENTS_LOG_PATH, EVENTS_LOG_MAX_BYTES
+from backend.locking import file_lock
+
+
+def _lock_path(log_path):
+    return Path(log_path).with_suffix(".lock")
+
+
+def _log_base(f):
+    """Event id of the first byte of an open log (0 unless it was started by a rotation)"""
+    f.seek(0)
+    first = f.readline(256)
+    if first.startswith(b'{"type":"log"') and first.endswith(b"\n"):
+        try:
+            return int(json.loads(first)["base"])
+        except (ValueError, KeyError, TypeError):
+            pass
+    return 0
+
+
+def _rotate(log_path, size):
+    """Move the log to <log>.1 and start a new one whose ids continue after it"""
+    log_path = Path(log_path)
+    with open(log_path, 'rb') as f:
+        base = _log_base(f) + size
+    header = json.dumps({"type": "log", "base": base}, separators=(',', ':')) + "\n"
+    temp_path = log_path.with_name(log_path.name + ".new")
+    temp_path.write_bytes(header.encode("utf-8"))
+    os.replace(log_path, log_path.with_name(log_path.name + ".1"))
+    os.replace(temp_path, log_path)
+
+
+def publish_event(event_type, data, log_path=EVENTS_LOG_PATH, max_bytes=EVENTS_LOG_MAX_BYTES):
+    """
+    Append one event to the log, rotating it when it grows past max_bytes.
+    The line is written with a single O_APPEND write under the log's lock, so
+    concurrent writers never interleave and no event lands in a rotated file.
+
+    Args:
+        event_type: Event name (e.g. "code", "index")
+        data: JSON-serializable payload
+        log_path: Path of the event log
+        max_bytes: Size at which the log is rotated
+    """
+    line = json.dumps({"type": event_type, "time": time.time(), "data": data},
+                      separators=(',', ':')) + "\n"
+    with file_lock(_lock_path(log_path)):
+        fd = os.open(str(log_path), os.O_WRONLY | os.O_APPEND | os.O_CREAT, 0o644)
+        try:
+            os.write(fd, line.encode("utf-8"))
+            size = os.fstat(fd).st_size
+        finally:
+            os.close(fd)
+        if size > max_bytes:
+            _rotate(log_path, size)
+
+
+def read_events(offset, log_path=EVENTS_LOG_PATH, max_bytes=1 << 20):
+    """
+    Read the complete events after an event id.
+
+    Args:
+        offset: Event id to start from (0 = the start of the current log)
+        log_path: Path of the event log
+        max_bytes: Maximum bytes read per call
+
+    Returns:
+        Tuple of (events, new_offset): events is a list of (event_id, event_dict),
+        where event_id is the id just after that event's line. If `offset` is
+        not in the current log (rotated away, or beyond its end), the only event
+        is {"type": "index", "data": {"reset": True}} and reading resumes at the end.
+    """
+    try:
+        f = open(log_path, 'rb')
+    except FileNotFoundError:
+        return [], offset  # Not created yet, or being rotated
+    with f:
+        base = _log_base(f)
+        end = base + os.fstat(f.fileno()).st_size
+        if offset == 0:
+            offset = base
+        if not base <= offset <= end:
+            # Missed events are gone: tell the display to refetch the index
+            return [(end, {"type": "index", "data": {"reset": True}})], end
+        if offset == end:
+            return [], offset
+
+        f.seek(offset - base)
+        chunk = f.read(max_bytes)
+
+    events = []
+    position = offset
+    # Only complete lines: a line still being appended is picked up next time
+    for line in chunk.splitlines(keepends=True):
+        if not line.endswith(b"\n"):
+            break
+        position += len(line)
+        try:
+            event = json.loads(line)
+        except ValueError:
+            continue
+        if event.get("type") != "log":
+            events.append((position, event))
+    return events, position
+
+
+def end_offset(log_path=EVENTS_LOG_PATH):
+    """Current end of the log (subscribers without an event id start here)"""
+    try:
+        with open(log_path, 'rb') as f:
+            return _log_base(f) + os.fstat(f.fileno()).st_size
+    except FileNotFoundError:
+        return 0
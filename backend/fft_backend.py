@@ -0,0 +1,189 @@
+"""
+IRIS#1 - Digital Biometrics
+Pluggable FFT backend for the iris spectrum.
+Uses the real-input transform (rfft2) in single precision, rebuilds the full
+centered magnitude from the half spectrum, and reuses plans across images of
+the same shape. FFTW plans are not re-entrant, so each thread builds its own.
+pyfftw and scipy are optional: if installed they are used
+(multi-threaded), otherwise NumPy's FFT is the fallback.
+"""
+
+import os
+import threading
+import numpy as np
+from backend.config import FFT_BACKEND, FFT_THREADS, FFT_PAD_TO_FAST_SIZE
+
+try:
+    import pyfftw
+    import pyfftw.builders
+except ImportError:
+    pyfftw = None
+
+try:
+    import scipy.fft as scipy_fft
+except ImportError:
+    scipy_fft = None
+
+_fft_threads = FFT_THREADS
+_pyfftw_local = threading.local()  # .plans: {(shape, threads): plan} of this thread
+
+
+def available_backends():
+    """
+    List the FFT backends installed in this environment, fastest first.
+
+    Returns:
+        List of backend names
+    """
+    backends = []
+    if pyfftw is not None:
+        backends.append("pyfftw")
+    if scipy_fft is not None:
+        backends.append("scipy")
+    backends.append("numpy")
+    return backends
+
+
+def get_backend_name(backend=FFT_BACKEND):
+    """
+    Resolve a backend setting ("auto" or a name) to an installed backend.
+
+    Args:
+        backend: Backend name or "auto"
+
+    Returns:
+        Name of the backend that will be used
+    """
+    installed = available_backends()
+    if backend == "auto":
+        return installed[0]
+    if backend not in installed:
+        raise ValueError(f"FFT backend '{backend}' is not available (installed: {installed})")
+    return backend
+
+
+def set_fft_threads(threads):
+    """
+    Set the number of threads used by multi-threaded backends.
+    Batch workers set this to 1 so processes do not oversubscribe cores.
+
+    Args:
+        threads: Number of threads (None = one per CPU core)
+    """
+    global _fft_threads, _pyfftw_local
+    _fft_threads = threads
+    _pyfftw_local = threading.local()  # Drop the plans of every thread
+
+
+def _threads():
+    return _fft_threads or os.cpu_count() or 1
+
+
+def fast_fft_size(n):
+    """
+    Smallest size >= n that the FFT handles efficiently (5-smooth).
+
+    Args:
+        n: Minimum size
+
+    Returns:
+        Fast DFT size as integer
+    """
+    if scipy_fft is not None:
+        return scipy_fft.next_fast_len(n, real=True)
+
+    size = n
+    while True:
+        m = size
+        for p in (2, 3, 5):
+            while m % p == 0:
+                m //= p
+        if m == 1:
+            return size
+        size += 1
+
+
+def rfft2(image, backend=FFT_BACKEND):
+    """
+    Real-input 2D FFT in single precision.
+
+    Args:
+        image: 2D float32 array
+        backend: Backend name or "auto"
+
+    Returns:
+        Complex64 half spectrum of shape (h, w // 2 + 1)
+    """
+    name = get_backend_name(backend)
+
+    if name == "pyfftw":
+        # FFTW plans are expensive to build and cheap to reuse: one per shape.
+        # A plan owns its input/output buffers, so it must not be shared
+        # between threads (the watch folder runs several capture workers).
+        plans = getattr(_pyfftw_local, "plans", None)
+        if plans is None:
+            plans = _pyfftw_local.plans = {}
+        key = (image.shape, _threads())
+        plan = plans.get(key)
+        if plan is None:
+            template = pyfftw.empty_aligned(image.shape, dtype="float32")
+            plan = pyfftw.builders.rfft2(template, threads=_threads(),
+                                         planner_effort="FFTW_MEASURE")
+            plans[key] = plan
+        # The output array is reused by the next call with this plan
+        return plan(image).copy()
+
+    if name == "scipy":
+        # scipy's pocketfft keeps its own plan cache per shape
+        return scipy_fft.rfft2(image, workers=_threads())
+
+    return np.fft.rfft2(image)
+
+
+def _full_magnitude(half, width):
+    """
+    Rebuild the full (h, w) magnitude from the rfft2 half spectrum.
+    For real input F[k1, k2] = conj(F[-k1, -k2]), so |F| of the missing
+    columns is the half spectrum flipped in both axes.
+    """
+    h = half.shape[0]
+    stored = half.shape[1]  # w // 2 + 1
+    full = np.empty((h, width), dtype=np.float32)
+    full[:, :stored] = half
+
+    missing = width - stored
+    if missing > 0:
+        # Rows k1 -> -k1 mod h (row 0 stays, the rest reverse); columns k2 -> w - k2
+        mirrored_rows = np.concatenate((half[:1], half[:0:-1]))
+        full[:, stored:] = mirrored_rows[:, missing:0:-1]
+
+    return full
+
+
+def centered_log_magnitude(image, pad=FFT_PAD_TO_FAST_SIZE, backend=FFT_BACKEND):
+    """
+    Centered log-magnitude spectrum: fftshift(log1p(|FFT2(image)|)).
+
+    Args:
+        image: Grayscale image (numpy array)
+        pad: If True, zero-pad to a fast DFT size first
+        backend: Backend name or "auto"
+
+    Returns:
+        float32 array, zero frequency at the center
+    """
+    img_float = np.asarray(image, dtype=np.float32)
+
+    if pad:
+        h, w = img_float.shape
+        fast_h, fast_w = fast_fft_size(h), fast_fft_size(w)
+        if (fast_h, fast_w) != (h, w):
+            padded = np.zeros((fast_h, fast_w), dtype=np.float32)
+            padded[:h, :w] = img_float
+            img_float = padded
+
+    half = np.abs(rfft2(img_float, backend))
+    magnitude = _full_magnitude(half, img_float.shape[1])
+    np.log1p(magnitude, out=magnitude)  # log1p = log(1+x) to avoid log(0)
+
+    return np.fft.fftshift(magnitude)
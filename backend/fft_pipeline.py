@@ -8,28 +8,12 @@ import cv2
 import numpy as np
 import matplotlib.pyplot as plt
 from pathlib import Path
-from backend.config import FFT_DIR, FFT_IMAGE_SIZE, FFT_COLORMAP
-
-
-def load_processed_iris(image_path):
-    """
-    Load a processed (cropped) iris image.
-    
-    Args:
-        image_path: Path to the processed iris image
-    
-    Returns:
-        Grayscale image as numpy array
-    """
-    image_path = Path(image_path)
-    if not image_path.exists():
-        raise FileNotFoundError(f"Image not found: {image_path}")
-    
-    img = cv2.imread(str(image_path), cv2.IMREAD_GRAYSCALE)
-    if img is None:
-        raise ValueError(f"Could not load image: {image_path}")
-    
-    return img
+from backend import catalog
+from backend.artifact_writer import write_image
+from backend.config import FFT_DIR, FFT_IMAGE_SIZE, FFT_COLORMAP, SAVE_RENDITIONS
+from backend.spectrum import get_spectrum
+from backend.resolution import load_analysis_image
+from backend.renditions import save_renditions, record_renditions
 
 
 def compute_fft_2d(image):
@@ -42,20 +26,8 @@ def compute_fft_2d(image):
     Returns:
         Magnitude spectrum (numpy array, float)
     """
-    # Convert to float for FFT
-    img_float = image.astype(np.float32)
-    
-    # Compute 2D FFT
-    fft_result = np.fft.fft2(img_float)
-    
-    # Shift zero frequency to center
-    fft_shifted = np.fft.fftshift(fft_result)
-    
-    # Compute magnitude spectrum (log scale for better visualization)
-    magnitude = np.abs(fft_shifted)
-    magnitude_log = np.log1p(magnitude)  # log1p = log(1+x) to avoid log(0)
-    
-    return magnitude_log
+    # Shared with the other consumers, so each image is transformed only once per run
+    return get_spectrum(image)
 
 
 def create_fft_visualization(magnitude_spectrum, output_size=FFT_IMAGE_SIZE, colormap=FFT_COLORMAP):
@@ -89,36 +61,61 @@ def create_fft_visualization(magnitude_spectrum, output_size=FFT_IMAGE_SIZE, col
     return spectrum_rgb
 
 
-def process_iris_fft(processed_image_path, output_filename=None):
+def process_iris_fft_image(iris_img, output_filename):
     """
-    Main function: load processed iris, compute FFT, save visualization.
+    Compute FFT of an in-memory iris image and save the visualization.
     
     Args:
-        processed_image_path: Path to processed (cropped) iris image
-        output_filename: Optional output filename. If None, uses input filename.
+        iris_img: Grayscale iris image at analysis resolution (numpy array)
+        output_filename: Output filename in FFT_DIR (e.g. fft_iris-001.jpg)
     
     Returns:
-        Path to the saved FFT visualization image
+        Tuple of (output_path, fft_spectrum)
     """
-    # Load the processed iris image
-    iris_img = load_processed_iris(processed_image_path)
-    
     # Compute FFT
     fft_spectrum = compute_fft_2d(iris_img)
     
     # Create visualization
     fft_viz = create_fft_visualization(fft_spectrum, FFT_IMAGE_SIZE, FFT_COLORMAP)
     
-    # Generate output filename
-    if output_filename is None:
-        input_path = Path(processed_image_path)
-        output_filename = f"fft_{input_path.stem}.jpg"
-    
     output_path = FFT_DIR / output_filename
     
     # Save the visualization (convert RGB to BGR for OpenCV)
     fft_bgr = cv2.cvtColor(fft_viz, cv2.COLOR_RGB2BGR)
-    cv2.imwrite(str(output_path), fft_bgr)
+    write_image(output_path, fft_bgr)
+    
+    iris_id = catalog.iris_id_from_name(output_filename)
+    catalog.record_artifact(iris_id, "fft", output_path)
+    
+    if SAVE_RENDITIONS:
+        renditions = save_renditions(fft_bgr, output_path)
+        record_renditions(iris_id, "fft", renditions)
+        catalog.record_rendition_artifacts(iris_id, "fft", renditions)
+    
+    return output_path, fft_spectrum
+
+
+def process_iris_fft(processed_image_path, output_filename=None):
+    """
+    Main function: load processed iris, compute FFT, save visualization.
+    
+    Args:
+        processed_image_path: Path to processed (cropped) iris image
+        output_filename: Optional output filename. If None, uses input filename.
+    
+    Returns:
+        Tuple of (output_path, fft_spectrum)
+    """
+    processed_image_path = Path(processed_image_path)
+    
+    # Load the processed iris image at analysis resolution
+    iris_img = load_analysis_image(processed_image_path)
+    
+    # Generate output filename
+    if output_filename is None:
+        output_filename = f"fft_{processed_image_path.stem}.jpg"
+    
+    output_path, fft_spectrum = process_iris_fft_image(iris_img, output_filename)
     
     print(f"✓ FFT computed: {processed_image_path.name} -> {output_path.name}")
     return output_path, fft_spectrum
@@ -1,84 +1,245 @@
 """
 IRIS#1 - Digital Biometrics
 Generate codes index JSON file for frontend to read latent codes.
-This script scans data/codes/ and creates a JSON index file that the frontend can load via HTTP.
+save_latent_code upserts one entry per new code (upsert_code_entry); running
+this script rebuilds the whole index from the catalog / data/codes/:
+
+    python -m backend.generate_codes_index
 """
 
+import bisect
 import json
+import time
 from pathlib import Path
-from backend.config import CODES_DIR, DATA_DIR
+from backend.artifact_writer import atomic_write_bytes
+from backend.config import CODES_DIR, DATA_DIR, CATALOG_ENABLED, CATALOG_PATH, PRECOMPRESS_JSON
+from backend.locking import file_lock
+
+INDEX_VERSION = '1.0'
+
+def generate_codes_index(codes_dir=CODES_DIR, db_path=CATALOG_PATH):
+    """
+    Build the list of latent codes with metadata.
+    Read from the catalog (one query); codes in data/codes/ that the catalog
+    is missing (a failed catalog write) are read from their files, so the
+    rebuild never drops a code. Falls back to scanning data/codes/ when the
+    catalog is disabled or unreadable.
+    
+    Args:
+        codes_dir: Folder of the code files (data/codes/)
+        db_path: Path of the catalog database
+    """
+    if not CATALOG_ENABLED:
+        return scan_codes_dir(codes_dir)
+    
+    try:
+        codes_list = codes_from_catalog(db_path)
+    except Exception as e:
+        print(f"Warning: Could not read catalog, scanning data/codes/: {e}")
+        return scan_codes_dir(codes_dir)
+    
+    catalog_ids = {code['id'] for code in codes_list}
+    missing = [code_file for code_file in sorted(Path(codes_dir).glob("code_*.txt"))
+               if code_file.stem.replace("code_", "") not in catalog_ids]
+    if missing:
+        print(f"Warning: {len(missing)} code(s) in data/codes/ are not in the catalog "
+              f"({', '.join(f.stem.replace('code_', '') for f in missing[:5])}"
+              f"{', ...' if len(missing) > 5 else ''}); reading them from disk. "
+              f"Backfill with: python -m backend.catalog import")
+        codes_list += [entry for entry in map(read_code_file, missing) if entry is not None]
+        codes_list.sort(key=lambda x: x['id'])
+    
+    return codes_list
+
+
+def codes_from_catalog(db_path=CATALOG_PATH):
+    """
+    Build the index entries from the catalog, in the same format as scan_codes_dir.
+    """
+    from backend.catalog import list_codes
+    
+    return [make_code_entry(row['iris_id'], row['latent_code'], row['seed'],
+                            row['features'], row['code_saved_at'])
+            for row in list_codes(db_path)]
+
+
+def make_code_entry(iris_id, latent_code, seed, features, timestamp):
+    """
+    Build one index entry (same layout as the entries read from data/codes/).
+    """
+    return {
+        'id': iris_id,
+        'code': latent_code,
+        'filename': f"code_{iris_id}.txt",
+        'metadata': {
+            'latent_code': latent_code,
+            'seed': seed,
+            'features': features,
+            'timestamp': timestamp,
+        }
+    }
+
 
-def generate_codes_index():
+def read_code_file(code_file):
+    """
+    Build one index entry from data/codes/code_iris-XXX.txt and its JSON sidecar.
+    Returns None if the code file cannot be read.
+    """
+    try:
+        # Read the latent code from .txt file
+        with open(code_file, 'r') as f:
+            latent_code = f.read().strip()
+        
+        # Extract iris number from filename (e.g., "code_iris-001.txt" -> "iris-001")
+        filename = code_file.stem  # "code_iris-001"
+        iris_id = filename.replace("code_", "")  # "iris-001"
+        
+        # Also check if there's a corresponding JSON file for metadata
+        json_file = code_file.with_suffix('.json')
+        metadata = {}
+        if json_file.exists():
+            try:
+                with open(json_file, 'r') as f:
+                    metadata = json.load(f)
+            except:
+                pass
+        
+        return {
+            'id': iris_id,
+            'code': latent_code,
+            'filename': code_file.name,
+            'metadata': metadata
+        }
+        
+    except Exception as e:
+        print(f"Warning: Could not read {code_file.name}: {e}")
+        return None
+
+
+def scan_codes_dir(codes_dir=CODES_DIR):
     """
     Scan data/codes/ directory and generate a JSON index file.
     Returns list of latent codes with metadata.
     """
-    codes_list = []
-    
     # Find all .txt files in codes directory
-    code_files = sorted(CODES_DIR.glob("code_*.txt"))
-    
-    for code_file in code_files:
-        try:
-            # Read the latent code from .txt file
-            with open(code_file, 'r') as f:
-                latent_code = f.read().strip()
-            
-            # Extract iris number from filename (e.g., "code_iris-001.txt" -> "iris-001")
-            filename = code_file.stem  # "code_iris-001"
-            iris_id = filename.replace("code_", "")  # "iris-001"
-            
-            # Also check if there's a corresponding JSON file for metadata
-            json_file = code_file.with_suffix('.json')
-            metadata = {}
-            if json_file.exists():
-                try:
-                    with open(json_file, 'r') as f:
-                        metadata = json.load(f)
-                except:
-                    pass
-            
-            codes_list.append({
-                'id': iris_id,
-                'code': latent_code,
-                'filename': code_file.name,
-                'metadata': metadata
-            })
-            
-        except Exception as e:
-            print(f"Warning: Could not read {code_file.name}: {e}")
-            continue
+    code_files = sorted(Path(codes_dir).glob("code_*.txt"))
+    codes_list = [entry for entry in map(read_code_file, code_files) if entry is not None]
     
     # Sort by iris number (iris-001, iris-002, etc.)
     codes_list.sort(key=lambda x: x['id'])
     
     return codes_list
 
+def _default_index_path():
+    return DATA_DIR / "codes_index.json"
+
+
+def _lock_path(output_path):
+    return Path(output_path).with_suffix(".lock")
+
+
+def _read_index(output_path):
+    """Current index contents, or None if missing/unreadable"""
+    output_path = Path(output_path)
+    if not output_path.exists():
+        return None
+    try:
+        with open(output_path, 'r') as f:
+            return json.load(f)
+    except (ValueError, OSError) as e:
+        print(f"Warning: Could not read {output_path.name}: {e}")
+        return None
+
+
+def _write_index(output_path, codes_list, cursor):
+    """Atomically replace the index file (compact JSON: it is rewritten on every new code)"""
+    index_data = {
+        'version': INDEX_VERSION,
+        'count': len(codes_list),
+        'cursor': cursor,  # seq of the most recent change; clients poll /api/codes?since=<cursor>
+        'codes': codes_list,
+        'last_updated': time.time()
+    }
+    atomic_write_bytes(output_path, json.dumps(index_data, separators=(',', ':')).encode("utf-8"),
+                       gzip_copy=PRECOMPRESS_JSON)
+
+
 def save_codes_index(output_path=None):
     """
-    Generate codes index and save to JSON file.
+    Rebuild the whole codes index and save it to a JSON file.
     Default location: data/codes_index.json
     """
     if output_path is None:
-        output_path = DATA_DIR / "codes_index.json"
+        output_path = _default_index_path()
     
-    codes_list = generate_codes_index()
-    
-    index_data = {
-        'version': '1.0',
-        'count': len(codes_list),
-        'codes': codes_list,
-        'last_updated': None  # Will be set by frontend or can add timestamp here
-    }
+    with file_lock(_lock_path(output_path)):
+        # Cursors keep increasing across rebuilds, so polling clients simply re-receive every entry
+        previous = _read_index(output_path) or {}
+        cursor = previous.get('cursor', 0)
+        codes_list = generate_codes_index()
+        for code in codes_list:
+            cursor += 1
+            code['seq'] = cursor
+        _write_index(output_path, codes_list, cursor)
     
-    with open(output_path, 'w') as f:
-        json.dump(index_data, f, indent=2)
+    # Tell connected displays to fetch the delta (e.g. after a batch run)
+    try:
+        from backend.events import publish_event
+        publish_event("index", {"cursor": cursor, "count": len(codes_list)})
+    except Exception as e:
+        print(f"Warning: Could not publish index event: {e}")
     
     print(f"✓ Generated codes index: {output_path}")
     print(f"  Found {len(codes_list)} latent codes")
     
     return output_path
 
+
+def upsert_code_entry(entry, output_path=None, rebuild_if_missing=True):
+    """
+    Insert or replace one entry in the codes index, keeping it sorted by id.
+    The entry gets the next cursor value (seq), so delta polling picks it up.
+    Only the index file itself is read; concurrent writers are serialized by a file lock.
+    
+    Args:
+        entry: Index entry (see make_code_entry)
+        output_path: Index path (default: data/codes_index.json)
+        rebuild_if_missing: If the index does not exist (or is unreadable), rebuild
+                            it in full first so older codes are not dropped
+    
+    Returns:
+        Path to the index file
+    """
+    if output_path is None:
+        output_path = _default_index_path()
+    output_path = Path(output_path)
+    
+    with file_lock(_lock_path(output_path)):
+        index = _read_index(output_path)
+        if index is None:
+            codes_list = generate_codes_index() if rebuild_if_missing else []
+            cursor = 0
+            for code in codes_list:
+                cursor += 1
+                code['seq'] = cursor
+        else:
+            codes_list = index.get('codes', [])
+            cursor = index.get('cursor', len(codes_list))
+        
+        cursor += 1
+        entry = {**entry, 'seq': cursor}
+        
+        ids = [code['id'] for code in codes_list]
+        position = bisect.bisect_left(ids, entry['id'])
+        if position < len(ids) and ids[position] == entry['id']:
+            codes_list[position] = entry
+        else:
+            codes_list.insert(position, entry)
+        
+        _write_index(output_path, codes_list, cursor)
+    
+    return output_path
+
+
 if __name__ == "__main__":
     save_codes_index()
-
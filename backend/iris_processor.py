@@ -5,110 +5,593 @@ Uses pupil detection and ring mask to avoid eyelids and eyelashes.
 """
 
 import cv2
+import threading
+import time
 import numpy as np
+from collections import deque
+from functools import lru_cache
 from pathlib import Path
-from backend.config import PROCESSED_DIR, IRIS_CROP_SIZE
+from backend import catalog
+from backend.artifact_writer import write_image, write_json
+from backend.config import (
+    PROCESSED_DIR, IRIS_CROP_SIZE, PUPIL_DETECTION_MODE, PUPIL_PYRAMID_SIZE, PUPIL_REFINE_WINDOW,
+    PUPIL_STRATEGY_ORDER, PUPIL_PRIOR_HISTORY, PUPIL_PRIOR_WINDOW, PUPIL_PRIOR_MIN_CONFIDENCE,
+    POLAR_STRIP_HEIGHT, POLAR_STRIP_WIDTH, SAVE_POLAR_STRIP, SAVE_RENDITIONS
+)
 
 
-def load_image(image_path):
+# OpenCV decode flags for DCT-domain scaled JPEG decoding, by scale factor
+_REDUCED_COLOR_FLAGS = {
+    1: cv2.IMREAD_COLOR,
+    2: cv2.IMREAD_REDUCED_COLOR_2,
+    4: cv2.IMREAD_REDUCED_COLOR_4,
+    8: cv2.IMREAD_REDUCED_COLOR_8,
+}
+_REDUCED_GRAYSCALE_FLAGS = {
+    1: cv2.IMREAD_GRAYSCALE,
+    2: cv2.IMREAD_REDUCED_GRAYSCALE_2,
+    4: cv2.IMREAD_REDUCED_GRAYSCALE_4,
+    8: cv2.IMREAD_REDUCED_GRAYSCALE_8,
+}
+
+
+def load_image(image_path, min_side=None, grayscale=False):
     """
     Load an image from file path.
     
     Args:
         image_path: Path to the image file (str or Path)
+        min_side: Optional minimum short-side size in pixels. If given, the
+                  cheapest reduced decode (1/2, 1/4, 1/8) that still satisfies
+                  it is used. None = full resolution.
+        grayscale: If True, decode straight to grayscale
+    
+    Returns:
+        numpy array of the image (BGR format from OpenCV, or grayscale)
+    """
+    img, _ = load_image_reduced(image_path, min_side, grayscale)
+    return img
+
+
+def load_image_reduced(image_path, min_side=None, grayscale=False):
+    """
+    Load an image at reduced scale, reporting the scale factor used.
+    For JPEGs the reduction happens in the DCT domain, so a 1/8 decode
+    costs a fraction of a full decode in both time and memory.
+    
+    Args:
+        image_path: Path to the image file (str or Path)
+        min_side: Minimum short-side size in pixels (None = full resolution)
+        grayscale: If True, decode straight to grayscale
     
     Returns:
-        numpy array of the image (BGR format from OpenCV)
+        Tuple of (image, factor): factor is 1, 2, 4 or 8. Multiply coordinates
+        in the returned image by factor to get full-resolution coordinates.
     """
     image_path = Path(image_path)
     if not image_path.exists():
         raise FileNotFoundError(f"Image not found: {image_path}")
     
-    img = cv2.imread(str(image_path))
+    factor = 1
+    if min_side is not None:
+        size = get_image_size(image_path)
+        if size is not None:
+            factor = reduced_decode_factor(size, min_side)
+    
+    flags = _REDUCED_GRAYSCALE_FLAGS if grayscale else _REDUCED_COLOR_FLAGS
+    img = cv2.imread(str(image_path), flags[factor])
     if img is None:
         raise ValueError(f"Could not load image: {image_path}")
     
-    return img
+    return img, factor
+
+
+def get_image_size(image_path):
+    """
+    Read image dimensions from the file header without decoding pixels.
+    
+    Args:
+        image_path: Path to the image file
+    
+    Returns:
+        Tuple of (width, height), or None if the header cannot be read
+    """
+    try:
+        from PIL import Image
+        with Image.open(image_path) as img:
+            return img.size
+    except Exception:
+        return None
+
+
+def reduced_decode_factor(size, min_side):
+    """
+    Largest decode reduction (8, 4, 2 or 1) that keeps the short side >= min_side.
+    
+    Args:
+        size: Tuple of (width, height) at full resolution
+        min_side: Minimum short-side size in pixels
+    
+    Returns:
+        Scale factor as integer
+    """
+    short_side = min(size)
+    for factor in (8, 4, 2):
+        if short_side // factor >= min_side:
+            return factor
+    return 1
+
+
+def make_preview(image_path, size):
+    """
+    Create a preview whose short side is `size`, using the cheapest reduced decode.
+    
+    Args:
+        image_path: Path to the image file
+        size: Short-side size of the preview in pixels
+    
+    Returns:
+        Preview image (numpy array, BGR format)
+    """
+    img = load_image(image_path, min_side=size)
+    h, w = img.shape[:2]
+    scale = size / min(h, w)
+    if scale >= 1.0:
+        return img
+    return cv2.resize(img, (max(1, int(round(w * scale))), max(1, int(round(h * scale)))),
+                      interpolation=cv2.INTER_AREA)
 
 
-def detect_pupil(image):
+def detect_pupil(image, mode=PUPIL_DETECTION_MODE, prior=None):
     """
     Detect pupil center and radius using threshold/contour method.
     More robust version with multiple detection strategies.
     
     Args:
         image: Input image (numpy array, BGR format)
+        mode: "pyramid" (coarse search on a downsampled copy, refined at full
+              resolution around the estimate) or "full" (full-resolution search)
+        prior: Optional PupilSessionPrior. If it has an estimate, a small ROI
+               around it is searched first; the frame search only runs when that
+               fails or its confidence is low. Successful detections update it.
     
     Returns:
         Tuple of (cx, cy, r_pupil, confidence) or None if detection fails
         confidence: float between 0.0 and 1.0, indicating detection quality
     """
+    if prior is not None:
+        result = detect_pupil_with_prior(image, prior)
+        if result is not None:
+            return result
+    
+    result = None
+    if mode == "pyramid":
+        result = detect_pupil_pyramid(image)
+    if result is None:
+        # Coarse search failed (or full mode): full-resolution search
+        result = detect_pupil_full(image)
+    
+    if prior is not None and result is not None:
+        prior.update(*result)
+    return result
+
+
+class PupilSessionPrior:
+    """
+    Remembers recent successful pupil detections of a tethered capture session.
+    With a fixed camera and chin rest the pupil lands in nearly the same place
+    every time, so the median of recent results is a good place to look first.
+    """
+    
+    def __init__(self, history=PUPIL_PRIOR_HISTORY, window=PUPIL_PRIOR_WINDOW,
+                 min_confidence=PUPIL_PRIOR_MIN_CONFIDENCE):
+        self.recent = deque(maxlen=history)
+        self.window = window
+        self.min_confidence = min_confidence
+        self.stats = {"roi_hits": 0, "roi_misses": 0, "low_confidence": 0}
+        self._lock = threading.Lock()  # Shared by concurrent capture workers
+    
+    def estimate(self):
+        """
+        Median of the remembered detections.
+        
+        Returns:
+            Tuple of (cx, cy, r_pupil) or None if nothing is remembered yet
+        """
+        with self._lock:
+            recent = list(self.recent)
+        if not recent:
+            return None
+        cx, cy, r_pupil = np.median(np.array(recent), axis=0)
+        return float(cx), float(cy), float(r_pupil)
+    
+    def update(self, cx, cy, r_pupil, confidence):
+        """Remember a detection if it is confident enough"""
+        if confidence >= self.min_confidence:
+            with self._lock:
+                self.recent.append((cx, cy, r_pupil))
+    
+    def reset(self):
+        """Forget the session (e.g. after the camera or chin rest moved)"""
+        with self._lock:
+            self.recent.clear()
+    
+    def count(self, outcome):
+        """Add one to a stats counter ("roi_hits", "roi_misses" or "low_confidence")"""
+        with self._lock:
+            self.stats[outcome] += 1
+
+
+def detect_pupil_with_prior(image, prior):
+    """
+    Search only the ROI around the session prior's estimate.
+    
+    Args:
+        image: Input image (numpy array, BGR format)
+        prior: PupilSessionPrior
+    
+    Returns:
+        Tuple of (cx, cy, r_pupil, confidence), or None if the prior is empty,
+        nothing was found in the ROI, or the result is below the prior's
+        minimum confidence
+    """
+    estimate = prior.estimate()
+    if estimate is None:
+        return None
+    
+    refined = refine_pupil_in_window(image, *estimate, window=prior.window)
+    if refined is None:
+        prior.count("roi_misses")
+        return None
+    
+    h, w = image.shape[:2]
+    contour, area, circularity, cx, cy, r_pupil = refined
+    confidence = calculate_detection_confidence(
+        contour, area, circularity, r_pupil, h, w, cx, cy
+    )
+    if confidence < prior.min_confidence:
+        prior.count("low_confidence")
+        return None
+    
+    prior.count("roi_hits")
+    prior.update(cx, cy, r_pupil, confidence)
+    return (cx, cy, r_pupil, confidence)
+
+
+def detect_pupil_full(image):
+    """
+    Detect the pupil by searching the whole image at full resolution.
+    
+    Args:
+        image: Input image (numpy array, BGR format)
+    
+    Returns:
+        Tuple of (cx, cy, r_pupil, confidence) or None if detection fails
+    """
     # Convert to grayscale
     gray = cv2.cvtColor(image, cv2.COLOR_BGR2GRAY)
     h, w = gray.shape
     
-    # Strategy 1: OTSU threshold (works well for high contrast)
-    blurred = cv2.GaussianBlur(gray, (9, 9), 2)
-    _, thresh1 = cv2.threshold(blurred, 0, 255, cv2.THRESH_BINARY_INV + cv2.THRESH_OTSU)
+    candidate = find_pupil_candidate(gray)
+    if candidate is None:
+        return None
     
-    # Strategy 2: Adaptive threshold (works better for varying lighting)
-    thresh2 = cv2.adaptiveThreshold(blurred, 255, cv2.ADAPTIVE_THRESH_GAUSSIAN_C, 
-                                     cv2.THRESH_BINARY_INV, 11, 2)
+    contour, area, circularity, cx, cy, r_pupil = candidate
+    confidence = calculate_detection_confidence(
+        contour, area, circularity, r_pupil, h, w, cx, cy
+    )
+    return (cx, cy, r_pupil, confidence)
+
+
+def detect_pupil_pyramid(image, coarse_size=PUPIL_PYRAMID_SIZE):
+    """
+    Coarse-to-fine pupil detection.
+    Finds the pupil on a downsampled copy, then refines center and radius in a
+    small full-resolution window around that estimate.
     
-    # Strategy 3: Simple threshold at low value (pupil is very dark)
-    _, thresh3 = cv2.threshold(blurred, 30, 255, cv2.THRESH_BINARY_INV)
+    Args:
+        image: Input image (numpy array, BGR format)
+        coarse_size: Longer side of the downsampled copy (pixels)
     
-    # Try each strategy
-    for thresh in [thresh1, thresh2, thresh3]:
-        # Find contours
-        contours, _ = cv2.findContours(thresh, cv2.RETR_EXTERNAL, cv2.CHAIN_APPROX_SIMPLE)
-        
-        if not contours:
-            continue
+    Returns:
+        Tuple of (cx, cy, r_pupil, confidence) or None if detection fails
+    """
+    h, w = image.shape[:2]
+    scale = coarse_size / max(h, w)
+    if scale >= 1.0:
+        # Already small enough: the full search is the coarse search
+        return detect_pupil_full(image)
+    
+    # Coarse level: same strategies, on a copy with ~1/scale² fewer pixels.
+    # Decimate by half the factor first so the area resize only touches a fraction
+    # of the frame; the remaining 2x area averaging is enough anti-aliasing here.
+    step = max(1, int(1 / (2 * scale)))
+    small = cv2.resize(image[::step, ::step], (int(w * scale), int(h * scale)),
+                       interpolation=cv2.INTER_AREA)
+    gray_small = cv2.cvtColor(small, cv2.COLOR_BGR2GRAY)
+    candidate = find_pupil_candidate(gray_small)
+    if candidate is None:
+        return None
+    
+    contour, area, circularity, cx, cy, r_pupil = candidate
+    
+    # Fine level: refine in a full-resolution window around the estimate
+    refined = refine_pupil_in_window(image, cx / scale, cy / scale, r_pupil / scale)
+    if refined is not None:
+        contour, area, circularity, cx, cy, r_pupil = refined
+    else:
+        # Keep the coarse estimate, mapped back to full resolution
+        contour = (contour / scale).astype(np.int32)
+        area = area / (scale * scale)
+        cx, cy, r_pupil = int(cx / scale), int(cy / scale), int(r_pupil / scale)
+    
+    confidence = calculate_detection_confidence(
+        contour, area, circularity, r_pupil, h, w, cx, cy
+    )
+    return (cx, cy, r_pupil, confidence)
+
+
+def _threshold_otsu(blurred):
+    """OTSU threshold (works well for high contrast)"""
+    _, thresh = cv2.threshold(blurred, 0, 255, cv2.THRESH_BINARY_INV + cv2.THRESH_OTSU)
+    return thresh
+
+
+def _threshold_adaptive(blurred):
+    """Adaptive threshold (works better for varying lighting)"""
+    return cv2.adaptiveThreshold(blurred, 255, cv2.ADAPTIVE_THRESH_GAUSSIAN_C,
+                                 cv2.THRESH_BINARY_INV, 11, 2)
+
+
+def _threshold_fixed(blurred):
+    """Simple threshold at low value (pupil is very dark)"""
+    _, thresh = cv2.threshold(blurred, 30, 255, cv2.THRESH_BINARY_INV)
+    return thresh
+
+
+# Registry of pupil threshold strategies: name -> function(blurred gray) -> binary image
+PUPIL_STRATEGIES = {
+    "otsu": _threshold_otsu,
+    "adaptive": _threshold_adaptive,
+    "fixed": _threshold_fixed,
+}
+
+# Per-strategy counters (per process): attempts, hits and seconds spent.
+# Capture workers search concurrently, so updates hold _strategy_stats_lock.
+_strategy_stats = {}
+_strategy_stats_lock = threading.Lock()
+
+
+def register_pupil_strategy(name, threshold_fn):
+    """
+    Add (or replace) a pupil threshold strategy.
+    
+    Args:
+        name: Strategy name, as used in PUPIL_STRATEGY_ORDER
+        threshold_fn: Function taking the blurred grayscale image and returning
+                      a binary image with the pupil in white
+    """
+    PUPIL_STRATEGIES[name] = threshold_fn
+
+
+def get_strategy_stats():
+    """
+    Report how often each strategy was tried, how often it found the pupil,
+    and how much time it cost.
+    
+    Returns:
+        Dictionary {name: {"attempts", "hits", "hit_rate", "seconds"}}
+    """
+    stats = {}
+    with _strategy_stats_lock:
+        snapshot = {name: dict(counters) for name, counters in _strategy_stats.items()}
+    for name, counters in snapshot.items():
+        attempts = counters["attempts"]
+        stats[name] = {
+            **counters,
+            "hit_rate": counters["hits"] / attempts if attempts else 0.0,
+        }
+    return stats
+
+
+def reset_strategy_stats():
+    """Clear the per-strategy counters"""
+    with _strategy_stats_lock:
+        _strategy_stats.clear()
+
+
+def merge_strategy_stats(total, stats):
+    """
+    Add one counters snapshot (e.g. from a worker process) into a running total.
+    
+    Args:
+        total: Dictionary in get_strategy_stats() format, updated in place
+        stats: Dictionary in get_strategy_stats() format
+    
+    Returns:
+        The updated total
+    """
+    for name, counters in stats.items():
+        entry = total.setdefault(name, {"attempts": 0, "hits": 0, "seconds": 0.0})
+        entry["attempts"] += counters["attempts"]
+        entry["hits"] += counters["hits"]
+        entry["seconds"] += counters["seconds"]
+        entry["hit_rate"] = entry["hits"] / entry["attempts"] if entry["attempts"] else 0.0
+    return total
+
+
+def print_strategy_stats(stats):
+    """Print per-strategy hit rate and time spent"""
+    if not stats:
+        return
+    print("  Pupil strategies:")
+    for name, counters in stats.items():
+        mean_ms = counters["seconds"] / counters["attempts"] * 1000 if counters["attempts"] else 0.0
+        print(f"    {name:<10} {counters['hits']}/{counters['attempts']} hits "
+              f"({counters['hit_rate'] * 100:.0f}%), {mean_ms:.1f} ms/attempt")
+
+
+def find_pupil_candidate(gray, order=None):
+    """
+    Search a grayscale image for the pupil with several threshold strategies.
+    Strategies run lazily in order and the search stops at the first hit.
+    
+    Args:
+        gray: Grayscale image (numpy array)
+        order: Optional list of strategy names (default: PUPIL_STRATEGY_ORDER)
+    
+    Returns:
+        Tuple of (contour, area, circularity, cx, cy, r_pupil) or None
+    """
+    if order is None:
+        order = PUPIL_STRATEGY_ORDER
+    
+    blurred = cv2.GaussianBlur(gray, (9, 9), 2)
+    
+    for name in order:
+        start = time.perf_counter()
         
-        # Filter contours by area and circularity
-        valid_contours = []
-        for contour in contours:
-            area = cv2.contourArea(contour)
-            if area < 100:  # Too small
-                continue
-            
-            # Check circularity
-            perimeter = cv2.arcLength(contour, True)
-            if perimeter == 0:
-                continue
-            circularity = 4 * np.pi * area / (perimeter * perimeter)
-            
-            # Pupil should be somewhat circular (circularity > 0.5)
-            if circularity > 0.5:
-                valid_contours.append((contour, area))
+        thresh = PUPIL_STRATEGIES[name](blurred)
+        candidate = _pupil_from_threshold(thresh)
         
-        if not valid_contours:
+        with _strategy_stats_lock:
+            counters = _strategy_stats.setdefault(name, {"attempts": 0, "hits": 0, "seconds": 0.0})
+            counters["attempts"] += 1
+            counters["seconds"] += time.perf_counter() - start
+            if candidate is not None:
+                counters["hits"] += 1
+        if candidate is not None:
+            return candidate
+    
+    # All strategies failed
+    return None
+
+
+def _pupil_from_threshold(thresh):
+    """
+    Pick the pupil from a binary threshold image.
+    
+    Args:
+        thresh: Binary image with dark regions in white
+    
+    Returns:
+        Tuple of (contour, area, circularity, cx, cy, r_pupil) or None
+    """
+    h, w = thresh.shape
+    
+    # Find contours
+    contours, _ = cv2.findContours(thresh, cv2.RETR_EXTERNAL, cv2.CHAIN_APPROX_SIMPLE)
+    
+    if not contours:
+        return None
+    
+    # Filter contours by area and circularity
+    valid_contours = []
+    for contour in contours:
+        area = cv2.contourArea(contour)
+        if area < 100:  # Too small
             continue
         
-        # Get the largest valid contour (should be the pupil)
-        largest_contour, _ = max(valid_contours, key=lambda x: x[1])
+        # Check circularity
+        perimeter = cv2.arcLength(contour, True)
+        if perimeter == 0:
+            continue
+        circularity = 4 * np.pi * area / (perimeter * perimeter)
         
-        # Fit a circle to the contour
-        (cx, cy), radius = cv2.minEnclosingCircle(largest_contour)
-        cx, cy, r_pupil = int(cx), int(cy), int(radius)
+        # Pupil should be somewhat circular (circularity > 0.5)
+        if circularity > 0.5:
+            valid_contours.append((contour, area, circularity))
+    
+    if not valid_contours:
+        return None
+    
+    # Get the largest valid contour (should be the pupil)
+    largest_contour, area, circularity = max(valid_contours, key=lambda x: x[1])
+    
+    # Fit a circle to the contour
+    (cx, cy), radius = cv2.minEnclosingCircle(largest_contour)
+    cx, cy, r_pupil = int(cx), int(cy), int(radius)
+    
+    # Validate: pupil should be reasonably sized and not too close to edges
+    min_radius = max(10, min(h, w) // 20)  # At least 5% of image
+    max_radius = min(h, w) // 3  # At most 33% of image
+    
+    if min_radius <= r_pupil <= max_radius:
+        # Check if center is reasonably positioned (not at extreme edges)
+        margin = min(h, w) // 10
+        if margin < cx < w - margin and margin < cy < h - margin:
+            return (largest_contour, area, circularity, cx, cy, r_pupil)
+    
+    return None
+
+
+def refine_pupil_in_window(image, cx, cy, r_pupil, window=PUPIL_REFINE_WINDOW):
+    """
+    Refine a pupil estimate inside a small full-resolution window.
+    The threshold sits halfway between the pupil and iris intensities
+    measured just inside and just outside the estimated pupil edge, so it adapts to each capture's exposure.
+    
+    Args:
+        image: Full-resolution image (numpy array, BGR format)
+        cx, cy: Estimated pupil center (full-resolution coordinates)
+        r_pupil: Estimated pupil radius (full-resolution pixels)
+        window: Window half-size in pupil radii
+    
+    Returns:
+        Tuple of (contour, area, circularity, cx, cy, r_pupil) in full-resolution
+        coordinates, or None if no pupil-like contour is found near the estimate
+    """
+    h, w = image.shape[:2]
+    half = int(r_pupil * window) + 1
+    x0, y0 = max(0, int(cx) - half), max(0, int(cy) - half)
+    x1, y1 = min(w, int(cx) + half), min(h, int(cy) + half)
+    if x1 - x0 < 8 or y1 - y0 < 8:
+        return None
+    
+    roi = image[y0:y1, x0:x1]
+    gray = cv2.cvtColor(roi, cv2.COLOR_BGR2GRAY) if roi.ndim == 3 else roi
+    blurred = cv2.GaussianBlur(gray, (9, 9), 2)
+    
+    # Sample pupil (inside 0.5r) and iris (1.2r-1.45r) intensities around the
+    # estimate, on a sparse grid: the medians do not need every pixel
+    stride = max(1, int(r_pupil) // 64)
+    sparse = blurred[::stride, ::stride]
+    yy, xx = np.ogrid[y0:y1:stride, x0:x1:stride]
+    dist = np.sqrt((xx - cx)**2 + (yy - cy)**2)
+    pupil_pixels = sparse[dist < r_pupil * 0.5]
+    iris_pixels = sparse[(dist > r_pupil * 1.2) & (dist < r_pupil * 1.45)]
+    if pupil_pixels.size == 0 or iris_pixels.size == 0:
+        return None
+    
+    level = (float(np.median(pupil_pixels)) + float(np.median(iris_pixels))) / 2
+    _, thresh = cv2.threshold(blurred, level, 255, cv2.THRESH_BINARY_INV)
+    
+    contours, _ = cv2.findContours(thresh, cv2.RETR_EXTERNAL, cv2.CHAIN_APPROX_SIMPLE)
+    best = None
+    for contour in contours:
+        area = cv2.contourArea(contour)
+        if area < 100:
+            continue
+        perimeter = cv2.arcLength(contour, True)
+        if perimeter == 0:
+            continue
+        circularity = 4 * np.pi * area / (perimeter * perimeter)
+        if circularity <= 0.5:
+            continue
         
-        # Validate: pupil should be reasonably sized and not too close to edges
-        min_radius = max(10, min(h, w) // 20)  # At least 5% of image
-        max_radius = min(h, w) // 3  # At most 33% of image
+        (fx, fy), radius = cv2.minEnclosingCircle(contour)
+        fx, fy = fx + x0, fy + y0
+        # Must agree with the coarse estimate
+        if np.hypot(fx - cx, fy - cy) > r_pupil * 0.5:
+            continue
+        if not (r_pupil * 0.6 <= radius <= r_pupil * 1.5):
+            continue
         
-        if min_radius <= r_pupil <= max_radius:
-            # Check if center is reasonably positioned (not at extreme edges)
-            margin = min(h, w) // 10
-            if margin < cx < w - margin and margin < cy < h - margin:
-                # Calculate confidence score based on multiple factors
-                confidence = calculate_detection_confidence(
-                    largest_contour, area, circularity, r_pupil, h, w, cx, cy
-                )
-                return (cx, cy, r_pupil, confidence)
+        if best is None or area > best[1]:
+            best = (contour + np.array([[x0, y0]], dtype=contour.dtype),
+                    area, circularity, int(fx), int(fy), int(radius))
     
-    # All strategies failed
-    return None
+    return best
 
 
 def calculate_detection_confidence(contour, area, circularity, radius, img_h, img_w, cx, cy):
@@ -202,7 +685,61 @@ def create_ring_mask(image_shape, cx, cy, r_pupil, inner_ratio=1.1, outer_ratio=
     return mask
 
 
-def extract_safe_zone_ring(image, crop_size=IRIS_CROP_SIZE):
+def crop_ring(image, cx, cy, r_pupil, inner_ratio=1.1, outer_ratio=2.2, padding=10):
+    """
+    Cut the ring's bounding box out of the image and black out everything
+    outside the ring, without any full-frame allocation.
+    The box follows from cx, cy and r_outer, so only the crop is masked.
+    
+    Args:
+        image: Input image (numpy array, BGR format)
+        cx, cy: Center coordinates of the pupil
+        r_pupil: Pupil radius
+        inner_ratio: Inner radius multiplier (see create_ring_mask)
+        outer_ratio: Outer radius multiplier (see create_ring_mask)
+        padding: Black margin kept around the ring (pixels, clipped to the image)
+    
+    Returns:
+        Ring crop (numpy array, BGR, black outside the ring), or None if the
+        ring does not overlap the image
+    """
+    h, w = image.shape[:2]
+    r_outer = int(r_pupil * outer_ratio)
+    
+    # Bounding box of the filled outer circle, clipped to the image
+    x_min, x_max = max(0, cx - r_outer), min(w - 1, cx + r_outer)
+    y_min, y_max = max(0, cy - r_outer), min(h - 1, cy + r_outer)
+    if x_min > x_max or y_min > y_max:
+        return None
+    
+    if not (0 <= cx < w and 0 <= cy < h):
+        # A clipped disk whose center is off-frame can be smaller than its box:
+        # measure the exact extent on the (small) box mask instead
+        box_mask = create_ring_mask((y_max - y_min + 1, x_max - x_min + 1),
+                                    cx - x_min, cy - y_min, r_pupil, inner_ratio, outer_ratio)
+        rows = np.flatnonzero(box_mask.any(axis=1))
+        cols = np.flatnonzero(box_mask.any(axis=0))
+        if len(rows) == 0:
+            return None
+        x_min, x_max = x_min + cols[0], x_min + cols[-1]
+        y_min, y_max = y_min + rows[0], y_min + rows[-1]
+    
+    # Add some padding
+    x0 = max(0, x_min - padding)
+    y0 = max(0, y_min - padding)
+    x1 = min(w, x_max + padding)
+    y1 = min(h, y_max + padding)
+    
+    crop = image[y0:y1, x0:x1]
+    mask = create_ring_mask(crop.shape, cx - x0, cy - y0, r_pupil, inner_ratio, outer_ratio)
+    if not mask.any():
+        return None
+    
+    # Apply mask to extract the ring (preserve color, black background)
+    return cv2.bitwise_and(crop, crop, mask=mask)
+
+
+def extract_safe_zone_ring(image, crop_size=IRIS_CROP_SIZE, prior=None):
     """
     Extract a clean 'Safe Zone' ring from the iris using pupil detection.
     This avoids eyelids and eyelashes by only extracting the middle ring.
@@ -210,55 +747,86 @@ def extract_safe_zone_ring(image, crop_size=IRIS_CROP_SIZE):
     Args:
         image: Input image (numpy array, BGR format)
         crop_size: Size of the output square crop in pixels
+        prior: Optional PupilSessionPrior for tethered sessions (see detect_pupil)
     
     Returns:
         Tuple of (cropped ring image, confidence_score)
         cropped ring image: numpy array with black background
         confidence_score: float between 0.0 and 1.0
     """
+    regions = extract_safe_zone(image, crop_size, prior=prior, polar=False)
+    return regions["ring"], regions["confidence"]
+
+
+def extract_safe_zone(image, crop_size=IRIS_CROP_SIZE, prior=None, polar=True):
+    """
+    Detect the pupil once and extract the Safe Zone as a square ring crop
+    and, optionally, as a polar strip.
+    
+    Args:
+        image: Input image (numpy array, BGR format)
+        crop_size: Size of the output square crop in pixels
+        prior: Optional PupilSessionPrior for tethered sessions (see detect_pupil)
+        polar: If True, also unwrap the annulus into a polar strip
+    
+    Returns:
+        Dictionary with:
+        "ring": square ring crop (numpy array, black background)
+        "confidence": float between 0.0 and 1.0 (0.0 for the center crop fallback)
+        "pupil": (cx, cy, r_pupil) or None if detection failed
+        "polar": polar strip (POLAR_STRIP_HEIGHT x POLAR_STRIP_WIDTH, BGR) or None
+    """
     h, w = image.shape[:2]
     
     # Detect pupil
-    pupil_result = detect_pupil(image)
+    pupil_result = detect_pupil(image, prior=prior)
     
     if pupil_result is None:
         # Fallback: use center crop if detection fails
         print("⚠️  Pupil detection failed, using center crop fallback")
-        cropped = center_crop_fallback(image, crop_size)
-        return cropped, 0.0  # No confidence for fallback
+        return _center_fallback(image, crop_size, polar)
     
     cx, cy, r_pupil, confidence = pupil_result
     print(f"✓ Pupil detected: center=({cx}, {cy}), radius={r_pupil}, confidence={confidence:.2f}")
     
-    # Create ring mask (donut shape)
-    mask = create_ring_mask(image.shape, cx, cy, r_pupil)
-    
-    # Apply mask to extract the ring (preserve color)
-    # Create black background first
-    masked_bgr = np.zeros_like(image)
-    # Apply mask to each channel
-    for c in range(image.shape[2]):
-        masked_bgr[:, :, c] = cv2.bitwise_and(image[:, :, c], image[:, :, c], mask=mask)
-    
-    # Find bounding box of the ring
-    # Get non-zero pixels from mask
-    coords = np.column_stack(np.where(mask > 0))
-    if len(coords) == 0:
-        return center_crop_fallback(image, crop_size)
-    
-    y_min, x_min = coords.min(axis=0)
-    y_max, x_max = coords.max(axis=0)
-    
-    # Add some padding
-    padding = 10
-    x_min = max(0, x_min - padding)
-    y_min = max(0, y_min - padding)
-    x_max = min(w, x_max + padding)
-    y_max = min(h, y_max + padding)
+    # Crop the ring's bounding box first, then mask only the crop
+    ring_crop = crop_ring(image, cx, cy, r_pupil)
+    if ring_crop is None:
+        print("⚠️  Ring lies outside the frame, using center crop fallback")
+        return _center_fallback(image, crop_size, polar)
+    
+    return {
+        "ring": fit_to_square(ring_crop, crop_size),
+        "confidence": confidence,
+        "pupil": (cx, cy, r_pupil),
+        "polar": unwrap_ring_polar(image, cx, cy, r_pupil) if polar else None,
+    }
+
+
+def _center_fallback(image, crop_size, polar):
+    """Safe Zone regions when no usable ring was found: center crop, and a polar strip around the frame center"""
+    h, w = image.shape[:2]
+    # Unwrap around the frame center, with the annulus touching the short side
+    r_guess = int(min(h, w) / (2 * 2.2))
+    return {
+        "ring": center_crop_fallback(image, crop_size),
+        "confidence": 0.0,  # No confidence for fallback
+        "pupil": None,
+        "polar": unwrap_ring_polar(image, w // 2, h // 2, r_guess) if polar else None,
+    }
+
+
+def fit_to_square(ring_crop, crop_size=IRIS_CROP_SIZE):
+    """
+    Resize a ring crop to fit crop_size and center it on a black square.
     
-    # Crop the ring region
-    ring_crop = masked_bgr[y_min:y_max, x_min:x_max]
+    Args:
+        ring_crop: Ring crop (numpy array, BGR format)
+        crop_size: Size of the output square in pixels
     
+    Returns:
+        Square image (crop_size x crop_size x 3)
+    """
     # Resize to high resolution while preserving quality
     crop_h, crop_w = ring_crop.shape[:2]
     
@@ -277,14 +845,70 @@ def extract_safe_zone_ring(image, crop_size=IRIS_CROP_SIZE):
         resized = cv2.resize(ring_crop, (new_w, new_h), interpolation=cv2.INTER_CUBIC)
     
     # Create final output with black background at high resolution
-    result = np.zeros((crop_size, crop_size, 3), dtype=image.dtype)
+    result = np.zeros((crop_size, crop_size, 3), dtype=ring_crop.dtype)
     
     # Center the resized ring in the output
     offset_y = (crop_size - new_h) // 2
     offset_x = (crop_size - new_w) // 2
     result[offset_y:offset_y+new_h, offset_x:offset_x+new_w] = resized
     
-    return result, confidence
+    return result
+
+
+@lru_cache(maxsize=4)
+def _polar_grid(height, width):
+    """Unit-circle sampling grid for a polar strip: (cos, sin, radial fraction)"""
+    theta = 2 * np.pi * np.arange(width) / width
+    fraction = (np.arange(height) + 0.5) / height
+    return np.cos(theta), np.sin(theta), fraction
+
+
+def unwrap_ring_polar(image, cx, cy, r_pupil, inner_ratio=1.1, outer_ratio=2.2,
+                      size=(POLAR_STRIP_HEIGHT, POLAR_STRIP_WIDTH)):
+    """
+    Unwrap the Safe Zone annulus into a fixed-size polar strip (rubber-sheet model).
+    Row 0 is the inner edge (r_pupil * inner_ratio), the last row the outer edge;
+    columns go once around the pupil, starting at 3 o'clock.
+    
+    Args:
+        image: Input image (numpy array, BGR or grayscale)
+        cx, cy: Center coordinates of the pupil
+        r_pupil: Pupil radius
+        inner_ratio: Inner radius multiplier (same as create_ring_mask)
+        outer_ratio: Outer radius multiplier (same as create_ring_mask)
+        size: (height, width) of the strip
+    
+    Returns:
+        Polar strip (numpy array, same channels as image); samples outside the image are black
+    """
+    height, width = size
+    r_inner = r_pupil * inner_ratio
+    r_outer = r_pupil * outer_ratio
+    
+    # Work on the ring's box only, pre-shrunk (area averaging) so the outer
+    # circumference is ~2 samples per strip column instead of aliasing
+    margin = int(r_outer) + 2
+    ih, iw = image.shape[:2]
+    x0, y0 = max(0, int(cx) - margin), max(0, int(cy) - margin)
+    x1, y1 = min(iw, int(cx) + margin), min(ih, int(cy) + margin)
+    box = image[y0:y1, x0:x1]
+    
+    scale = min(1.0, (2 * width) / (2 * np.pi * max(r_outer, 1)))
+    if scale < 1.0:
+        box = cv2.resize(box, (max(1, int(box.shape[1] * scale)), max(1, int(box.shape[0] * scale))),
+                         interpolation=cv2.INTER_AREA)
+        scale_x = box.shape[1] / (x1 - x0)
+        scale_y = box.shape[0] / (y1 - y0)
+    else:
+        scale_x = scale_y = 1.0
+    
+    cos_t, sin_t, fraction = _polar_grid(height, width)
+    radius = r_inner + (r_outer - r_inner) * fraction
+    map_x = ((cx - x0 + radius[:, None] * cos_t[None, :]) * scale_x).astype(np.float32)
+    map_y = ((cy - y0 + radius[:, None] * sin_t[None, :]) * scale_y).astype(np.float32)
+    
+    return cv2.remap(box, map_x, map_y, interpolation=cv2.INTER_LINEAR,
+                     borderMode=cv2.BORDER_CONSTANT, borderValue=0)
 
 
 def center_crop_fallback(image, crop_size=IRIS_CROP_SIZE):
@@ -328,36 +952,97 @@ def center_crop_fallback(image, crop_size=IRIS_CROP_SIZE):
 
 def get_next_iris_number():
     """
-    Get the next available iris number (001, 002, etc.)
-    Checks existing files in PROCESSED_DIR to find the highest number.
+    Reserve the next iris number (001, 002, etc.)
+    Uses the persistent sequence in data/sequences.json (see backend/sequence.py),
+    so concurrent processes never get the same number.
     
     Returns:
         Next available number as integer
     """
-    # Find all existing iris-XXX.jpg files
-    existing_files = list(PROCESSED_DIR.glob("iris-*.jpg"))
-    
-    if not existing_files:
-        return 1
-    
-    # Extract numbers from filenames
-    numbers = []
-    for file in existing_files:
-        # Extract number from iris-XXX.jpg format
-        try:
-            # Remove "iris-" prefix and ".jpg" suffix
-            num_str = file.stem.replace("iris-", "")
-            num = int(num_str)
-            numbers.append(num)
-        except ValueError:
-            # Skip files that don't match the pattern
-            continue
+    from backend.sequence import allocate
+    return allocate("iris")
+
+
+def resolve_iris_filename(output_filename=None, match_incoming_number=None):
+    """
+    Decide the output filename for a processed iris.
     
-    if not numbers:
-        return 1
+    Args:
+        output_filename: Explicit filename (returned unchanged if given)
+        match_incoming_number: Optional number to match incoming-XXX naming (for tracking)
     
-    # Return next number (highest + 1)
-    return max(numbers) + 1
+    Returns:
+        Filename in iris-XXX.jpg format
+    """
+    if output_filename is not None:
+        return output_filename
+    
+    if match_incoming_number is not None:
+        # Match the incoming number for tracking; keep auto-numbering past it
+        from backend.sequence import observe
+        observe("iris", match_incoming_number)
+        return f"iris-{match_incoming_number:03d}.jpg"
+    
+    # Auto-generate iris-XXX.jpg format
+    next_num = get_next_iris_number()
+    return f"iris-{next_num:03d}.jpg"
+
+
+def save_processed_iris(cropped, confidence, input_path, output_filename, polar=None,
+                        renditions=SAVE_RENDITIONS, original=None):
+    """
+    Save a processed iris image and its metadata sidecar.
+    
+    Args:
+        cropped: Safe Zone ring image (numpy array, BGR format)
+        confidence: Pupil detection confidence (0.0 to 1.0)
+        input_path: Path of the original photo (recorded in metadata)
+        output_filename: Filename in PROCESSED_DIR (iris-XXX.jpg)
+        polar: Optional polar strip, saved losslessly as polar_iris-XXX.png
+        renditions: If True, also write 256/512 renditions of the ring and the original
+        original: The decoded original photo, for its renditions (None = decode it again)
+    
+    Returns:
+        Path to the saved processed image
+    """
+    output_path = PROCESSED_DIR / output_filename
+    stem = Path(output_filename).stem
+    
+    # Save the cropped image (encoded in the background)
+    write_image(output_path, cropped)
+    
+    # Save confidence score to metadata file
+    metadata_path = PROCESSED_DIR / f"metadata_{stem}.json"
+    metadata = {
+        "iris_file": output_filename,
+        "confidence": float(confidence),
+        "input_file": str(Path(input_path).name)
+    }
+    
+    if polar is not None:
+        polar_filename = f"polar_{stem}.png"
+        write_image(PROCESSED_DIR / polar_filename, polar)
+        metadata["polar_file"] = polar_filename
+    
+    if renditions:
+        from backend.renditions import save_renditions, save_original_renditions
+        metadata["renditions"] = {
+            "iris": save_renditions(cropped, output_path),
+            "original": save_original_renditions(input_path, stem, image=original),
+        }
+    
+    write_json(metadata_path, metadata)
+    
+    # Register the capture and its files in the catalog
+    catalog.register_capture(stem, input_file=metadata["input_file"], confidence=confidence)
+    catalog.record_artifact(stem, "iris", output_path)
+    catalog.record_artifact(stem, "metadata", metadata_path)
+    if polar is not None:
+        catalog.record_artifact(stem, "polar", PROCESSED_DIR / metadata["polar_file"])
+    for kind, recorded in metadata.get("renditions", {}).items():
+        catalog.record_rendition_artifacts(stem, kind, recorded)
+    
+    return output_path
 
 
 def process_iris_photo(input_path, output_filename=None, match_incoming_number=None):
@@ -378,33 +1063,13 @@ def process_iris_photo(input_path, output_filename=None, match_incoming_number=N
     img = load_image(input_path)
     
     # Extract Safe Zone ring (robust method avoiding eyelids/eyelashes)
-    cropped, confidence = extract_safe_zone_ring(img, IRIS_CROP_SIZE)
-    
-    # Generate output filename
-    if output_filename is None:
-        if match_incoming_number is not None:
-            # Match the incoming number for tracking
-            output_filename = f"iris-{match_incoming_number:03d}.jpg"
-        else:
-            # Auto-generate iris-XXX.jpg format
-            next_num = get_next_iris_number()
-            output_filename = f"iris-{next_num:03d}.jpg"
-    
-    output_path = PROCESSED_DIR / output_filename
+    regions = extract_safe_zone(img, IRIS_CROP_SIZE, polar=SAVE_POLAR_STRIP)
+    cropped, confidence = regions["ring"], regions["confidence"]
     
-    # Save the cropped image
-    cv2.imwrite(str(output_path), cropped)
-    
-    # Save confidence score to metadata file
-    metadata_path = PROCESSED_DIR / f"metadata_{Path(output_filename).stem}.json"
-    import json
-    metadata = {
-        "iris_file": output_filename,
-        "confidence": float(confidence),
-        "input_file": str(Path(input_path).name)
-    }
-    with open(metadata_path, 'w') as f:
-        json.dump(metadata, f, indent=2)
+    # Generate output filename and save
+    output_filename = resolve_iris_filename(output_filename, match_incoming_number)
+    output_path = save_processed_iris(cropped, confidence, input_path, output_filename,
+                                      polar=regions["polar"], original=img)
     
     input_path_obj = Path(input_path)
     print(f"✓ Processed iris: {input_path_obj.name} -> {output_path.name} (confidence: {confidence:.2f})")
@@ -12,15 +12,18 @@ import numpy as np
 import cv2
 from pathlib import Path
 import json
-from backend.config import CODES_DIR, LATENT_CODE_VERSION, LATENT_SEED_BASE
-from backend.generate_codes_index import save_codes_index
+from backend import catalog
+from backend.artifact_writer import atomic_write_bytes, encode_json
+from backend.config import CODES_DIR, LATENT_CODE_VERSION, LATENT_SEED_BASE, PRECOMPRESS_JSON
+from backend.generate_codes_index import make_code_entry, upsert_code_entry
+from backend.events import publish_event
+from backend.spectrum import get_spectrum
+from backend.resolution import load_analysis_image
 
 
 def extract_image_features(image_path):
     """
-    Extract simple statistical features from an iris image.
-    For MVP: brightness, contrast, texture complexity.
-    Later: more sophisticated features.
+    Extract simple statistical features from an iris image file.
     
     Args:
         image_path: Path to processed iris image
@@ -28,10 +31,21 @@ def extract_image_features(image_path):
     Returns:
         Dictionary of feature values
     """
-    img = cv2.imread(str(image_path), cv2.IMREAD_GRAYSCALE)
-    if img is None:
-        raise ValueError(f"Could not load image: {image_path}")
+    return compute_image_features(load_analysis_image(image_path))
+
+
+def compute_image_features(img):
+    """
+    Extract simple statistical features from an in-memory iris image.
+    For MVP: brightness, contrast, texture complexity.
+    Later: more sophisticated features.
+    
+    Args:
+        img: Grayscale iris image at analysis resolution (numpy array, uint8)
     
+    Returns:
+        Dictionary of feature values
+    """
     # Normalize to 0-1
     img_norm = img.astype(np.float32) / 255.0
     
@@ -201,6 +215,29 @@ def generate_latent_code(processed_image_path, fft_spectrum=None):
     # Extract image features
     img_features = extract_image_features(processed_image_path)
     
+    return _build_latent_code(img_features, fft_spectrum)
+
+
+def generate_latent_code_from_image(image, fft_spectrum=None):
+    """
+    Same as generate_latent_code, but for an in-memory grayscale iris image.
+    
+    Args:
+        image: Grayscale iris image at analysis resolution (numpy array, uint8)
+        fft_spectrum: Optional FFT spectrum (numpy array). If None, it is taken
+                      from the shared spectrum provider (computed once per image).
+    
+    Returns:
+        Tuple of (latent_code_string, features_dict, seed)
+    """
+    if fft_spectrum is None:
+        fft_spectrum = get_spectrum(image)
+    
+    return _build_latent_code(compute_image_features(image), fft_spectrum)
+
+
+def _build_latent_code(img_features, fft_spectrum):
+    """Combine image and FFT features into (latent_code, features, seed)"""
     # Extract FFT features (if spectrum provided)
     if fft_spectrum is not None:
         fft_features = extract_fft_features(fft_spectrum)
@@ -220,7 +257,21 @@ def generate_latent_code(processed_image_path, fft_spectrum=None):
     return latent_code, all_features, seed
 
 
-def save_latent_code(latent_code, features, seed, output_filename=None):
+def artifact_urls(iris_id):
+    """
+    URLs of the artifacts catalogued for an iris so far ({kind: "/data/..."}).
+    Images still in the background writer queue land shortly after.
+    """
+    try:
+        capture = catalog.get_capture(iris_id)
+    except Exception:
+        capture = None
+    if capture is None:
+        return {}
+    return {kind: f"/data/{artifact['path']}" for kind, artifact in capture["artifacts"].items()}
+
+
+def save_latent_code(latent_code, features, seed, output_filename=None, update_index=True):
     """
     Save latent code and metadata to a JSON file.
     
@@ -229,6 +280,9 @@ def save_latent_code(latent_code, features, seed, output_filename=None):
         features: Features dictionary
         seed: Seed value
         output_filename: Optional output filename. If None, uses timestamp.
+        update_index: If True, add the code to codes_index.json after saving.
+                      Batch runs pass False and rebuild the index once at the end;
+                      the code is pushed to the displays either way.
     
     Returns:
         Path to saved JSON file
@@ -248,19 +302,30 @@ def save_latent_code(latent_code, features, seed, output_filename=None):
         "timestamp": time.time()
     }
     
-    with open(output_path, 'w') as f:
-        json.dump(data, f, indent=2)
+    # Written right away (not queued): the code is what the frontend shows first
+    atomic_write_bytes(output_path, encode_json(data), gzip_copy=PRECOMPRESS_JSON)
     
     # Also save as simple text file for easy frontend reading
     txt_path = CODES_DIR / output_filename.replace('.json', '.txt')
-    with open(txt_path, 'w') as f:
-        f.write(latent_code)
+    atomic_write_bytes(txt_path, latent_code.encode("utf-8"))
+    
+    iris_id = catalog.iris_id_from_name(output_filename)
+    catalog.record_code(iris_id, latent_code, seed, features)
+    catalog.record_artifact(iris_id, "code", output_path)
+    
+    # Add this code to the index for the frontend (one entry, not a full rescan)
+    if update_index:
+        try:
+            upsert_code_entry(make_code_entry(iris_id, latent_code, seed, features, data["timestamp"]))
+        except Exception as e:
+            print(f"Warning: Could not update codes index: {e}")
     
-    # Update codes index for frontend
+    # Push it to the live displays
     try:
-        save_codes_index()
+        publish_event("code", {"id": iris_id, "code": latent_code, "seed": seed,
+                               "urls": artifact_urls(iris_id)})
     except Exception as e:
-        print(f"Warning: Could not update codes index: {e}")
+        print(f"Warning: Could not publish code event: {e}")
     
     print(f"✓ Latent code saved: {output_path.name}")
     return output_path
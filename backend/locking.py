@@ -0,0 +1,43 @@
+"""
+IRIS#1 - Digital Biometrics
+Inter-process file locks for shared state files (sequence numbers, indexes).
+The lock is held on a separate .lock file, so the state file itself can be
+replaced atomically while the lock is held.
+"""
+
+import os
+from contextlib import contextmanager
+from pathlib import Path
+
+try:
+    import fcntl
+except ImportError:  # Windows
+    fcntl = None
+    import msvcrt
+
+
+@contextmanager
+def file_lock(lock_path):
+    """
+    Hold an exclusive lock on `lock_path` for the duration of a with-block.
+    Blocks until other processes (and threads) holding it have released it.
+
+    Args:
+        lock_path: Path of the lock file (created if missing)
+    """
+    lock_path = Path(lock_path)
+    lock_path.parent.mkdir(parents=True, exist_ok=True)
+    fd = os.open(str(lock_path), os.O_RDWR | os.O_CREAT, 0o644)
+    try:
+        if fcntl is not None:
+            fcntl.flock(fd, fcntl.LOCK_EX)
+        else:
+            msvcrt.locking(fd, msvcrt.LK_LOCK, 1)
+        yield
+    finally:
+        if fcntl is not None:
+            fcntl.flock(fd, fcntl.LOCK_UN)
+        else:
+            os.lseek(fd, 0, os.SEEK_SET)
+            msvcrt.locking(fd, msvcrt.LK_UNLCK, 1)
+        os.close(fd)
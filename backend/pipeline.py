@@ -0,0 +1,104 @@
+"""
+IRIS#1 - Digital Biometrics
+Single-decode processing pipeline.
+The photo is decoded once; the in-memory Safe Zone ring is handed directly to
+FFT, latent code and analysis. Files on disk are written as a side effect
+for the frontend, never read back between stages. Images and JSON are
+encoded by the background artifact writer; the returned paths may land a
+moment later (artifact_writer.wait_for / flush).
+"""
+
+import time
+import cv2
+from pathlib import Path
+from backend.config import PROCESSED_DIR, IRIS_CROP_SIZE, SAVE_POLAR_STRIP, FEATURE_SOURCE
+from backend.iris_processor import (
+    load_image, extract_safe_zone, resolve_iris_filename, save_processed_iris
+)
+from backend.fft_pipeline import process_iris_fft_image
+from backend.latent_code import generate_latent_code_from_image, save_latent_code
+from backend.analysis import analyze_iris_image
+from backend.resolution import select_analysis_image
+
+
+def run_pipeline(input_path, output_filename=None, match_incoming_number=None,
+                 update_index=True, analyze=True, prior=None):
+    """
+    Run the full pipeline (crop -> FFT -> latent code -> analysis) on one photo.
+
+    Args:
+        input_path: Path to the original photo
+        output_filename: Optional processed filename. If None, auto-generates iris-XXX.jpg.
+        match_incoming_number: Optional number to match incoming-XXX naming (for tracking)
+        update_index: If True, refresh codes_index.json after saving the code
+        analyze: If True, also run the waveform analysis and save analysis_iris-XXX.json
+        prior: Optional PupilSessionPrior shared across the captures of a session
+
+    Returns:
+        Dictionary with iris_id, paths of written artifacts, confidence,
+        latent_code, features, seed, analysis and per-stage timings (seconds)
+    """
+    input_path = Path(input_path)
+    timings = {}
+
+    # Stage 1: decode once and extract the Safe Zone ring
+    start = time.perf_counter()
+    img = load_image(input_path)
+    regions = extract_safe_zone(img, IRIS_CROP_SIZE, prior=prior,
+                                polar=SAVE_POLAR_STRIP or FEATURE_SOURCE == "polar")
+    ring, confidence, polar = regions["ring"], regions["confidence"], regions["polar"]
+    output_filename = resolve_iris_filename(output_filename, match_incoming_number)
+    iris_path = save_processed_iris(ring, confidence, input_path, output_filename,
+                                    polar=polar if SAVE_POLAR_STRIP else None, original=img)
+    iris_id = iris_path.stem
+    polar_path = PROCESSED_DIR / f"polar_{iris_id}.png" if polar is not None and SAVE_POLAR_STRIP else None
+    timings["crop"] = time.perf_counter() - start
+
+    # All later stages work on the lossless in-memory grayscale ring,
+    # downsampled once to ANALYSIS_SIZE (the saved iris-XXX.jpg stays full size),
+    # or on the polar strip when FEATURE_SOURCE = "polar"
+    gray = select_analysis_image(
+        cv2.cvtColor(ring, cv2.COLOR_BGR2GRAY),
+        cv2.cvtColor(polar, cv2.COLOR_BGR2GRAY) if polar is not None else None,
+    )
+
+    # Stage 2: FFT spectrum + visualization
+    start = time.perf_counter()
+    fft_path, fft_spectrum = process_iris_fft_image(gray, f"fft_{iris_id}.jpg")
+    timings["fft"] = time.perf_counter() - start
+
+    # Stage 3: latent code
+    start = time.perf_counter()
+    latent_code, features, seed = generate_latent_code_from_image(gray, fft_spectrum)
+    code_path = save_latent_code(latent_code, features, seed,
+                                 output_filename=f"code_{iris_id}.json",
+                                 update_index=update_index)
+    timings["code"] = time.perf_counter() - start
+
+    # Stage 4: waveform analysis
+    analysis = None
+    analysis_path = None
+    if analyze:
+        start = time.perf_counter()
+        analysis_path = PROCESSED_DIR / f"analysis_{iris_id}.json"
+        analysis = analyze_iris_image(gray, analysis_path, confidence=confidence,
+                                      label=iris_path.name)
+        timings["analysis"] = time.perf_counter() - start
+
+    print(f"✓ Pipeline: {input_path.name} -> {iris_id} (confidence: {confidence:.2f})")
+
+    return {
+        "iris_id": iris_id,
+        "polar_path": polar_path,
+        "input_file": input_path.name,
+        "iris_path": iris_path,
+        "fft_path": fft_path,
+        "code_path": code_path,
+        "analysis_path": analysis_path,
+        "confidence": float(confidence),
+        "latent_code": latent_code,
+        "features": features,
+        "seed": seed,
+        "analysis": analysis,
+        "timings": timings,
+    }
@@ -13,41 +13,23 @@ Workflow:
 import shutil
 from pathlib import Path
 from backend.config import INCOMING_DIR, RENAMED_DIR
+from backend.sequence import allocate
+from backend import catalog
 
 
-def get_next_incoming_number():
+def get_next_incoming_number(count=1):
     """
-    Get the next available incoming photo number (001, 002, etc.)
-    Checks existing files in RENAMED_DIR to find the highest number.
+    Reserve the next incoming photo number(s) (001, 002, etc.)
+    Uses the persistent sequence in data/sequences.json (see backend/sequence.py),
+    so concurrent processes never get the same number.
+    
+    Args:
+        count: How many consecutive numbers to reserve
     
     Returns:
-        Next available number as integer
+        First reserved number as integer
     """
-    # Find all existing incoming-XXX files in renamed folder
-    existing_files = list(RENAMED_DIR.glob("incoming-*.jpg")) + \
-                     list(RENAMED_DIR.glob("incoming-*.jpeg")) + \
-                     list(RENAMED_DIR.glob("incoming-*.png")) + \
-                     list(RENAMED_DIR.glob("incoming-*.webp"))
-    
-    if not existing_files:
-        return 1
-    
-    # Extract numbers from filenames
-    numbers = []
-    for file in existing_files:
-        try:
-            # Extract number from incoming-XXX.ext format
-            num_str = file.stem.replace("incoming-", "")
-            num = int(num_str)
-            numbers.append(num)
-        except ValueError:
-            continue
-    
-    if not numbers:
-        return 1
-    
-    # Return next number (highest + 1)
-    return max(numbers) + 1
+    return allocate("incoming", count)
 
 
 def rename_and_move_incoming_photos():
@@ -75,7 +57,7 @@ def rename_and_move_incoming_photos():
     print(f"Found {len(original_files)} photos to rename and move:\n")
     
     rename_map = {}
-    next_num = get_next_incoming_number()
+    next_num = get_next_incoming_number(len(original_files))
     
     for original_file in sorted(original_files):
         # Get file extension
@@ -93,6 +75,9 @@ def rename_and_move_incoming_photos():
             shutil.copy2(original_file, new_path)
             rename_map[original_file.name] = new_name
             print(f"  ✓ {original_file.name} -> {new_name} (moved to data/renamed/)")
+            # Lineage: incoming-XXX is processed as iris-XXX (see backend.batch)
+            catalog.register_capture(f"iris-{next_num:03d}", input_file=original_file.name,
+                                     renamed_file=new_name)
             next_num += 1
         except Exception as e:
             print(f"  ✗ Error renaming {original_file.name}: {e}")
@@ -0,0 +1,140 @@
+"""
+IRIS#1 - Digital Biometrics
+Multi-resolution renditions of the images shown by the frontend.
+Each image gets smaller copies (RENDITION_SIZES, longer side in pixels) made in
+one resize cascade: every size is downsampled from the previous, larger one.
+Renditions live in a renditions/ folder next to the full-size file:
+
+    processed/renditions/iris-001_256.jpg
+    fft/renditions/fft_iris-001_256.jpg
+    processed/renditions/original_iris-001_512.jpg   (the original photo)
+
+and are recorded in processed/metadata_iris-XXX.json as paths relative to data/.
+"""
+
+import cv2
+from pathlib import Path
+from backend.artifact_writer import write_image, update_json, wait_for
+from backend.config import (
+    DATA_DIR, PROCESSED_DIR, RENDITION_SIZES, RENDITION_JPEG_QUALITY
+)
+from backend.resolution import to_analysis_resolution
+
+
+def rendition_cascade(image, sizes=RENDITION_SIZES):
+    """
+    Downsample an image to each rendition size, largest first, each step
+    starting from the previous result (area averaging).
+
+    Args:
+        image: numpy array (grayscale or BGR)
+        sizes: Longer-side sizes in pixels
+
+    Returns:
+        Dictionary {size: image}. Sizes not smaller than the image are skipped.
+    """
+    renditions = {}
+    current = image
+    for size in sorted(sizes, reverse=True):
+        if size >= max(current.shape[:2]):
+            continue
+        current = to_analysis_resolution(current, size)
+        renditions[size] = current
+    return renditions
+
+
+def rendition_path(full_path, size):
+    """Path of one rendition of a full-size image (renditions/<stem>_<size>.jpg)"""
+    full_path = Path(full_path)
+    return full_path.parent / "renditions" / f"{full_path.stem}_{size}.jpg"
+
+
+def data_relative(path):
+    """Path relative to data/ (as used in URLs), or the absolute path if outside data/"""
+    path = Path(path).resolve()
+    try:
+        return path.relative_to(DATA_DIR.resolve()).as_posix()
+    except ValueError:
+        return str(path)
+
+
+def save_renditions(image, full_path, sizes=RENDITION_SIZES):
+    """
+    Write the renditions of an image next to its full-size file.
+
+    Args:
+        image: Full-size image (numpy array)
+        full_path: Path of the full-size file (already written by the caller)
+        sizes: Longer-side sizes in pixels
+
+    Returns:
+        Dictionary {"256": path, ..., "full": path}, paths relative to data/
+    """
+    recorded = {}
+    for size, rendition in rendition_cascade(image, sizes).items():
+        path = rendition_path(full_path, size)
+        path.parent.mkdir(parents=True, exist_ok=True)
+        write_image(path, rendition, [cv2.IMWRITE_JPEG_QUALITY, RENDITION_JPEG_QUALITY])
+        recorded[str(size)] = data_relative(path)
+    recorded["full"] = data_relative(full_path)
+    return recorded
+
+
+def save_original_renditions(input_path, iris_id, image=None, sizes=RENDITION_SIZES, output_dir=PROCESSED_DIR):
+    """
+    Write renditions of the original photo.
+    They are named after the processed iris (processed/renditions/original_iris-XXX_<size>.jpg):
+    the photo may be a raw incoming file whose name has nothing to do with its iris number.
+
+    Args:
+        input_path: Path of the original photo
+        iris_id: Processed iris ID (e.g. "iris-001")
+        image: The photo already decoded by the caller (None = decode at reduced scale)
+        sizes: Longer-side sizes in pixels
+        output_dir: Folder of the processed iris (renditions go to its renditions/)
+
+    Returns:
+        Dictionary {"256": path, ..., "full": path}, paths relative to data/
+    """
+    input_path = Path(input_path)
+
+    if image is None:
+        from backend.iris_processor import get_image_size, load_image
+
+        # The reduced decode only has to keep the largest rendition's short side
+        size = get_image_size(input_path)
+        min_side = None
+        if size is not None:
+            min_side = int(max(sizes) * min(size) / max(size))
+        image = load_image(input_path, min_side=min_side)
+
+    recorded = save_renditions(image, Path(output_dir) / f"original_{iris_id}.jpg", sizes)
+    recorded["full"] = data_relative(input_path)
+    return recorded
+
+
+def record_renditions(iris_id, kind, renditions):
+    """
+    Add renditions to the metadata sidecar of a processed iris.
+    The update is queued behind the sidecar's pending writes on the artifact
+    writer, so it cannot overwrite (or be overwritten by) another update.
+
+    Args:
+        iris_id: Processed iris ID (e.g. "iris-001")
+        kind: "iris", "original" or "fft"
+        renditions: Dictionary from save_renditions
+
+    Returns:
+        True if the sidecar exists and the update was queued
+    """
+    metadata_path = PROCESSED_DIR / f"metadata_{iris_id}.json"
+    if not metadata_path.exists():
+        wait_for(metadata_path)  # Written by save_processed_iris, possibly still queued
+        if not metadata_path.exists():
+            return False
+
+    def add_renditions(metadata):
+        metadata.setdefault("renditions", {})[kind] = renditions
+
+    update_json(metadata_path, add_renditions)
+    return True
@@ -0,0 +1,167 @@
+"""
+IRIS#1 - Digital Biometrics
+On-demand resized images for start_server.py (/data/processed/iris-001.jpg?w=256).
+Each (image, width) is decoded once, with the cheapest reduced JPEG decode, and
+kept in data/cache/resized/. The cache is capped at RESIZE_CACHE_MAX_BYTES and
+evicts the least recently used files (a hit refreshes the file's mtime).
+Cache files are named after the source's version, so a rewritten source is
+resized again and its old copies age out.
+"""
+
+import hashlib
+import os
+import threading
+import cv2
+from pathlib import Path
+from backend.artifact_writer import atomic_write_bytes, encode_image
+from backend.config import RESIZE_CACHE_DIR, RESIZE_CACHE_MAX_BYTES, RESIZE_MAX_WIDTH, RENDITION_JPEG_QUALITY
+
+RESIZABLE_SUFFIXES = {".jpg", ".jpeg", ".png", ".webp"}
+
+
+class ResizeCache:
+    """
+    Disk-backed LRU of resized images. Safe to share between server threads:
+    concurrent requests for the same uncached image wait for a single decode.
+    """
+
+    def __init__(self, cache_dir=RESIZE_CACHE_DIR, max_bytes=RESIZE_CACHE_MAX_BYTES):
+        self.cache_dir = Path(cache_dir)
+        self.max_bytes = max_bytes
+        self._lock = threading.Lock()
+        self._inflight = {}  # cache path -> Lock held while it is being made
+        self._total = None  # Bytes in the cache, scanned on first use
+
+    def cache_path(self, source_path, width):
+        """Cache file for one version (mtime, size) of a source at a given width"""
+        source_path = Path(source_path)
+        stat = source_path.stat()
+        key = f"{source_path.resolve()}:{stat.st_mtime_ns}:{stat.st_size}"
+        digest = hashlib.sha1(key.encode("utf-8")).hexdigest()[:12]
+        return self.cache_dir / f"{source_path.stem}_w{width}_{digest}{source_path.suffix.lower()}"
+
+    def get(self, source_path, width):
+        """
+        Path of `source_path` resized to `width` pixels wide (height keeps the aspect ratio).
+
+        Args:
+            source_path: Full-size image
+            width: Requested width in pixels
+
+        Returns:
+            Path to serve: a cached resize, a matching pre-made rendition, or the
+            source itself when it is not wider than `width`
+        """
+        source_path = Path(source_path)
+        path = self.cache_path(source_path, width)
+
+        if self._touch(path):
+            return path
+
+        with self._lock:
+            building = self._inflight.setdefault(path, threading.Lock())
+        with building:
+            try:
+                if self._touch(path):
+                    return path  # Made by the request we waited for
+                return self._make(source_path, width, path)
+            finally:
+                with self._lock:
+                    self._inflight.pop(path, None)
+
+    def _touch(self, path):
+        """Mark a cache file as recently used; False if it does not exist"""
+        try:
+            os.utime(path)
+            return True
+        except FileNotFoundError:
+            return False
+
+    def _make(self, source_path, width, path):
+        from backend.iris_processor import get_image_size, load_image
+        from backend.renditions import rendition_path
+
+        size = get_image_size(source_path)
+        if size is not None:
+            if width >= size[0]:
+                return source_path
+            # Pre-made rendition of exactly this width (longer side == width): no decode at all
+            rendition = rendition_path(source_path, width)
+            if size[0] >= size[1] and rendition.exists():
+                return rendition
+
+        # The reduced decode only has to keep `width` pixels across
+        min_side = -(-width * min(size) // size[0]) if size is not None else None
+        image = load_image(source_path, min_side=min_side)
+        h, w = image.shape[:2]
+        if width >= w:
+            return source_path
+        height = max(1, round(h * width / w))
+        resized = cv2.resize(image, (width, height), interpolation=cv2.INTER_AREA)
+
+        params = [cv2.IMWRITE_JPEG_QUALITY, RENDITION_JPEG_QUALITY] if path.suffix in (".jpg", ".jpeg") else []
+        data = encode_image(path, resized, params)
+        path.parent.mkdir(parents=True, exist_ok=True)
+        atomic_write_bytes(path, data)
+        self._added(len(data))
+        return path
+
+    def _added(self, nbytes):
+        with self._lock:
+            if self._total is None:
+                self._total = sum(f.stat().st_size for f in self.cache_dir.glob("*") if f.is_file())
+            else:
+                self._total += nbytes
+            if self._total > self.max_bytes:
+                self._evict()
+
+    def _evict(self):
+        """Delete least recently used files until the cache is at 90% of its cap (lock held)"""
+        files = []
+        for f in self.cache_dir.glob("*"):
+            try:
+                stat = f.stat()
+            except FileNotFoundError:
+                continue
+            files.append((stat.st_mtime_ns, stat.st_size, f))
+        files.sort()
+        total = sum(size for _, size, _ in files)
+        target = self.max_bytes * 0.9
+        for _, size, f in files:
+            if total <= target:
+                break
+            f.unlink(missing_ok=True)
+            total -= size
+        self._total = total
+
+
+_cache = None
+
+
+def get_cache():
+    """Shared resize cache, created on first use"""
+    global _cache
+    if _cache is None:
+        _cache = ResizeCache()
+    return _cache
+
+
+def parse_width(value):
+    """
+    Validate a ?w= value.
+
+    Returns:
+        Width as integer
+
+    Raises:
+        ValueError: Not an integer in 1..RESIZE_MAX_WIDTH
+    """
+    width = int(value)
+    if not 1 <= width <= RESIZE_MAX_WIDTH:
+        raise ValueError(f"w must be between 1 and {RESIZE_MAX_WIDTH}")
+    return width
+
+
+def get_resized(source_path, width):
+    """Path of `source_path` resized to `width` pixels wide, from the shared cache"""
+    return get_cache().get(source_path, width)
@@ -0,0 +1,210 @@
+"""
+IRIS#1 - Digital Biometrics
+Analysis resolution handling.
+Feature extraction and FFT run on the ring downsampled to ANALYSIS_SIZE
+(area averaging), while the saved iris-XXX.jpg keeps IRIS_CROP_SIZE.
+With FEATURE_SOURCE = "polar" they run on the polar strip (polar_iris-XXX.png) instead.
+Run as a script to report how far each latent-code field drifts between resolutions:
+
+    python -m backend.resolution
+    python -m backend.resolution --sizes 1024 512 256
+"""
+
+import argparse
+import cv2
+import numpy as np
+from pathlib import Path
+from backend.artifact_writer import wait_for
+from backend.config import ANALYSIS_SIZE, IRIS_CROP_SIZE, PROCESSED_DIR, FEATURE_SOURCE
+
+
+def to_analysis_resolution(image, size=ANALYSIS_SIZE):
+    """
+    Downsample an image so its longer side is `size`, using area averaging.
+    Images already at or below that size are returned unchanged.
+
+    Args:
+        image: numpy array (grayscale or BGR)
+        size: Target size of the longer side (None = keep full resolution)
+
+    Returns:
+        numpy array at analysis resolution
+    """
+    if size is None:
+        return image
+
+    h, w = image.shape[:2]
+    if max(h, w) <= size:
+        return image
+
+    scale = size / max(h, w)
+    new_w = max(1, int(round(w * scale)))
+    new_h = max(1, int(round(h * scale)))
+    return cv2.resize(image, (new_w, new_h), interpolation=cv2.INTER_AREA)
+
+
+def polar_path_for(iris_path):
+    """Path of the polar strip saved next to a processed iris (polar_iris-XXX.png)"""
+    iris_path = Path(iris_path)
+    return iris_path.parent / f"polar_{iris_path.stem}.png"
+
+
+def select_analysis_image(ring_gray, polar_gray=None, source=FEATURE_SOURCE):
+    """
+    Pick the in-memory image that FFT, latent code and analysis run on.
+    
+    Args:
+        ring_gray: Grayscale Safe Zone ring (any resolution)
+        polar_gray: Optional grayscale polar strip
+        source: "ring" or "polar" (falls back to the ring if no strip is available)
+    
+    Returns:
+        Grayscale numpy array
+    """
+    if source == "polar" and polar_gray is not None:
+        return polar_gray
+    return to_analysis_resolution(ring_gray)
+
+
+def load_analysis_image(iris_path, source=FEATURE_SOURCE):
+    """
+    Load the analysis input for a processed iris from disk.
+    With source "polar" the saved strip is loaded; otherwise the ring is
+    loaded and downsampled to ANALYSIS_SIZE.
+    
+    Args:
+        iris_path: Path to the processed iris image (iris-XXX.jpg)
+        source: "ring" or "polar"
+    
+    Returns:
+        Grayscale numpy array
+    
+    Raises:
+        FileNotFoundError: If the image (or, with source "polar", the strip) is missing.
+            There is no fallback to the ring: features of the ring and of the
+            strip are not comparable.
+    """
+    iris_path = Path(iris_path)
+    
+    if source == "polar":
+        polar_path = polar_path_for(iris_path)
+        wait_for(polar_path)
+        if not polar_path.exists():
+            raise FileNotFoundError(f"Polar strip not found: {polar_path} "
+                                    f"(FEATURE_SOURCE = \"polar\" needs SAVE_POLAR_STRIP = True)")
+        strip = cv2.imread(str(polar_path), cv2.IMREAD_GRAYSCALE)
+        if strip is None:
+            raise ValueError(f"Could not load image: {polar_path}")
+        return strip
+    
+    wait_for(iris_path)
+    if not iris_path.exists():
+        raise FileNotFoundError(f"Image not found: {iris_path}")
+    
+    img = cv2.imread(str(iris_path), cv2.IMREAD_GRAYSCALE)
+    if img is None:
+        raise ValueError(f"Could not load image: {iris_path}")
+    
+    return to_analysis_resolution(img)
+
+
+def extract_all_features(gray):
+    """
+    Compute every latent-code and analysis feature for one grayscale image.
+
+    Args:
+        gray: Grayscale iris image at the resolution to analyse
+
+    Returns:
+        Tuple of (scalar_features_dict, waveform_list)
+    """
+    from backend.spectrum import compute_log_spectrum
+    from backend.latent_code import compute_image_features, extract_fft_features
+    from backend.analysis import extract_basic_features, extract_radial_profile_waveform
+
+    spectrum = compute_log_spectrum(gray)
+    basic = extract_basic_features(gray)
+    features = {
+        **compute_image_features(gray),
+        **extract_fft_features(spectrum),
+        "energy": basic["energy"],
+        "complexity": basic["complexity"],
+    }
+    return features, extract_radial_profile_waveform(spectrum)
+
+
+def resolution_drift_report(image_paths, sizes, reference_size=IRIS_CROP_SIZE):
+    """
+    Measure how each feature changes when analysed at smaller resolutions.
+
+    Args:
+        image_paths: Processed iris images (iris-XXX.jpg)
+        sizes: Analysis sizes to compare against the reference
+        reference_size: Resolution treated as ground truth
+
+    Returns:
+        Dictionary {size: {field: list of relative drifts}}, where the
+        "waveform" field holds the max absolute difference (0-1 scale)
+    """
+    report = {size: {} for size in sizes}
+
+    for path in image_paths:
+        gray = cv2.imread(str(path), cv2.IMREAD_GRAYSCALE)
+        if gray is None:
+            print(f"  ✗ Could not load {path.name}")
+            continue
+
+        ref_features, ref_waveform = extract_all_features(to_analysis_resolution(gray, reference_size))
+
+        for size in sizes:
+            features, waveform = extract_all_features(to_analysis_resolution(gray, size))
+            for key, ref_value in ref_features.items():
+                drift = abs(features[key] - ref_value) / (abs(ref_value) + 1e-10)
+                report[size].setdefault(key, []).append(drift)
+            waveform_drift = float(np.max(np.abs(np.array(waveform) - np.array(ref_waveform))))
+            report[size].setdefault("waveform", []).append(waveform_drift)
+
+    return report
+
+
+def print_drift_report(report, reference_size=IRIS_CROP_SIZE):
+    """Print the drift report as a table (mean / max per field and size)"""
+    sizes = list(report.keys())
+    fields = list(next(iter(report.values())).keys()) if sizes else []
+
+    print(f"\nFeature drift relative to {reference_size}px analysis (mean / max):")
+    print(f"  {'field':<12}" + "".join(f"{str(size) + 'px':>22}" for size in sizes))
+    for field in fields:
+        row = f"  {field:<12}"
+        for size in sizes:
+            values = report[size][field]
+            if field == "waveform":
+                row += f"{np.mean(values):>10.4f} /{np.max(values):>9.4f}"
+            else:
+                row += f"{np.mean(values) * 100:>9.2f}% /{np.max(values) * 100:>8.2f}%"
+        print(row)
+    print("\n  Scalar fields: relative difference. waveform: max absolute difference (0-1 scale).")
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Report latent-code drift between analysis resolutions.")
+    parser.add_argument("--sizes", type=int, nargs="+", default=[1024, 512, 256],
+                        help="analysis sizes to compare (default: 1024 512 256)")
+    parser.add_argument("--limit", type=int, default=None,
+                        help="only use the first N processed irises")
+    args = parser.parse_args(argv)
+
+    image_paths = sorted(PROCESSED_DIR.glob("iris-*.jpg"))[:args.limit]
+    if not image_paths:
+        print("No processed iris images found in data/processed/")
+        print("Run iris_processor.py first to create processed images.")
+        return
+
+    print(f"Comparing {len(image_paths)} irises at {args.sizes} against {IRIS_CROP_SIZE}px "
+          f"(current ANALYSIS_SIZE = {ANALYSIS_SIZE})")
+    report = resolution_drift_report(image_paths, args.sizes)
+    print_drift_report(report)
+
+
+if __name__ == "__main__":
+    main()
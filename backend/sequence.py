@@ -0,0 +1,158 @@
+"""
+IRIS#1 - Digital Biometrics
+Persistent sequence numbers for iris-XXX and incoming-XXX files.
+The last number handed out per sequence is kept in data/sequences.json, so
+allocating is O(1) instead of a directory scan, and the file lock makes it
+safe for concurrent workers. The directories are scanned only once, the first
+time a sequence is used (or on an explicit rebuild):
+
+    python -m backend.sequence show
+    python -m backend.sequence rebuild
+"""
+
+import argparse
+import json
+from pathlib import Path
+from backend.artifact_writer import atomic_write_bytes, encode_json
+from backend.config import PROCESSED_DIR, RENAMED_DIR, SEQUENCE_STATE_PATH
+from backend.locking import file_lock
+
+
+# Sequence name -> (directory, filename prefix, extensions)
+SEQUENCES = {
+    "iris": (PROCESSED_DIR, "iris-", [".jpg"]),
+    "incoming": (RENAMED_DIR, "incoming-", [".jpg", ".jpeg", ".png", ".webp"]),
+}
+
+
+def scan_highest(directory, prefix, extensions):
+    """
+    Highest number used by files named <prefix>XXX<ext> in a directory (full scan).
+
+    Returns:
+        Highest number as integer (0 if there are none)
+    """
+    highest = 0
+    for ext in extensions:
+        for file in Path(directory).glob(f"{prefix}*{ext}"):
+            try:
+                highest = max(highest, int(file.stem.replace(prefix, "")))
+            except ValueError:
+                continue
+    return highest
+
+
+def _is_taken(number, directory, prefix, extensions):
+    return any((Path(directory) / f"{prefix}{number:03d}{ext}").exists() for ext in extensions)
+
+
+def _lock_path(state_path):
+    return Path(state_path).with_suffix(".lock")
+
+
+def _read_state(state_path):
+    state_path = Path(state_path)
+    if not state_path.exists():
+        return {}
+    try:
+        with open(state_path, 'r') as f:
+            return json.load(f)
+    except (ValueError, OSError):
+        print(f"⚠️  Could not read {state_path.name}, rebuilding from directories")
+        return {}
+
+
+def _write_state(state_path, state):
+    atomic_write_bytes(state_path, encode_json(state))
+
+
+def allocate(name, count=1, state_path=SEQUENCE_STATE_PATH, sequences=SEQUENCES):
+    """
+    Reserve the next `count` numbers of a sequence.
+
+    Args:
+        name: Sequence name ("iris" or "incoming")
+        count: How many consecutive numbers to reserve
+        state_path: Path of the sequence state file
+        sequences: Sequence registry (name -> (directory, prefix, extensions))
+
+    Returns:
+        First reserved number; the block is first .. first + count - 1
+    """
+    directory, prefix, extensions = sequences[name]
+
+    with file_lock(_lock_path(state_path)):
+        state = _read_state(state_path)
+        if name not in state:
+            # First use (or lost state): one-time directory scan
+            state[name] = scan_highest(directory, prefix, extensions)
+
+        first = state[name] + 1
+        # Files copied in by hand would be overwritten: the whole block must be free,
+        # so restart it after any taken number (O(1) per number checked)
+        number = first
+        while number < first + count:
+            if _is_taken(number, directory, prefix, extensions):
+                first = number + 1
+            number += 1
+
+        state[name] = first + count - 1
+        _write_state(state_path, state)
+
+    return first
+
+
+def observe(name, number, state_path=SEQUENCE_STATE_PATH, sequences=SEQUENCES):
+    """
+    Record that `number` was used outside the allocator (e.g. iris-XXX matching
+    incoming-XXX), so later allocations never hand it out again.
+
+    Args:
+        name: Sequence name
+        number: Number that is now in use
+        state_path: Path of the sequence state file
+        sequences: Sequence registry
+    """
+    directory, prefix, extensions = sequences[name]
+
+    with file_lock(_lock_path(state_path)):
+        state = _read_state(state_path)
+        if name not in state:
+            state[name] = scan_highest(directory, prefix, extensions)
+        elif number <= state[name]:
+            return
+        state[name] = max(state[name], number)
+        _write_state(state_path, state)
+
+
+def rebuild(state_path=SEQUENCE_STATE_PATH, sequences=SEQUENCES):
+    """
+    Reset every sequence to the highest number found on disk.
+
+    Returns:
+        Dictionary {name: highest number}
+    """
+    with file_lock(_lock_path(state_path)):
+        state = {name: scan_highest(*spec) for name, spec in sequences.items()}
+        _write_state(state_path, state)
+    return state
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Inspect or rebuild the iris/incoming sequence numbers.")
+    parser.add_argument("command", choices=["show", "rebuild"])
+    args = parser.parse_args(argv)
+
+    if args.command == "rebuild":
+        state = rebuild()
+        print(f"✓ Rebuilt {SEQUENCE_STATE_PATH.name} from directories")
+    else:
+        state = _read_state(SEQUENCE_STATE_PATH)
+
+    for name in SEQUENCES:
+        last = state.get(name)
+        print(f"  {name:<10} last used: {last if last is not None else '(not initialized)'}")
+
+
+if __name__ == "__main__":
+    main()
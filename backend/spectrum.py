@@ -0,0 +1,98 @@
+"""
+IRIS#1 - Digital Biometrics
+Shared FFT spectrum provider.
+fft_pipeline, analysis and latent_code all consume the same centered
+log-magnitude spectrum. It is computed once per image and memoized for the
+rest of the run, keyed by image content.
+"""
+
+import hashlib
+import threading
+from collections import OrderedDict
+import numpy as np
+from backend.config import SPECTRUM_CACHE_SIZE
+from backend.fft_backend import centered_log_magnitude
+
+_spectrum_cache = OrderedDict()
+_cache_stats = {"hits": 0, "misses": 0}
+_cache_lock = threading.Lock()  # Capture workers (watch_folder) share the cache
+
+
+def compute_log_spectrum(image):
+    """
+    Compute the centered log-magnitude 2D FFT spectrum of an image.
+
+    Args:
+        image: Input grayscale image (numpy array)
+
+    Returns:
+        Magnitude spectrum (numpy array, float32), zero frequency at the center
+    """
+    # Real-input, single-precision transform on the configured backend
+    return centered_log_magnitude(image)
+
+
+def image_key(image):
+    """
+    Build a cache key from the image content, shape and dtype.
+
+    Args:
+        image: numpy array
+
+    Returns:
+        Hashable key identifying the pixels
+    """
+    digest = hashlib.blake2b(np.ascontiguousarray(image).data, digest_size=16).hexdigest()
+    return (image.shape, str(image.dtype), digest)
+
+
+def get_spectrum(image, key=None):
+    """
+    Return the centered log-magnitude spectrum of an image, computing it at most once.
+    The returned array is shared between callers and marked read-only.
+
+    Args:
+        image: Input grayscale image (numpy array)
+        key: Optional cache key (e.g. "iris-001"). If None, the image content is hashed.
+
+    Returns:
+        Magnitude spectrum (numpy array, float, read-only)
+    """
+    if key is None:
+        key = image_key(image)
+
+    with _cache_lock:
+        spectrum = _spectrum_cache.get(key)
+        if spectrum is not None:
+            _spectrum_cache.move_to_end(key)
+            _cache_stats["hits"] += 1
+            return spectrum
+        _cache_stats["misses"] += 1
+
+    spectrum = compute_log_spectrum(image)
+    spectrum.flags.writeable = False
+
+    with _cache_lock:
+        _spectrum_cache[key] = spectrum
+        while len(_spectrum_cache) > SPECTRUM_CACHE_SIZE:
+            _spectrum_cache.popitem(last=False)
+
+    return spectrum
+
+
+def clear_spectrum_cache():
+    """Drop all memoized spectra and reset the hit/miss counters"""
+    with _cache_lock:
+        _spectrum_cache.clear()
+        _cache_stats["hits"] = 0
+        _cache_stats["misses"] = 0
+
+
+def spectrum_cache_info():
+    """
+    Report cache usage.
+
+    Returns:
+        Dictionary with hits, misses and the number of cached spectra
+    """
+    return {**_cache_stats, "size": len(_spectrum_cache)}
@@ -0,0 +1,82 @@
+"""
+IRIS#1 - Digital Biometrics
+Tests for the background artifact writer
+"""
+
+import gzip
+import json
+import threading
+import cv2
+import numpy as np
+from backend.artifact_writer import ArtifactWriter
+
+
+def test_writes_land_atomically_in_order(tmp_path):
+    """Queued writes to one path land in order (gzip copy included); no temp files are left behind"""
+    writer = ArtifactWriter(workers=3, queue_size=4)
+    path = tmp_path / "analysis_iris-001.json"
+
+    for i in range(20):
+        writer.write_json(path, {"version": i})
+    writer.write_image(tmp_path / "iris-001.jpg", np.full((64, 64, 3), 200, dtype=np.uint8))
+
+    assert writer.flush() == 0
+    assert json.loads(path.read_text()) == {"version": 19}
+    assert cv2.imread(str(tmp_path / "iris-001.jpg")).shape == (64, 64, 3)
+    assert json.loads(gzip.decompress((tmp_path / "analysis_iris-001.json.gz").read_bytes())) == {"version": 19}
+    assert sorted(p.name for p in tmp_path.iterdir()) == ["analysis_iris-001.json", "analysis_iris-001.json.gz",
+                                                          "iris-001.jpg"]
+    writer.shutdown()
+
+
+def test_queue_is_bounded(tmp_path):
+    """Submitting blocks once queue_size writes are pending"""
+    writer = ArtifactWriter(workers=1, queue_size=2)
+    release = threading.Event()
+
+    def slow():
+        release.wait(5)
+        return b"x"
+
+    writer.submit(tmp_path / "a.txt", slow)
+    writer.submit(tmp_path / "b.txt", slow)
+    third = threading.Thread(target=writer.write_text, args=(tmp_path / "c.txt", "c"))
+    third.start()
+    third.join(0.2)
+    assert third.is_alive()  # blocked on the full queue
+
+    release.set()
+    third.join(5)
+    assert writer.flush() == 0
+    assert (tmp_path / "c.txt").read_text() == "c"
+    writer.shutdown()
+
+
+def test_updates_are_serialized_with_writes(tmp_path):
+    """Read-modify-writes queued behind a pending write each see the previous result: no update is lost"""
+    writer = ArtifactWriter(workers=4, queue_size=8)
+    path = tmp_path / "metadata_iris-001.json"
+    release = threading.Event()
+
+    writer.submit(path, lambda: release.wait(5) and json.dumps({"confidence": 0.9}).encode("utf-8"))
+    for kind in ["iris", "original", "fft"]:
+        writer.update_json(path, lambda metadata, kind=kind: metadata.setdefault("renditions", {}).update({kind: {}}))
+    release.set()
+
+    assert writer.flush() == 0
+    metadata = json.loads(path.read_text())
+    assert metadata["confidence"] == 0.9
+    assert sorted(metadata["renditions"]) == ["fft", "iris", "original"]
+    writer.shutdown()
+
+
+if __name__ == "__main__":
+    import tempfile
+    from pathlib import Path
+    with tempfile.TemporaryDirectory() as tmp:
+        test_writes_land_atomically_in_order(Path(tmp))
+    with tempfile.TemporaryDirectory() as tmp:
+        test_queue_is_bounded(Path(tmp))
+    with tempfile.TemporaryDirectory() as tmp:
+        test_updates_are_serialized_with_writes(Path(tmp))
+    print("✓ Artifact writer tests passed")
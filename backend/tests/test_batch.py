@@ -0,0 +1,74 @@
+"""
+IRIS#1 - Digital Biometrics
+Tests for the parallel batch runner
+"""
+
+import os
+import time
+from pathlib import Path
+from unittest import mock
+from backend import batch, catalog, latent_code
+from backend.batch import pool_size, run_batch
+
+
+def fake_process_one(incoming_number, input_path):
+    """Stand-in for process_one (module-level so the pool can pickle it); later numbers finish first"""
+    time.sleep(0.05 * (1002 - incoming_number))
+    return {
+        "iris_id": f"iris-{incoming_number:03d}",
+        "input_file": Path(input_path).name,
+        "confidence": 1.0,
+        "latent_code": "",
+        "timings": {},
+        "strategy_stats": {},
+        "prior_hit": False,
+        "pid": os.getpid(),
+    }
+
+
+def test_pool_size():
+    """One worker per core when unset, never more workers than images"""
+    assert pool_size(4, 10) == 4
+    assert pool_size(8, 3) == 3
+    assert pool_size(4, 0) == 1
+    assert pool_size(None, 1000) == (os.cpu_count() or 1)
+    assert pool_size(None, 1) == 1
+
+
+def test_results_sorted_by_iris_number():
+    """Results come back in numeric order (iris-999 before iris-1000) whatever order they finish in"""
+    images = [(number, Path(f"incoming-{number:03d}.jpg")) for number in (998, 999, 1000, 1001)]
+
+    with mock.patch.object(batch, "process_one", fake_process_one):
+        summary = run_batch(images, workers=2, cv_threads=1)
+
+    assert summary["workers"] == 2
+    assert summary["failures"] == []
+    assert [r["iris_id"] for r in summary["results"]] == ["iris-998", "iris-999", "iris-1000", "iris-1001"]
+    assert len({r["pid"] for r in summary["results"]}) <= 2
+
+
+def test_codes_are_pushed_without_index_update(tmp_path):
+    """Batch runs skip the per-code index update but still publish each code to the displays"""
+    with mock.patch.object(latent_code, "CODES_DIR", Path(tmp_path)), \
+         mock.patch.object(catalog, "CATALOG_ENABLED", False), \
+         mock.patch.object(latent_code, "upsert_code_entry") as upsert, \
+         mock.patch.object(latent_code, "publish_event") as publish:
+        latent_code.save_latent_code("ABCD", {}, 42, output_filename="code_iris-1000.json",
+                                     update_index=False)
+
+    upsert.assert_not_called()
+    publish.assert_called_once()
+    event_type, data = publish.call_args[0]
+    assert event_type == "code"
+    assert (data["id"], data["code"], data["seed"]) == ("iris-1000", "ABCD", 42)
+
+
+if __name__ == "__main__":
+    import tempfile
+
+    test_pool_size()
+    test_results_sorted_by_iris_number()
+    with tempfile.TemporaryDirectory() as tmp:
+        test_codes_are_pushed_without_index_update(Path(tmp))
+    print("✓ Batch tests passed")
@@ -0,0 +1,81 @@
+"""
+IRIS#1 - Digital Biometrics
+Tests for the SQLite capture catalog
+"""
+
+import pytest
+from pathlib import Path
+from unittest import mock
+from backend import catalog
+
+
+def test_capture_lineage_and_range_queries(tmp_path):
+    """Stages register into one capture row; lookups and ranges use the indexes"""
+    db = tmp_path / "catalog.db"
+    for n in range(1, 6):
+        iris_id = f"iris-{n:03d}"
+        catalog.register_capture(iris_id, input_file=f"IMG_{n}.CR3", renamed_file=f"incoming-{n:03d}.jpg", db_path=db)
+        catalog.register_capture(iris_id, input_file=f"incoming-{n:03d}.jpg", confidence=n / 5, db_path=db)
+        catalog.record_artifact(iris_id, "iris", tmp_path / f"{iris_id}.jpg", db_path=db)
+    catalog.record_code("iris-002", "IRIS/I?SEED=7", 7, {"GHO": 1.5}, db_path=db)
+    catalog.record_artifact("iris-002", "code", tmp_path / "code_iris-002.json", db_path=db)
+
+    capture = catalog.get_capture("iris-002", db_path=db)
+    assert capture["input_file"] == "IMG_2.CR3"  # not overwritten by the renamed name
+    assert capture["renamed_file"] == "incoming-002.jpg"
+    assert capture["confidence"] == 0.4
+    assert capture["features"] == {"GHO": 1.5}
+    assert set(capture["artifacts"]) == {"iris", "code"}
+
+    assert catalog.get_confidence("iris-005", db_path=db) == 1.0
+    assert catalog.get_confidence("iris-999", db_path=db) is None
+
+    in_range = catalog.list_captures(first=2, last=4, min_confidence=0.5, db_path=db)
+    assert [c["iris_id"] for c in in_range] == ["iris-003", "iris-004"]
+    assert [c["iris_id"] for c in catalog.list_codes(db_path=db)] == ["iris-002"]
+
+
+def test_iris_id_from_artifact_names():
+    assert catalog.iris_id_from_name("fft_iris-012.jpg") == "iris-012"
+    assert catalog.iris_id_from_name("code_iris-012.json") == "iris-012"
+    assert catalog.iris_id_from_name("iris-012.jpg") == "iris-012"
+
+
+def test_failed_import_rolls_back(tmp_path):
+    """An error halfway through a backfill leaves no rows and no open transaction behind"""
+    tmp_path = Path(tmp_path)
+    db = tmp_path / "catalog.db"
+    for n in (1, 2):
+        (tmp_path / f"metadata_iris-00{n}.json").write_text('{"input_file": "IMG.jpg", "confidence": 0.5}')
+    real_record_artifact = catalog.record_artifact
+    calls = []
+
+    def failing_record_artifact(*args, **kwargs):
+        calls.append(args[0])
+        if len(calls) == 2:
+            raise OSError("disk vanished")
+        return real_record_artifact(*args, **kwargs)
+
+    with mock.patch.object(catalog, "PROCESSED_DIR", tmp_path), \
+         mock.patch.object(catalog, "CODES_DIR", tmp_path), \
+         mock.patch.object(catalog, "FFT_DIR", tmp_path), \
+         mock.patch.object(catalog, "record_artifact", failing_record_artifact):
+        with pytest.raises(OSError):
+            catalog.import_sidecars(db_path=db)
+
+    assert catalog.get_capture("iris-001", db_path=db) is None
+    assert not catalog.connect(db).in_transaction
+    with mock.patch.object(catalog, "PROCESSED_DIR", tmp_path), \
+         mock.patch.object(catalog, "CODES_DIR", tmp_path), \
+         mock.patch.object(catalog, "FFT_DIR", tmp_path):
+        assert catalog.import_sidecars(db_path=db) == 2
+
+
+if __name__ == "__main__":
+    import tempfile
+    with tempfile.TemporaryDirectory() as tmp:
+        test_capture_lineage_and_range_queries(Path(tmp))
+    with tempfile.TemporaryDirectory() as tmp:
+        test_failed_import_rolls_back(Path(tmp))
+    test_iris_id_from_artifact_names()
+    print("✓ Catalog tests passed")
@@ -0,0 +1,78 @@
+"""
+IRIS#1 - Digital Biometrics
+Tests for incremental codes index updates
+"""
+
+import json
+import multiprocessing
+from backend import catalog
+from backend.generate_codes_index import generate_codes_index, make_code_entry, upsert_code_entry
+
+
+def _upsert_many(index_path, worker, count):
+    for i in range(count):
+        iris_id = f"iris-{worker * 100 + i:03d}"
+        upsert_code_entry(make_code_entry(iris_id, f"IRIS/I?SEED={i}", i, {}, 0.0),
+                          index_path, rebuild_if_missing=False)
+
+
+def test_upsert_keeps_index_sorted_and_replaces_by_id(tmp_path):
+    """Entries are inserted in id order; saving the same id again replaces it"""
+    index_path = tmp_path / "codes_index.json"
+    for iris_id in ["iris-003", "iris-001", "iris-002"]:
+        upsert_code_entry(make_code_entry(iris_id, "old", 1, {}, 0.0), index_path, rebuild_if_missing=False)
+    upsert_code_entry(make_code_entry("iris-002", "new", 2, {"GHO": 1.0}, 1.0), index_path, rebuild_if_missing=False)
+
+    index = json.loads(index_path.read_text())
+    assert index["count"] == 3
+    assert [c["id"] for c in index["codes"]] == ["iris-001", "iris-002", "iris-003"]
+    assert index["codes"][1]["code"] == "new"
+    assert index["codes"][1]["metadata"]["features"] == {"GHO": 1.0}
+    # The replaced entry carries the newest cursor
+    assert index["cursor"] == 4
+    assert [c["seq"] for c in index["codes"]] == [2, 4, 1]
+
+
+def test_concurrent_upserts_lose_no_entries(tmp_path):
+    """Four processes upserting at once: every entry survives, file stays valid JSON"""
+    index_path = tmp_path / "codes_index.json"
+    context = multiprocessing.get_context("spawn")
+    workers = [context.Process(target=_upsert_many, args=(index_path, w, 15)) for w in range(4)]
+    for worker in workers:
+        worker.start()
+    for worker in workers:
+        worker.join(60)
+
+    index = json.loads(index_path.read_text())
+    assert index["count"] == 60
+    assert len({c["id"] for c in index["codes"]}) == 60
+    assert sorted(c["seq"] for c in index["codes"]) == list(range(1, 61))
+
+
+def test_rebuild_keeps_codes_missing_from_catalog(tmp_path):
+    """A code whose catalog write failed is still in the rebuilt index, read from data/codes/"""
+    db = tmp_path / "catalog.db"
+    codes_dir = tmp_path / "codes"
+    codes_dir.mkdir()
+    for n in (1, 2):
+        (codes_dir / f"code_iris-00{n}.txt").write_text(f"IRIS/I?SEED={n}")
+    (codes_dir / "code_iris-002.json").write_text(json.dumps({"seed": 2}))
+    catalog.record_code("iris-001", "IRIS/I?SEED=1", 1, {}, db_path=db)
+
+    codes = generate_codes_index(codes_dir, db)
+
+    assert [c["id"] for c in codes] == ["iris-001", "iris-002"]
+    assert codes[1]["code"] == "IRIS/I?SEED=2"
+    assert codes[1]["metadata"] == {"seed": 2}
+
+
+if __name__ == "__main__":
+    import tempfile
+    from pathlib import Path
+    with tempfile.TemporaryDirectory() as tmp:
+        test_upsert_keeps_index_sorted_and_replaces_by_id(Path(tmp))
+    with tempfile.TemporaryDirectory() as tmp:
+        test_concurrent_upserts_lose_no_entries(Path(tmp))
+    with tempfile.TemporaryDirectory() as tmp:
+        test_rebuild_keeps_codes_missing_from_catalog(Path(tmp))
+    print("✓ Codes index tests passed")
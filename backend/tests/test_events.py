@@ -0,0 +1,68 @@
+"""
+IRIS#1 - Digital Biometrics
+Tests for the append-only event log
+"""
+
+from backend.events import publish_event, read_events, end_offset
+
+
+def test_events_resume_from_offset_and_skip_partial_lines(tmp_path):
+    """Event ids are offsets: reading from one returns only later events"""
+    log_path = tmp_path / "events.log"
+    publish_event("code", {"id": "iris-001"}, log_path)
+    publish_event("code", {"id": "iris-002"}, log_path)
+
+    events, offset = read_events(0, log_path)
+    assert [e["data"]["id"] for _, e in events] == ["iris-001", "iris-002"]
+    assert offset == end_offset(log_path) == events[-1][0]
+
+    # A line still being written is not returned until it is complete
+    with open(log_path, "ab") as f:
+        f.write(b'{"type":"code","data":{"id":"iris-0')
+    assert read_events(offset, log_path) == ([], offset)
+
+    resumed, _ = read_events(events[0][0], log_path)
+    assert [e["data"]["id"] for _, e in resumed] == ["iris-002"]
+
+
+def test_unknown_offset_gets_a_reset(tmp_path):
+    """An id beyond the log (e.g. the log was deleted) cannot be resumed: the display refetches the index"""
+    log_path = tmp_path / "events.log"
+    assert read_events(0, log_path) == ([], 0)
+
+    publish_event("code", {"id": "iris-001"}, log_path)
+    events, offset = read_events(10_000, log_path)
+    assert events == [(end_offset(log_path), {"type": "index", "data": {"reset": True}})]
+    assert offset == end_offset(log_path)
+
+
+def test_rotation_keeps_ids_increasing(tmp_path):
+    """Past the size cap the log moves to events.log.1; ids continue, rotated-away ids get a reset"""
+    log_path = tmp_path / "events.log"
+    for n in range(1, 4):
+        publish_event("code", {"id": f"iris-00{n}"}, log_path, max_bytes=150)
+    first_events, _ = read_events(0, log_path.with_name("events.log.1"))
+    assert (tmp_path / "events.log.1").exists()
+    assert log_path.stat().st_size < 150
+
+    before = end_offset(log_path)
+    publish_event("code", {"id": "iris-004"}, log_path, max_bytes=150)
+    events, offset = read_events(before, log_path)
+    assert [e["data"]["id"] for _, e in events] == ["iris-004"]
+    assert offset == end_offset(log_path) > before
+
+    # An id from the rotated log is gone
+    events, _ = read_events(first_events[0][0], log_path)
+    assert [e["data"] for _, e in events] == [{"reset": True}]
+
+
+if __name__ == "__main__":
+    import tempfile
+    from pathlib import Path
+    with tempfile.TemporaryDirectory() as tmp:
+        test_events_resume_from_offset_and_skip_partial_lines(Path(tmp))
+    with tempfile.TemporaryDirectory() as tmp:
+        test_unknown_offset_gets_a_reset(Path(tmp))
+    with tempfile.TemporaryDirectory() as tmp:
+        test_rotation_keeps_ids_increasing(Path(tmp))
+    print("✓ Event log tests passed")
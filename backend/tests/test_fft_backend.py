@@ -0,0 +1,71 @@
+"""
+IRIS#1 - Digital Biometrics
+Numerical-equivalence tests for the real-input float32 FFT backend
+"""
+
+import numpy as np
+from concurrent.futures import ThreadPoolExecutor
+from backend.fft_backend import available_backends, centered_log_magnitude, fast_fft_size
+from backend.analysis import extract_radial_profile_waveform
+
+
+def reference_spectrum(image):
+    """Original full complex FFT implementation (fft2 -> fftshift -> abs -> log1p)"""
+    fft_shifted = np.fft.fftshift(np.fft.fft2(image.astype(np.float64)))
+    return np.log1p(np.abs(fft_shifted))
+
+
+def test_matches_full_fft_for_all_backends():
+    """rfft2 + mirrored reconstruction equals the full fft2 spectrum"""
+    rng = np.random.default_rng(3)
+    for shape in [(64, 64), (63, 50), (48, 81), (1, 9)]:
+        image = rng.integers(0, 256, shape, dtype=np.uint8)
+        expected = reference_spectrum(image)
+        for backend in available_backends():
+            actual = centered_log_magnitude(image, pad=False, backend=backend)
+            assert actual.dtype == np.float32
+            assert actual.shape == expected.shape
+            assert np.allclose(actual, expected, rtol=1e-5, atol=1e-3), (backend, shape)
+
+
+def test_waveform_unchanged_by_backend():
+    """The 64-point analysis waveform is unaffected by the float32 transform"""
+    image = np.random.default_rng(4).integers(0, 256, (256, 256), dtype=np.uint8)
+    expected = extract_radial_profile_waveform(reference_spectrum(image))
+    actual = extract_radial_profile_waveform(centered_log_magnitude(image, pad=False))
+    assert np.allclose(actual, expected, atol=1e-4)
+
+
+def test_padding_uses_fast_sizes():
+    """Padding grows each axis to a 5-smooth size"""
+    image = np.ones((97, 2047), dtype=np.uint8)
+    spectrum = centered_log_magnitude(image, pad=True)
+    assert spectrum.shape == (fast_fft_size(97), fast_fft_size(2047))
+    assert fast_fft_size(2048) == 2048
+
+
+def test_concurrent_transforms_match_for_all_backends():
+    """Several threads transforming same-shape images at once each get their own result"""
+    rng = np.random.default_rng(5)
+    images = [rng.integers(0, 256, (96, 128), dtype=np.uint8) for _ in range(16)]
+    expected = [reference_spectrum(image) for image in images]
+
+    for backend in available_backends():
+        def transform(image):
+            # Repeat so the threads overlap inside the transform
+            return [centered_log_magnitude(image, pad=False, backend=backend) for _ in range(5)]
+
+        with ThreadPoolExecutor(max_workers=4) as pool:
+            results = list(pool.map(transform, images))
+
+        for spectra, reference in zip(results, expected):
+            for actual in spectra:
+                assert np.allclose(actual, reference, rtol=1e-5, atol=1e-3), backend
+
+
+if __name__ == "__main__":
+    test_matches_full_fft_for_all_backends()
+    test_waveform_unchanged_by_backend()
+    test_padding_uses_fast_sizes()
+    test_concurrent_transforms_match_for_all_backends()
+    print("✓ FFT backend tests passed")
@@ -0,0 +1,29 @@
+"""
+IRIS#1 - Digital Biometrics
+Tests for reduced-scale image decoding
+"""
+
+import cv2
+import numpy as np
+from backend.iris_processor import load_image, load_image_reduced, make_preview
+
+
+def test_reduced_decode_picks_cheapest_scale(tmp_path):
+    """The largest reduction that keeps the requested short side is used"""
+    path = tmp_path / "photo.jpg"
+    cv2.imwrite(str(path), np.full((1200, 1600, 3), 128, np.uint8))
+
+    assert load_image(path).shape == (1200, 1600, 3)
+    assert load_image_reduced(path, min_side=300)[1] == 4
+    assert load_image(path, min_side=300).shape == (300, 400, 3)
+    assert load_image(path, min_side=100, grayscale=True).shape == (150, 200)
+    assert load_image_reduced(path, min_side=1000)[1] == 1
+    assert make_preview(path, 256).shape == (256, 341, 3)
+
+
+if __name__ == "__main__":
+    import tempfile
+    from pathlib import Path
+    with tempfile.TemporaryDirectory() as tmp:
+        test_reduced_decode_picks_cheapest_scale(Path(tmp))
+    print("✓ Image loading test passed")
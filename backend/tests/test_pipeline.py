@@ -0,0 +1,97 @@
+"""
+IRIS#1 - Digital Biometrics
+Tests for the single-decode pipeline against the separate disk-based stages
+"""
+
+import json
+import cv2
+import numpy as np
+from contextlib import ExitStack
+from functools import partial
+from pathlib import Path
+from unittest import mock
+from backend import analysis, catalog, fft_pipeline, iris_processor, latent_code, pipeline, renditions
+from backend.artifact_writer import flush
+from backend.analysis import analyze_iris, analyze_iris_image
+from backend.fft_pipeline import process_iris_fft
+from backend.latent_code import generate_latent_code, generate_latent_code_from_image
+from backend.pipeline import run_pipeline
+from backend.iris_processor import extract_safe_zone
+from backend.resolution import select_analysis_image
+from backend.tests.test_pupil_detection import make_eye
+from backend.waveform_bundle import read_bundle, update_waveform
+
+
+def isolated_data(tmp_path):
+    """Point every stage at a temporary data folder (no catalog, no index or events)"""
+    processed, fft_dir, codes_dir = tmp_path / "processed", tmp_path / "fft", tmp_path / "codes"
+    for folder in (processed, fft_dir, codes_dir):
+        folder.mkdir()
+    stack = ExitStack()
+    stack.enter_context(mock.patch.object(catalog, "CATALOG_ENABLED", False))
+    stack.enter_context(mock.patch.object(pipeline, "PROCESSED_DIR", processed))
+    stack.enter_context(mock.patch.object(iris_processor, "PROCESSED_DIR", processed))
+    stack.enter_context(mock.patch.object(renditions, "PROCESSED_DIR", processed))
+    stack.enter_context(mock.patch.object(renditions, "DATA_DIR", tmp_path))
+    stack.enter_context(mock.patch.object(
+        renditions, "save_original_renditions",
+        partial(renditions.save_original_renditions, output_dir=processed)))
+    stack.enter_context(mock.patch.object(fft_pipeline, "FFT_DIR", fft_dir))
+    stack.enter_context(mock.patch.object(latent_code, "CODES_DIR", codes_dir))
+    stack.enter_context(mock.patch.object(
+        analysis, "update_waveform",
+        partial(update_waveform, path=tmp_path / "waveforms.bin", analysis_dir=processed)))
+    return stack
+
+
+def test_pipeline_matches_separate_stages(tmp_path):
+    """One decode gives the same artifacts as the stages run on the in-memory ring,
+    and the same waveform as the old stages that re-read the saved iris from disk"""
+    tmp_path = Path(tmp_path)
+    image = make_eye(width=1200, height=800, cx=615, cy=395, r_pupil=85)
+    photo = tmp_path / "incoming-901.png"
+    cv2.imwrite(str(photo), image)
+
+    with isolated_data(tmp_path):
+        result = run_pipeline(photo, output_filename="iris-901.jpg", update_index=False)
+        flush()
+
+        # Stages run separately on the same in-memory ring
+        regions = extract_safe_zone(image)
+        gray = select_analysis_image(
+            cv2.cvtColor(regions["ring"], cv2.COLOR_BGR2GRAY),
+            cv2.cvtColor(regions["polar"], cv2.COLOR_BGR2GRAY) if regions["polar"] is not None else None,
+        )
+        code, features, seed = generate_latent_code_from_image(gray)
+        assert (result["latent_code"], result["features"], result["seed"]) == (code, features, seed)
+        expected = analyze_iris_image(gray, confidence=regions["confidence"])
+        assert result["analysis"] == expected
+
+        # The artifacts on disk hold the same values
+        saved_code = json.loads(result["code_path"].read_text())
+        assert saved_code["latent_code"] == code and saved_code["seed"] == seed
+        assert json.loads(result["analysis_path"].read_text()) == json.loads(json.dumps(expected))
+        ids, waveforms, _ = read_bundle(tmp_path / "waveforms.bin")
+        assert list(ids) == ["iris-901"]
+        assert np.allclose(waveforms[0], expected["waveform"], atol=1e-6)
+        metadata = json.loads((tmp_path / "processed" / "metadata_iris-901.json").read_text())
+        assert metadata["confidence"] == result["confidence"]
+
+        # Old stages: FFT, code and analysis each re-read the saved (JPEG) iris
+        fft_path, _ = process_iris_fft(result["iris_path"], "fft_iris-901-disk.jpg")
+        flush()
+        assert cv2.imread(str(fft_path)).shape == cv2.imread(str(result["fft_path"])).shape
+        _, disk_features, _ = generate_latent_code(result["iris_path"])
+        assert disk_features.keys() == features.keys()
+        disk_analysis = analyze_iris(result["iris_path"])
+        assert disk_analysis["confidence"] == result["confidence"]
+        correlation = np.corrcoef(disk_analysis["waveform"], expected["waveform"])[0, 1]
+        assert correlation > 0.99
+
+
+if __name__ == "__main__":
+    import tempfile
+
+    with tempfile.TemporaryDirectory() as tmp:
+        test_pipeline_matches_separate_stages(Path(tmp))
+    print("✓ Pipeline tests passed")
@@ -0,0 +1,109 @@
+"""
+IRIS#1 - Digital Biometrics
+Tests for pupil detection
+"""
+
+import cv2
+import numpy as np
+from concurrent.futures import ThreadPoolExecutor
+from unittest import mock
+from backend.iris_processor import (
+    detect_pupil, find_pupil_candidate, get_strategy_stats, register_pupil_strategy,
+    reset_strategy_stats, PupilSessionPrior, PUPIL_STRATEGIES
+)
+
+
+def make_eye(width=2400, height=1600, cx=1230, cy=790, r_pupil=170):
+    """Synthetic close-up: textured mid-gray iris filling the frame, dark pupil"""
+    rng = np.random.default_rng(5)
+    image = np.full((height, width, 3), (200, 205, 215), np.uint8)
+    cv2.circle(image, (cx, cy), int(height * 0.75), (70, 110, 140), -1)
+    texture = cv2.resize(rng.integers(0, 70, (height // 8, width // 8), dtype=np.uint8),
+                         (width, height), interpolation=cv2.INTER_LINEAR)
+    image = cv2.add(image, np.repeat(texture[:, :, None], 3, axis=2))
+    cv2.circle(image, (cx, cy), r_pupil, (12, 12, 12), -1)
+    return image
+
+
+def test_pyramid_matches_full_search():
+    """Coarse-to-fine detection lands on the same pupil as the full-resolution search"""
+    image = make_eye()
+    full = detect_pupil(image, mode="full")
+    pyramid = detect_pupil(image, mode="pyramid")
+
+    assert full is not None and pyramid is not None
+    assert abs(pyramid[0] - 1230) <= 3 and abs(pyramid[1] - 790) <= 3
+    assert abs(pyramid[2] - 170) <= 3
+    assert all(abs(a - b) <= 2 for a, b in zip(full[:3], pyramid[:3]))
+    assert abs(full[3] - pyramid[3]) < 0.05
+
+
+def test_session_prior_roi_and_fallback():
+    """The prior's ROI is used when it contains the pupil; otherwise the frame is searched"""
+    prior = PupilSessionPrior()
+    first = detect_pupil(make_eye(), prior=prior)
+    second = detect_pupil(make_eye(cx=1250, cy=800), prior=prior)
+    assert prior.stats["roi_hits"] == 1
+    assert abs(second[0] - 1250) <= 3 and abs(second[1] - 800) <= 3
+
+    # Chin rest moved: the ROI misses and the full search still finds the pupil
+    moved = detect_pupil(make_eye(cx=700, cy=500), prior=prior)
+    assert prior.stats["roi_misses"] + prior.stats["low_confidence"] == 1
+    assert abs(moved[0] - 700) <= 3 and abs(moved[1] - 500) <= 3
+    assert first is not None
+
+
+def test_counters_are_exact_under_threads():
+    """Capture workers update the strategy and prior counters concurrently without losing counts"""
+    gray = cv2.cvtColor(make_eye(width=240, height=160, cx=120, cy=80, r_pupil=17), cv2.COLOR_BGR2GRAY)
+    prior = PupilSessionPrior()
+    reset_strategy_stats()
+
+    def search(_):
+        for _ in range(25):
+            find_pupil_candidate(gray)
+            prior.count("roi_hits")
+
+    with ThreadPoolExecutor(max_workers=8) as pool:
+        list(pool.map(search, range(8)))
+
+    stats = get_strategy_stats()
+    assert sum(counters["hits"] for counters in stats.values()) == 200
+    assert prior.stats["roi_hits"] == 200
+    reset_strategy_stats()
+
+
+def test_registered_strategies_are_tried_in_order():
+    """A registered strategy runs at its place in the order; the search stops at the first hit"""
+    gray = cv2.cvtColor(make_eye(width=240, height=160, cx=120, cy=80, r_pupil=17), cv2.COLOR_BGR2GRAY)
+    tried = []
+
+    def blank(blurred):
+        tried.append("blank")
+        return np.zeros_like(blurred)
+
+    def dark(blurred):
+        tried.append("dark")
+        return np.where(blurred < 40, 255, 0).astype(np.uint8)
+
+    with mock.patch.dict(PUPIL_STRATEGIES):
+        register_pupil_strategy("blank", blank)
+        register_pupil_strategy("dark", dark)
+        reset_strategy_stats()
+        candidate = find_pupil_candidate(gray, order=["blank", "dark", "otsu"])
+
+    assert tried == ["blank", "dark"]
+    assert candidate is not None and abs(candidate[3] - 120) <= 3 and abs(candidate[4] - 80) <= 3
+    stats = get_strategy_stats()
+    assert (stats["blank"]["attempts"], stats["blank"]["hits"]) == (1, 0)
+    assert (stats["dark"]["attempts"], stats["dark"]["hits"]) == (1, 1)
+    assert "otsu" not in stats and "blank" not in PUPIL_STRATEGIES
+    reset_strategy_stats()
+
+
+if __name__ == "__main__":
+    test_pyramid_matches_full_search()
+    test_session_prior_roi_and_fallback()
+    test_counters_are_exact_under_threads()
+    test_registered_strategies_are_tried_in_order()
+    print("✓ Pupil detection test passed")
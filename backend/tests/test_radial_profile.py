@@ -0,0 +1,62 @@
+"""
+IRIS#1 - Digital Biometrics
+Tests for the vectorized radial binning engine
+"""
+
+import numpy as np
+from backend.radial_profile import radial_bin_stats
+from backend.analysis import extract_radial_profile_waveform
+
+
+def reference_waveform(spectrum, target_length=64):
+    """Original per-radius loop implementation, kept as the reference"""
+    h, w = spectrum.shape
+    center_y, center_x = h // 2, w // 2
+    y, x = np.ogrid[:h, :w]
+    radii = np.sqrt((x - center_x)**2 + (y - center_y)**2).astype(int)
+    profile = []
+    for r in range(int(np.max(radii)) + 1):
+        mask = (radii == r)
+        profile.append(float(np.mean(spectrum[mask])) if np.any(mask) else 0.0)
+    lo, hi = min(profile), max(profile)
+    profile = [(v - lo) / (hi - lo) for v in profile] if hi > lo else [0.0] * len(profile)
+    if len(profile) == target_length:
+        return profile
+    indices = np.linspace(0, len(profile) - 1, target_length)
+    return [float(v) for v in np.interp(indices, range(len(profile)), profile)]
+
+
+def test_waveform_matches_reference():
+    """The vectorized waveform equals the original loop output"""
+    rng = np.random.default_rng(1)
+    for shape in [(128, 128), (65, 80), (7, 5)]:
+        spectrum = np.log1p(rng.random(shape) * 1000)
+        expected = reference_waveform(spectrum)
+        actual = extract_radial_profile_waveform(spectrum)
+        assert len(actual) == 64
+        assert np.allclose(actual, expected, rtol=0, atol=1e-9)
+
+
+def test_bin_stats_match_per_radius_numpy():
+    """Count, min/max and percentiles agree with per-radius NumPy reductions"""
+    values = np.random.default_rng(2).random((33, 40))
+    stats = radial_bin_stats(values, extrema=True, percentiles=[10, 50, 90])
+
+    y, x = np.ogrid[:33, :40]
+    radii = np.sqrt((x - 20)**2 + (y - 16)**2).astype(int)
+    for r in range(len(stats["count"])):
+        ring = values[radii == r]
+        assert stats["count"][r] == ring.size
+        if ring.size == 0:
+            continue
+        assert np.isclose(stats["mean"][r], ring.mean())
+        assert stats["min"][r] == ring.min()
+        assert stats["max"][r] == ring.max()
+        for p in [10, 50, 90]:
+            assert np.isclose(stats["percentiles"][p][r], np.percentile(ring, p))
+
+
+if __name__ == "__main__":
+    test_waveform_matches_reference()
+    test_bin_stats_match_per_radius_numpy()
+    print("✓ Radial profile tests passed")
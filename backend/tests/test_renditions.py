@@ -0,0 +1,58 @@
+"""
+IRIS#1 - Digital Biometrics
+Tests for multi-resolution renditions
+"""
+
+import cv2
+import numpy as np
+from backend.renditions import rendition_cascade, save_original_renditions, save_renditions
+from backend.artifact_writer import flush
+
+
+def test_cascade_fits_longer_side_and_skips_upscaling():
+    """Each rendition fits its size; sizes above the image are not produced"""
+    image = np.zeros((600, 900, 3), dtype=np.uint8)
+
+    renditions = rendition_cascade(image, sizes=[256, 512, 1024])
+
+    assert sorted(renditions) == [256, 512]
+    assert renditions[512].shape[:2] == (341, 512)
+    assert renditions[256].shape[:2] == (170, 256)
+
+
+def test_save_renditions_next_to_full_file(tmp_path):
+    """Renditions are written to renditions/<stem>_<size>.jpg"""
+    full_path = tmp_path / "iris-001.jpg"
+    image = np.full((1024, 1024, 3), 128, dtype=np.uint8)
+    cv2.imwrite(str(full_path), image)
+
+    recorded = save_renditions(image, full_path, sizes=[256])
+    flush()
+
+    assert set(recorded) == {"256", "full"}
+    saved = cv2.imread(str(tmp_path / "renditions" / "iris-001_256.jpg"))
+    assert saved.shape == (256, 256, 3)
+
+
+def test_original_renditions_named_after_iris(tmp_path):
+    """Original renditions go to processed/renditions/original_iris-XXX_<size>.jpg, from the decoded photo"""
+    # The photo is never read from disk: the in-memory image is used
+    input_path = tmp_path / "incoming-001.jpg"
+    image = np.full((1024, 768, 3), 128, dtype=np.uint8)
+
+    recorded = save_original_renditions(input_path, "iris-007", image=image, sizes=[256], output_dir=tmp_path)
+    flush()
+
+    assert "incoming-001" not in recorded["256"]
+    saved = cv2.imread(str(tmp_path / "renditions" / "original_iris-007_256.jpg"))
+    assert saved.shape == (256, 192, 3)
+
+
+if __name__ == "__main__":
+    import tempfile
+    from pathlib import Path
+    test_cascade_fits_longer_side_and_skips_upscaling()
+    with tempfile.TemporaryDirectory() as tmp:
+        test_save_renditions_next_to_full_file(Path(tmp))
+        test_original_renditions_named_after_iris(Path(tmp))
+    print("✓ Rendition tests passed")
@@ -0,0 +1,70 @@
+"""
+IRIS#1 - Digital Biometrics
+Tests for the on-demand resize cache (backend/resize_cache.py)
+"""
+
+import os
+import cv2
+import numpy as np
+from backend.resize_cache import ResizeCache
+
+
+def _image(path, width=800, height=600):
+    gradient = np.tile(np.linspace(0, 255, width, dtype=np.uint8), (height, 1))
+    cv2.imwrite(str(path), cv2.merge([gradient] * 3))
+    return path
+
+
+def test_resize_is_made_once_and_reused(tmp_path):
+    source = _image(tmp_path / "iris-001.jpg")
+    cache = ResizeCache(tmp_path / "cache", max_bytes=10**8)
+
+    path = cache.get(source, 256)
+    assert cv2.imread(str(path)).shape == (192, 256, 3)
+
+    mtime = path.stat().st_mtime_ns
+    assert cache.get(source, 256) == path
+    assert path.stat().st_mtime_ns >= mtime  # Hit refreshes its LRU position
+
+    # Not wider than requested: the original itself
+    assert cache.get(source, 1024) == source
+
+
+def test_rewritten_source_is_resized_again(tmp_path):
+    source = _image(tmp_path / "iris-001.jpg")
+    cache = ResizeCache(tmp_path / "cache", max_bytes=10**8)
+    first = cache.get(source, 128)
+
+    _image(source, width=640, height=640)
+    os.utime(source, ns=(source.stat().st_mtime_ns + 10**9,) * 2)
+    second = cache.get(source, 128)
+
+    assert second != first
+    assert cv2.imread(str(second)).shape == (128, 128, 3)
+
+
+def test_least_recently_used_files_are_evicted(tmp_path):
+    sources = [_image(tmp_path / f"iris-00{i}.jpg") for i in range(1, 5)]
+    cache = ResizeCache(tmp_path / "cache", max_bytes=1)
+
+    paths = []
+    for i, source in enumerate(sources):
+        paths.append(cache.get(source, 400))
+        os.utime(paths[-1], ns=(10**18 + i * 10**9,) * 2)  # Distinct ages: iris-004 most recent
+
+    cache.max_bytes = paths[-1].stat().st_size * 2 + 1
+    cache.get(sources[0], 300)
+
+    remaining = sorted(p.name for p in (tmp_path / "cache").iterdir())
+    assert len(remaining) <= 2
+    assert paths[0].name not in remaining
+
+
+if __name__ == "__main__":
+    import tempfile
+    from pathlib import Path
+    for test in (test_resize_is_made_once_and_reused, test_rewritten_source_is_resized_again,
+                 test_least_recently_used_files_are_evicted):
+        with tempfile.TemporaryDirectory() as tmp:
+            test(Path(tmp))
+    print("✓ Resize cache tests passed")
@@ -0,0 +1,56 @@
+"""
+IRIS#1 - Digital Biometrics
+Tests for analysis resolution handling
+"""
+
+import cv2
+import numpy as np
+import pytest
+from pathlib import Path
+from backend.resolution import load_analysis_image, select_analysis_image, to_analysis_resolution
+
+
+def test_downsampling_keeps_aspect_and_small_images():
+    """The longer side is brought down to the analysis size; smaller images are untouched"""
+    image = np.zeros((400, 800), np.uint8)
+    assert to_analysis_resolution(image, 200).shape == (100, 200)
+    assert to_analysis_resolution(image, 1000) is image
+    assert to_analysis_resolution(image, None) is image
+
+
+def test_select_analysis_image():
+    """The strip is used only for source "polar"; the ring is downsampled"""
+    ring = np.zeros((800, 800), np.uint8)
+    polar = np.ones((64, 512), np.uint8)
+    assert select_analysis_image(ring, polar, source="polar") is polar
+    assert select_analysis_image(ring, polar, source="ring").shape == to_analysis_resolution(ring).shape
+    assert select_analysis_image(ring, None, source="polar").shape == to_analysis_resolution(ring).shape
+
+
+def test_load_analysis_image(tmp_path):
+    """Ring and strip load from disk; a missing strip is an error, not a silent switch to the ring"""
+    tmp_path = Path(tmp_path)
+    iris_path = tmp_path / "iris-001.png"
+    cv2.imwrite(str(iris_path), np.full((800, 800), 90, np.uint8))
+
+    ring = load_analysis_image(iris_path, source="ring")
+    assert ring.shape == to_analysis_resolution(np.zeros((800, 800), np.uint8)).shape
+    with pytest.raises(FileNotFoundError, match="SAVE_POLAR_STRIP"):
+        load_analysis_image(iris_path, source="polar")
+
+    cv2.imwrite(str(tmp_path / "polar_iris-001.png"), np.full((64, 512), 30, np.uint8))
+    strip = load_analysis_image(iris_path, source="polar")
+    assert strip.shape == (64, 512) and int(strip[0, 0]) == 30
+
+    with pytest.raises(FileNotFoundError):
+        load_analysis_image(tmp_path / "iris-002.png", source="ring")
+
+
+if __name__ == "__main__":
+    import tempfile
+
+    test_downsampling_keeps_aspect_and_small_images()
+    test_select_analysis_image()
+    with tempfile.TemporaryDirectory() as tmp:
+        test_load_analysis_image(Path(tmp))
+    print("✓ Resolution tests passed")
@@ -0,0 +1,59 @@
+"""
+IRIS#1 - Digital Biometrics
+Tests for ROI-first Safe Zone ring extraction
+"""
+
+import numpy as np
+from unittest import mock
+from backend.config import POLAR_STRIP_HEIGHT, POLAR_STRIP_WIDTH
+from backend.iris_processor import crop_ring, extract_safe_zone, unwrap_ring_polar
+from backend.benchmark import legacy_mask_and_crop
+
+
+def test_crop_ring_matches_full_frame_extraction():
+    """Analytic bounding box + crop-only masking equals the full-frame original"""
+    rng = np.random.default_rng(6)
+    image = rng.integers(1, 256, (300, 400, 3), dtype=np.uint8)
+
+    # Centered, touching the left/top edges, and a ring clipped on two sides
+    for cx, cy, r_pupil in [(200, 150, 40), (30, 20, 25), (390, 290, 60), (5, 150, 80)]:
+        expected = legacy_mask_and_crop(image, cx, cy, r_pupil)
+        actual = crop_ring(image, cx, cy, r_pupil)
+        assert np.array_equal(actual, expected), (cx, cy, r_pupil)
+
+
+def test_polar_strip_samples_the_annulus():
+    """Rows run from the inner to the outer ring edge, columns around the pupil"""
+    cx, cy, r_pupil = 200, 150, 40
+    yy, xx = np.mgrid[:300, :400]
+    dist = np.sqrt((xx - cx) ** 2 + (yy - cy) ** 2)
+    # Radial gradient inside the annulus, left half brighter than the right
+    image = np.clip((dist - 44) * 2, 0, 255).astype(np.uint8) + np.where(xx < cx, 50, 0).astype(np.uint8)
+
+    strip = unwrap_ring_polar(image, cx, cy, r_pupil, size=(16, 64))
+
+    assert strip.shape == (16, 64)
+    rows = strip.astype(float).mean(axis=1)
+    assert np.all(np.diff(rows) > 0)  # brighter towards the outer edge
+    # Column 0 points right (3 o'clock), column 32 points left
+    assert strip[:, 32].mean() > strip[:, 0].mean() + 40
+
+
+def test_ring_outside_frame_still_gives_polar_strip():
+    """A detected pupil whose ring misses the frame falls back to the center crop, polar strip included"""
+    image = np.random.default_rng(7).integers(1, 256, (300, 400, 3), dtype=np.uint8)
+
+    with mock.patch("backend.iris_processor.detect_pupil", return_value=(-5000, -5000, 20, 0.9)):
+        assert crop_ring(image, -5000, -5000, 20) is None
+        regions = extract_safe_zone(image, crop_size=128, polar=True)
+
+    assert regions["confidence"] == 0.0 and regions["pupil"] is None
+    assert regions["ring"].shape == (128, 128, 3)
+    assert regions["polar"].shape == (POLAR_STRIP_HEIGHT, POLAR_STRIP_WIDTH, 3)
+
+
+if __name__ == "__main__":
+    test_crop_ring_matches_full_frame_extraction()
+    test_polar_strip_samples_the_annulus()
+    test_ring_outside_frame_still_gives_polar_strip()
+    print("✓ Ring extraction test passed")
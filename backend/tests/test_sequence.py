@@ -0,0 +1,74 @@
+"""
+IRIS#1 - Digital Biometrics
+Tests for the persistent sequence allocator
+"""
+
+import multiprocessing
+from backend.sequence import allocate, observe, rebuild
+
+
+def _sequences(directory):
+    return {"iris": (directory, "iris-", [".jpg"])}
+
+
+def _allocate_many(state_path, directory, count, queue):
+    numbers = [allocate("iris", state_path=state_path, sequences=_sequences(directory))
+               for _ in range(count)]
+    queue.put(numbers)
+
+
+def test_first_use_scans_directory_then_skips_taken_numbers(tmp_path):
+    """The directory is scanned once; numbers already on disk are never handed out"""
+    for name in ["iris-001.jpg", "iris-007.jpg", "notes.jpg"]:
+        (tmp_path / name).touch()
+    state_path = tmp_path / "sequences.json"
+
+    assert allocate("iris", state_path=state_path, sequences=_sequences(tmp_path)) == 8
+
+    (tmp_path / "iris-009.jpg").touch()  # copied in by hand
+    assert allocate("iris", state_path=state_path, sequences=_sequences(tmp_path)) == 10
+
+    observe("iris", 20, state_path=state_path, sequences=_sequences(tmp_path))
+    assert allocate("iris", count=5, state_path=state_path, sequences=_sequences(tmp_path)) == 21
+    assert rebuild(state_path=state_path, sequences=_sequences(tmp_path)) == {"iris": 9}
+
+
+def test_block_skips_numbers_taken_inside_it(tmp_path):
+    """A block of several numbers never covers a file copied in by hand"""
+    (tmp_path / "iris-003.jpg").touch()
+    state_path = tmp_path / "sequences.json"
+    sequences = _sequences(tmp_path)
+    allocate("iris", state_path=state_path, sequences=sequences)  # 4, after the scan
+    (tmp_path / "iris-007.jpg").touch()
+
+    first = allocate("iris", count=3, state_path=state_path, sequences=sequences)
+    assert first == 8  # 5..7 would overwrite iris-007
+    assert allocate("iris", state_path=state_path, sequences=sequences) == 11
+
+
+def test_concurrent_processes_get_unique_numbers(tmp_path):
+    """Four processes allocating at once never share a number or leave gaps"""
+    state_path = tmp_path / "sequences.json"
+    context = multiprocessing.get_context("spawn")
+    queue = context.Queue()
+    workers = [context.Process(target=_allocate_many, args=(state_path, tmp_path, 25, queue))
+               for _ in range(4)]
+    for worker in workers:
+        worker.start()
+    numbers = [n for _ in workers for n in queue.get(timeout=60)]
+    for worker in workers:
+        worker.join()
+
+    assert sorted(numbers) == list(range(1, 101))
+
+
+if __name__ == "__main__":
+    import tempfile
+    from pathlib import Path
+    with tempfile.TemporaryDirectory() as tmp:
+        test_first_use_scans_directory_then_skips_taken_numbers(Path(tmp))
+    with tempfile.TemporaryDirectory() as tmp:
+        test_block_skips_numbers_taken_inside_it(Path(tmp))
+    with tempfile.TemporaryDirectory() as tmp:
+        test_concurrent_processes_get_unique_numbers(Path(tmp))
+    print("✓ Sequence tests passed")
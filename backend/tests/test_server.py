@@ -0,0 +1,229 @@
+"""
+IRIS#1 - Digital Biometrics
+Tests for the HTTP server helpers (start_server.py)
+"""
+
+import http.client
+import os
+import socket
+import threading
+from pathlib import Path
+from unittest import mock
+import pytest
+from start_server import (
+    FRONTEND_DIR, accepts_gzip, codes_since, make_server, parse_range, precompressed_copy
+)
+
+
+def _index(seqs):
+    codes = [{"id": f"iris-{n:03d}", "code": f"IRIS/{n}", "seq": seq} for n, seq in enumerate(seqs, start=1)]
+    return {"cursor": max(seqs), "count": len(codes), "codes": codes}
+
+
+def test_codes_since_returns_only_newer_entries_in_cursor_order():
+    """iris-002 was re-saved last, so it comes after iris-003"""
+    index = _index([1, 4, 3])
+
+    delta = codes_since(index, 2)
+
+    assert delta["cursor"] == 4
+    assert not delta["reset"]
+    assert [c["id"] for c in delta["codes"]] == ["iris-003", "iris-002"]
+    assert codes_since(index, 4)["codes"] == []
+
+
+def test_cursor_ahead_of_index_resets_client():
+    """A rebuilt/replaced index with a lower cursor sends everything again"""
+    delta = codes_since(_index([1, 2]), 10)
+
+    assert delta["reset"]
+    assert len(delta["codes"]) == 2
+
+
+def _serve(**kwargs):
+    server = make_server(0, **kwargs)
+    server.RequestHandlerClass.log_message = lambda *args: None
+    threading.Thread(target=server.serve_forever, daemon=True).start()
+    return server
+
+
+def test_concurrent_server_keeps_connections_alive():
+    """Several requests on one connection, each with a Content-Length"""
+    server = _serve(max_connections=4)
+    try:
+        conn = http.client.HTTPConnection("127.0.0.1", server.server_address[1], timeout=5)
+        conn.request("GET", "/api/codes?since=0")
+        first = conn.getresponse()
+        first.read()
+        sock = conn.sock
+        conn.request("GET", "/api/codes?since=0")
+        second = conn.getresponse()
+        second.read()
+
+        assert first.status == second.status == 200
+        assert first.version == 11
+        assert conn.sock is sock
+        conn.close()
+    finally:
+        server.shutdown()
+        server.server_close()
+
+
+def test_shutdown_does_not_hang_at_the_connection_limit():
+    """With every slot taken and a connection waiting for one, shutdown() still returns"""
+    server = _serve(max_connections=1)
+    server.slot_poll_interval = 0.05
+    waiting_for_slot = threading.Event()
+    acquire = server._slots.acquire
+
+    def acquire_or_signal(*args, **kwargs):
+        acquired = acquire(*args, **kwargs)
+        if not acquired:
+            waiting_for_slot.set()
+        return acquired
+
+    server._slots.acquire = acquire_or_signal
+    port = server.server_address[1]
+    holder = socket.create_connection(("127.0.0.1", port), timeout=5)  # idle keep-alive slot
+    waiting = socket.create_connection(("127.0.0.1", port), timeout=5)
+    try:
+        assert waiting_for_slot.wait(timeout=3)
+        stopper = threading.Thread(target=server.shutdown, daemon=True)
+        stopper.start()
+        stopper.join(timeout=3)
+        assert not stopper.is_alive()
+        assert waiting.recv(1) == b""  # closed without being served
+    finally:
+        holder.close()
+        waiting.close()
+        server.server_close()
+
+
+def test_event_streams_beyond_the_cap_are_refused():
+    """Displays past the stream cap (and on the legacy server) get a 503 and poll instead"""
+    for kwargs in ({"max_connections": 4, "max_event_streams": 0}, {"legacy": True}):
+        server = _serve(**kwargs)
+        try:
+            conn = http.client.HTTPConnection("127.0.0.1", server.server_address[1], timeout=5)
+            conn.request("GET", "/api/events")
+            response = conn.getresponse()
+            response.read()
+            assert response.status == 503
+            conn.close()
+        finally:
+            server.shutdown()
+            server.server_close()
+
+
+def test_parse_range():
+    assert parse_range("bytes=0-499", 1000) == (0, 499)
+    assert parse_range("bytes=500-", 1000) == (500, 999)
+    assert parse_range("bytes=-200", 1000) == (800, 999)
+    assert parse_range("bytes=900-5000", 1000) == (900, 999)
+    # Not understood: the whole file is sent
+    assert parse_range("bytes=0-1,5-6", 1000) is None
+    assert parse_range("bytes=abc", 1000) is None
+    # Outside the file: 416
+    with pytest.raises(ValueError):
+        parse_range("bytes=1000-", 1000)
+
+
+def test_files_revalidate_with_etag():
+    """Artifacts are rewritten in place, so nothing is cached without revalidation; unchanged files cost a 304"""
+    server = _serve()
+    try:
+        conn = http.client.HTTPConnection("127.0.0.1", server.server_address[1], timeout=5)
+        conn.request("GET", "/index.html")
+        response = conn.getresponse()
+        response.read()
+        assert response.getheader("Cache-Control") == "no-cache"
+
+        conn.request("GET", "/index.html", headers={"If-None-Match": response.getheader("ETag")})
+        revalidated = conn.getresponse()
+        revalidated.read()
+        assert revalidated.status == 304
+        conn.close()
+    finally:
+        server.shutdown()
+        server.server_close()
+
+
+def test_gzip_copy_is_used_only_when_accepted_and_fresh(tmp_path):
+    assert accepts_gzip("gzip, deflate, br")
+    assert not accepts_gzip("gzip;q=0, identity")
+    assert not accepts_gzip("")
+
+    path = tmp_path / "codes_index.json"
+    path.write_text("{}")
+    assert precompressed_copy(path) is None
+    compressed = tmp_path / "codes_index.json.gz"
+    compressed.write_bytes(b"")
+    assert precompressed_copy(path) == compressed
+    # JSON rewritten, copy not yet: serve the JSON itself
+    os.utime(path, ns=(compressed.stat().st_mtime_ns + 10**9,) * 2)
+    assert precompressed_copy(path) is None
+
+
+def test_range_request_returns_partial_content():
+    """Range on a frontend file (served from the in-memory cache on the second request)"""
+    content = (FRONTEND_DIR / "index.html").read_bytes()
+    server = _serve()
+    try:
+        conn = http.client.HTTPConnection("127.0.0.1", server.server_address[1], timeout=5)
+        for _ in range(2):
+            conn.request("GET", "/index.html", headers={"Range": "bytes=5-14"})
+            response = conn.getresponse()
+            assert response.status == 206
+            assert response.getheader("Content-Range") == f"bytes 5-14/{len(content)}"
+            assert response.read() == content[5:15]
+
+        conn.request("GET", "/index.html", headers={"Range": f"bytes={len(content)}-"})
+        response = conn.getresponse()
+        response.read()
+        assert response.status == 416
+        conn.close()
+    finally:
+        server.shutdown()
+        server.server_close()
+
+
+def test_error_after_headers_closes_connection():
+    """A failure mid-body cannot become a 500: the connection is closed and the client sees a short body"""
+    server = _serve()
+    try:
+        port = server.server_address[1]
+        with mock.patch("start_server.is_hot_file", return_value=False), \
+                mock.patch.object(socket.socket, "sendfile", side_effect=OSError("disk went away")):
+            conn = http.client.HTTPConnection("127.0.0.1", port, timeout=5)
+            conn.request("GET", "/index.html")
+            response = conn.getresponse()
+            assert response.status == 200
+            with pytest.raises(http.client.IncompleteRead) as short:
+                response.read()
+            assert short.value.partial == b""  # No error page written into the body
+            conn.close()
+
+        # The server keeps serving
+        conn = http.client.HTTPConnection("127.0.0.1", port, timeout=5)
+        conn.request("GET", "/index.html")
+        assert conn.getresponse().status == 200
+        conn.close()
+    finally:
+        server.shutdown()
+        server.server_close()
+
+
+if __name__ == "__main__":
+    import tempfile
+    test_codes_since_returns_only_newer_entries_in_cursor_order()
+    test_cursor_ahead_of_index_resets_client()
+    test_concurrent_server_keeps_connections_alive()
+    test_shutdown_does_not_hang_at_the_connection_limit()
+    test_event_streams_beyond_the_cap_are_refused()
+    test_parse_range()
+    test_files_revalidate_with_etag()
+    with tempfile.TemporaryDirectory() as tmp:
+        test_gzip_copy_is_used_only_when_accepted_and_fresh(Path(tmp))
+    test_range_request_returns_partial_content()
+    test_error_after_headers_closes_connection()
+    print("✓ Server tests passed")
@@ -0,0 +1,27 @@
+"""
+IRIS#1 - Digital Biometrics
+Tests for the shared FFT spectrum provider
+"""
+
+import numpy as np
+from backend.spectrum import clear_spectrum_cache, spectrum_cache_info
+from backend.fft_pipeline import compute_fft_2d
+from backend.analysis import compute_fft_spectrum
+
+
+def test_spectrum_computed_once_per_image():
+    """fft_pipeline and analysis share one spectrum for the same pixels"""
+    clear_spectrum_cache()
+    image = np.random.default_rng(0).integers(0, 256, (64, 48), dtype=np.uint8)
+
+    first = compute_fft_2d(image)
+    second = compute_fft_spectrum(image.copy())
+
+    assert first is second
+    assert spectrum_cache_info()["misses"] == 1
+    assert spectrum_cache_info()["hits"] == 1
+
+
+if __name__ == "__main__":
+    test_spectrum_computed_once_per_image()
+    print("✓ Spectrum provider test passed")
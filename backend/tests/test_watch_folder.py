@@ -0,0 +1,112 @@
+"""
+IRIS#1 - Digital Biometrics
+Tests for the watch folder capture queue (backend/watch_folder.py)
+"""
+
+import threading
+import time
+from backend.watch_folder import CaptureQueue
+
+
+def _photos(tmp_path, count):
+    paths = []
+    for i in range(1, count + 1):
+        path = tmp_path / f"visitor-{i}.jpg"
+        path.write_bytes(b"jpeg")
+        paths.append(path)
+    return paths
+
+
+def test_second_visitor_does_not_wait_for_the_first(tmp_path):
+    first, second = _photos(tmp_path, 2)
+    finished = []
+    release_first = threading.Event()
+
+    def process(path):
+        if path == first:
+            release_first.wait(5)
+        finished.append(path.name)
+        return {"latent_code": path.name}
+
+    captures = CaptureQueue(workers=2, queue_size=4, process=process, settle_seconds=0)
+    assert captures.submit(first)
+    assert captures.submit(second)
+    assert not captures.submit(second)  # Duplicate event
+    assert not captures.submit(tmp_path / "notes.txt")
+
+    deadline = time.monotonic() + 5
+    while "visitor-2.jpg" not in finished and time.monotonic() < deadline:
+        time.sleep(0.01)
+    assert finished == ["visitor-2.jpg"]
+
+    release_first.set()
+    assert captures.drain() == 0
+    assert sorted(finished) == ["visitor-1.jpg", "visitor-2.jpg"]
+    assert captures.stats["processed"] == 2
+
+
+def test_full_queue_blocks_submit_and_drain_finishes_it(tmp_path):
+    photos = _photos(tmp_path, 3)
+    release = threading.Event()
+    processed = []
+
+    def process(path):
+        release.wait(5)
+        processed.append(path.name)
+        return {"latent_code": path.name}
+
+    captures = CaptureQueue(workers=1, queue_size=1, process=process, settle_seconds=0)
+    captures.submit(photos[0])
+    deadline = time.monotonic() + 5
+    while captures.depth() and time.monotonic() < deadline:
+        time.sleep(0.01)  # Worker picked up the first photo
+    captures.submit(photos[1])  # Fills the queue
+
+    third = threading.Thread(target=captures.submit, args=(photos[2],))
+    third.start()
+    third.join(0.2)
+    assert third.is_alive()  # Backpressure: waits for a free slot
+
+    release.set()
+    third.join(5)
+    assert captures.drain() == 0
+    assert processed == ["visitor-1.jpg", "visitor-2.jpg", "visitor-3.jpg"]
+    assert not captures.submit(tmp_path / "late.jpg")  # Not accepting after drain
+
+
+def test_stop_drops_queue_and_ends_workers(tmp_path):
+    """A second Ctrl+C: queued photos are dropped, the in-flight photo is abandoned, workers exit"""
+    photos = _photos(tmp_path, 3)
+    started = threading.Event()
+    release = threading.Event()
+    processed = []
+
+    def process(path):
+        started.set()
+        release.wait(5)
+        processed.append(path.name)
+        return {"latent_code": path.name}
+
+    captures = CaptureQueue(workers=1, queue_size=4, process=process, settle_seconds=0)
+    for photo in photos:
+        captures.submit(photo)
+    assert started.wait(5)
+
+    assert captures.stop() == (2, 1)
+    release.set()
+    for worker in captures._workers:
+        worker.join(5)
+        assert not worker.is_alive()
+    assert processed == ["visitor-1.jpg"]
+    assert not captures.submit(tmp_path / "late.jpg")
+
+
+if __name__ == "__main__":
+    import tempfile
+    from pathlib import Path
+    for test in (test_second_visitor_does_not_wait_for_the_first,
+                 test_full_queue_blocks_submit_and_drain_finishes_it,
+                 test_stop_drops_queue_and_ends_workers):
+        with tempfile.TemporaryDirectory() as tmp:
+            test(Path(tmp))
+    print("✓ Watch folder tests passed")
@@ -0,0 +1,70 @@
+"""
+IRIS#1 - Digital Biometrics
+Tests for the packed waveform bundle (backend/waveform_bundle.py)
+"""
+
+import json
+import numpy as np
+from backend.waveform_bundle import (
+    HEADER, ID_BYTES, decode_bundle, encode_bundle, read_bundle, update_waveform
+)
+
+
+def _waveform(value):
+    return np.full(64, value, dtype=np.float32)
+
+
+def test_bundle_round_trip_and_alignment():
+    """The float block starts on a 4-byte boundary, so it maps onto a Float32Array"""
+    ids = ["iris-001", "iris-002", "iris-010"]
+    waveforms = np.stack([_waveform(i / 10) for i in range(3)])
+    confidences = [0.9, np.nan, 0.5]
+
+    data = encode_bundle(ids, waveforms, confidences)
+
+    assert (HEADER.size + len(ids) * ID_BYTES) % 4 == 0
+    assert len(data) == HEADER.size + len(ids) * ID_BYTES + waveforms.nbytes + len(ids) * 4
+    decoded_ids, decoded, decoded_confidences = decode_bundle(data)
+    assert decoded_ids == ids
+    assert np.array_equal(decoded, waveforms)
+    assert np.allclose(decoded_confidences, confidences, equal_nan=True)
+
+
+def test_update_inserts_sorted_and_replaces(tmp_path):
+    path = tmp_path / "waveforms.bin"
+    (tmp_path / "analysis_iris-002.json").write_text(json.dumps({"waveform": [0.2] * 64, "confidence": 0.4}))
+    (tmp_path / "analysis_iris-004.json").write_text(json.dumps({"waveform": [0.4] * 64}))
+
+    # Missing bundle: existing analysis files come in with the first update
+    update_waveform("iris-003", _waveform(0.3), 0.7, path, analysis_dir=tmp_path)
+    update_waveform("iris-001", _waveform(0.1), 0.8, path, analysis_dir=tmp_path)
+    update_waveform("iris-002", _waveform(0.9), 0.6, path, analysis_dir=tmp_path)
+
+    ids, waveforms, confidences = read_bundle(path)
+    assert ids == ["iris-001", "iris-002", "iris-003", "iris-004"]
+    assert np.allclose(waveforms[:, 0], [0.1, 0.9, 0.3, 0.4])
+    assert np.allclose(confidences, [0.8, 0.6, 0.7, np.nan], equal_nan=True)
+
+
+def test_version_1_bundle_is_rebuilt(tmp_path):
+    """A bundle without confidences is replaced from the analysis files on the next update"""
+    path = tmp_path / "waveforms.bin"
+    path.write_bytes(HEADER.pack(b"IRWF", 1, 0, 64))
+    (tmp_path / "analysis_iris-001.json").write_text(json.dumps({"waveform": [0.1] * 64, "confidence": 0.9}))
+
+    update_waveform("iris-002", _waveform(0.2), 0.5, path, analysis_dir=tmp_path)
+
+    ids, _, confidences = read_bundle(path)
+    assert ids == ["iris-001", "iris-002"]
+    assert np.allclose(confidences, [0.9, 0.5])
+
+
+if __name__ == "__main__":
+    import tempfile
+    from pathlib import Path
+    test_bundle_round_trip_and_alignment()
+    with tempfile.TemporaryDirectory() as tmp:
+        test_update_inserts_sorted_and_replaces(Path(tmp))
+    with tempfile.TemporaryDirectory() as tmp:
+        test_version_1_bundle_is_rebuilt(Path(tmp))
+    print("✓ Waveform bundle tests passed")
@@ -2,109 +2,252 @@
 IRIS#1 - Digital Biometrics
 Watches the incoming folder for new iris photos and triggers processing pipeline.
 For MVP: simple file watcher. Later: integrate with camera automation.
+
+The watchdog callback only queues the photo. A pool of WATCH_WORKERS threads
+runs the pipeline, so a second visitor photographed while the first is still
+being processed starts right away. The queue holds WATCH_QUEUE_SIZE photos;
+when it is full, new events wait (backpressure). Ctrl+C finishes the queued
+photos before exiting (press it again to stop immediately: queued photos are
+left in the incoming folder and the photos being processed are abandoned).
 """
 
 from watchdog.observers import Observer
 from watchdog.events import FileSystemEventHandler
 from pathlib import Path
+import queue
+import threading
 import time
-from backend.config import INCOMING_DIR, WATCH_PATTERNS
-from backend.iris_processor import process_iris_photo
-from backend.fft_pipeline import process_iris_fft
-from backend.latent_code import generate_latent_code, save_latent_code
+from backend.config import INCOMING_DIR, WATCH_WORKERS, WATCH_QUEUE_SIZE, WATCH_SETTLE_SECONDS
+from backend.pipeline import run_pipeline
+from backend.artifact_writer import flush
+from backend.iris_processor import get_strategy_stats, print_strategy_stats, PupilSessionPrior
 
 
-class IrisPhotoHandler(FileSystemEventHandler):
+class CaptureQueue:
     """
-    Handles new file events in the incoming folder.
-    When a new photo appears, triggers the full processing pipeline.
+    Bounded queue of new photos and the worker threads that process them.
+    Each photo is processed once: events for a photo that is already queued,
+    in progress or done are ignored (a failed photo can be picked up again).
     """
-    
-    def __init__(self):
-        self.processed_files = set()  # Track already processed files
-    
-    def on_created(self, event):
-        """Called when a new file is created"""
-        if not event.is_directory:
-            self.process_file(event.src_path)
-    
-    def on_moved(self, event):
-        """Called when a file is moved (e.g., camera saves to folder)"""
-        if not event.is_directory:
-            self.process_file(event.dest_path)
-    
-    def process_file(self, file_path):
+
+    def __init__(self, workers=WATCH_WORKERS, queue_size=WATCH_QUEUE_SIZE, process=None,
+                 settle_seconds=WATCH_SETTLE_SECONDS):
+        self.pupil_prior = PupilSessionPrior()  # Fixed camera: reuse recent pupil positions
+        self.settle_seconds = settle_seconds
+        self._process = process or (lambda path: run_pipeline(path, prior=self.pupil_prior))
+        self._queue = queue.Queue(maxsize=queue_size)
+        self._lock = threading.Lock()
+        self._seen = set()  # Photos queued, in progress or processed
+        self._accepting = True
+        self._stopped = threading.Event()  # Workers exit once set
+        self._in_flight = 0  # Photos a worker is processing right now
+        self.stats = {"queued": 0, "processed": 0, "failed": 0, "max_depth": 0, "wait_seconds": 0.0}
+        self._workers = [threading.Thread(target=self._work, name=f"capture-worker-{i + 1}", daemon=True)
+                         for i in range(max(1, workers))]
+        for worker in self._workers:
+            worker.start()
+
+    def depth(self):
+        """Photos waiting for a worker"""
+        return self._queue.qsize()
+
+    def submit(self, file_path):
         """
-        Process a new iris photo through the full pipeline.
+        Queue a photo for processing. Blocks while the queue is full.
+
+        Args:
+            file_path: Path of the new photo
+
+        Returns:
+            True if queued, False if ignored (not an image, duplicate, or shutting down)
         """
         file_path = Path(file_path)
-        
+
         # Check if it's an image file we care about
         if not any(file_path.name.lower().endswith(ext) for ext in ['.jpg', '.jpeg', '.png']):
-            return
-        
+            return False
+
         # Avoid processing the same file twice
-        if str(file_path) in self.processed_files:
-            return
-        
+        with self._lock:
+            if not self._accepting or str(file_path) in self._seen:
+                return False
+            self._seen.add(str(file_path))
+
+        if self._queue.full():
+            print(f"⚠️  Queue full ({self._queue.maxsize} photos waiting): {file_path.name} waits for a free slot")
+        self._queue.put((file_path, time.monotonic()))
+
+        depth = self.depth()
+        with self._lock:
+            self.stats["queued"] += 1
+            self.stats["max_depth"] = max(self.stats["max_depth"], depth)
+        print(f"📥 Queued {file_path.name} (queue depth {depth}/{self._queue.maxsize})")
+        return True
+
+    def _work(self):
+        while True:
+            try:
+                item = self._queue.get(timeout=0.2)
+            except queue.Empty:
+                if self._stopped.is_set():
+                    return
+                continue
+            try:
+                if self._stopped.is_set():
+                    return
+                with self._lock:
+                    self._in_flight += 1
+                try:
+                    self._process_one(*item)
+                finally:
+                    with self._lock:
+                        self._in_flight -= 1
+            finally:
+                self._queue.task_done()
+
+    def _process_one(self, file_path, queued_at):
+        """Run the pipeline on one photo (worker thread)"""
+        waited = time.monotonic() - queued_at
+
         # Wait a moment for file to be fully written
-        time.sleep(0.5)
-        
-        if not file_path.exists():
+        time.sleep(self.settle_seconds)
+
+        if self._stopped.is_set() or not file_path.exists():
+            with self._lock:
+                self._seen.discard(str(file_path))
             return
-        
-        print(f"\n📸 New photo detected: {file_path.name}")
+
+        print(f"\n📸 New photo detected: {file_path.name} "
+              f"[{threading.current_thread().name}, waited {waited:.1f}s, {self.depth()} more queued]")
         print("Starting processing pipeline...")
-        
+
         try:
-            # Step 1: Process iris (crop)
-            processed_path = process_iris_photo(file_path)
-            
-            # Step 2: Compute FFT
-            fft_path, fft_spectrum = process_iris_fft(processed_path)
-            
-            # Step 3: Generate latent code
-            latent_code, features, seed = generate_latent_code(processed_path, fft_spectrum)
-            
-            # Step 4: Save latent code
-            save_latent_code(latent_code, features, seed)
-            
-            print(f"✅ Processing complete!")
-            print(f"   Latent code: {latent_code}")
-            
-            # Mark as processed
-            self.processed_files.add(str(file_path))
-            
+            # Crop, FFT, latent code and analysis on a single decode of the photo
+            result = self._process(file_path)
+
+            print(f"✅ Processing complete: {file_path.name}")
+            print(f"   Latent code: {result['latent_code']}")
+            with self._lock:
+                self.stats["processed"] += 1
+                self.stats["wait_seconds"] += waited
+
         except Exception as e:
             print(f"❌ Error processing {file_path.name}: {e}")
             import traceback
             traceback.print_exc()
+            with self._lock:
+                self.stats["failed"] += 1
+                self._seen.discard(str(file_path))  # A later event may retry it
+
+    def stop(self):
+        """
+        Stop now: drop the queued photos and tell the workers to exit.
+        Workers do not start another photo; the ones being processed are
+        abandoned (their worker exits when the pipeline returns, or with the process).
 
+        Returns:
+            Tuple of (queued photos dropped, photos being processed)
+        """
+        with self._lock:
+            self._accepting = False
+            in_flight = self._in_flight
+        self._stopped.set()
+
+        dropped = 0
+        while True:
+            try:
+                self._queue.get_nowait()
+            except queue.Empty:
+                break
+            self._queue.task_done()
+            dropped += 1
+        return dropped, in_flight
+
+    def drain(self):
+        """
+        Stop accepting photos, finish everything queued and stop the workers.
+
+        Returns:
+            Number of photos left unprocessed (0 unless interrupted)
+        """
+        with self._lock:
+            self._accepting = False
+        try:
+            if self.depth():
+                print(f"⏳ Finishing {self.depth()} queued photo(s)... (Ctrl+C again to stop now)")
+            self._queue.join()
+        except KeyboardInterrupt:
+            dropped, in_flight = self.stop()
+            print(f"\n⚠️  Stopped: {dropped} queued photo(s) left unprocessed (they stay in {INCOMING_DIR.name}/)")
+            if in_flight:
+                print(f"   {in_flight} photo(s) being processed were abandoned; "
+                      f"their files may be incomplete, reprocess them")
+            return dropped + in_flight
 
-def start_watching():
+        self._stopped.set()
+        for worker in self._workers:
+            worker.join()
+        return 0
+
+
+class IrisPhotoHandler(FileSystemEventHandler):
+    """
+    Handles new file events in the incoming folder.
+    Only queues new photos; the CaptureQueue workers run the processing pipeline.
+    """
+
+    def __init__(self, captures):
+        self.captures = captures
+
+    def on_created(self, event):
+        """Called when a new file is created"""
+        if not event.is_directory:
+            self.captures.submit(event.src_path)
+
+    def on_moved(self, event):
+        """Called when a file is moved (e.g., camera saves to folder)"""
+        if not event.is_directory:
+            self.captures.submit(event.dest_path)
+
+
+def print_queue_stats(stats):
+    """Print what the capture workers did"""
+    print("\nCapture queue:")
+    print(f"  {stats['processed']} processed, {stats['failed']} failed, "
+          f"max queue depth {stats['max_depth']}")
+    if stats["processed"]:
+        print(f"  Average wait before processing: {stats['wait_seconds'] / stats['processed']:.1f}s")
+
+
+def start_watching(workers=WATCH_WORKERS, queue_size=WATCH_QUEUE_SIZE):
     """
     Start watching the incoming folder for new photos.
     """
     print(f"👀 Watching folder: {INCOMING_DIR}")
     print("   Waiting for new iris photos...")
     print("   (Place test images in data/incoming/ to test)")
+    print(f"   {workers} worker(s), queue of {queue_size}")
     print("   Press Ctrl+C to stop\n")
-    
-    event_handler = IrisPhotoHandler()
+
+    captures = CaptureQueue(workers, queue_size)
+    event_handler = IrisPhotoHandler(captures)
     observer = Observer()
     observer.schedule(event_handler, str(INCOMING_DIR), recursive=False)
     observer.start()
-    
+
     try:
         while True:
             time.sleep(1)
     except KeyboardInterrupt:
         observer.stop()
         print("\n👋 Stopped watching folder")
-    
+
     observer.join()
+    captures.drain()
+    flush()
+    print_queue_stats(captures.stats)
+    print_strategy_stats(get_strategy_stats())
 
 
 if __name__ == "__main__":
     start_watching()
-
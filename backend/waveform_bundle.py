@@ -0,0 +1,205 @@
+"""
+IRIS#1 - Digital Biometrics
+Packed binary bundle of every iris waveform (data/waveforms.bin), so a screen
+loads all waveforms (and their detection confidence) in one request instead of
+one analysis_iris-XXX.json each.
+
+Layout (little-endian):
+
+    magic       4 bytes   b"IRWF"
+    version     uint32    2
+    count       uint32    N irises
+    length      uint32    L floats per waveform (64)
+    ids         N x 16    ASCII iris IDs, NUL-padded, sorted
+    data        N x L     float32, row i belongs to ids[i]
+    confidence  N         float32 confidence of ids[i] (NaN = not recorded)
+
+The data block starts at 16 + 16 * N, a multiple of 4, so the frontend reads it
+straight into a Float32Array (frontend/waveform_bundle.js). analyze_iris updates
+the bundle row of the iris it analyzed; a missing or version 1 bundle is rebuilt
+from the analysis files:
+
+    python -m backend.waveform_bundle show
+    python -m backend.waveform_bundle rebuild
+"""
+
+import argparse
+import bisect
+import json
+import struct
+import numpy as np
+from pathlib import Path
+from backend.artifact_writer import atomic_write_bytes
+from backend.config import PROCESSED_DIR, WAVEFORMS_PATH, WAVEFORM_LENGTH
+from backend.locking import file_lock
+
+MAGIC = b"IRWF"
+VERSION = 2
+HEADER = struct.Struct("<4sIII")
+ID_BYTES = 16
+
+
+def encode_bundle(ids, waveforms, confidences=None):
+    """
+    Pack IDs, waveforms and confidences into the bundle format.
+
+    Args:
+        ids: Sorted list of iris IDs
+        waveforms: float32 array of shape (len(ids), length)
+        confidences: One confidence per ID, NaN if unknown (None = all unknown)
+
+    Returns:
+        bytes
+    """
+    waveforms = np.asarray(waveforms, dtype="<f4")
+    count, length = waveforms.shape
+    if confidences is None:
+        confidences = np.full(count, np.nan)
+    confidences = np.asarray(confidences, dtype="<f4").reshape(count)
+    id_block = b"".join(iris_id.encode("ascii")[:ID_BYTES].ljust(ID_BYTES, b"\0") for iris_id in ids)
+    return HEADER.pack(MAGIC, VERSION, count, length) + id_block + waveforms.tobytes() + confidences.tobytes()
+
+
+def decode_bundle(data):
+    """
+    Unpack a bundle.
+
+    Returns:
+        Tuple of (ids, waveforms, confidences): waveforms is a float32 array of
+        shape (N, length), confidences a float32 array of N (NaN = unknown)
+
+    Raises:
+        ValueError: Not a version 2 waveform bundle, or truncated
+    """
+    if len(data) < HEADER.size:
+        raise ValueError("waveform bundle is truncated")
+    magic, version, count, length = HEADER.unpack_from(data)
+    if magic != MAGIC or version != VERSION:
+        raise ValueError(f"not a version {VERSION} waveform bundle")
+    offset = HEADER.size + count * ID_BYTES
+    if len(data) < offset + count * (length + 1) * 4:
+        raise ValueError("waveform bundle is truncated")
+
+    ids = [data[HEADER.size + i * ID_BYTES:HEADER.size + (i + 1) * ID_BYTES].rstrip(b"\0").decode("ascii")
+           for i in range(count)]
+    waveforms = np.frombuffer(data, dtype="<f4", count=count * length, offset=offset).reshape(count, length)
+    confidences = np.frombuffer(data, dtype="<f4", count=count, offset=offset + count * length * 4)
+    return ids, waveforms, confidences
+
+
+def read_bundle(path=WAVEFORMS_PATH, length=WAVEFORM_LENGTH):
+    """
+    Read the bundle file.
+
+    Returns:
+        Tuple of (ids, waveforms, confidences); empty if the file does not exist
+    """
+    try:
+        data = Path(path).read_bytes()
+    except FileNotFoundError:
+        return [], np.zeros((0, length), dtype=np.float32), np.zeros(0, dtype=np.float32)
+    return decode_bundle(data)
+
+
+def scan_analysis_files(analysis_dir=PROCESSED_DIR, length=WAVEFORM_LENGTH):
+    """
+    Collect waveforms and confidences from analysis_iris-XXX.json files (full scan, for rebuilds).
+
+    Returns:
+        Tuple of (ids, waveforms, confidences), sorted by ID
+    """
+    rows = {}
+    for path in sorted(Path(analysis_dir).glob("analysis_*.json")):
+        try:
+            with open(path, 'r') as f:
+                analysis = json.load(f)
+        except (ValueError, OSError) as e:
+            print(f"⚠️  Could not read {path.name}: {e}")
+            continue
+        waveform = analysis.get("waveform")
+        if waveform is None or len(waveform) != length:
+            continue
+        confidence = analysis.get("confidence")
+        rows[path.stem.replace("analysis_", "", 1)] = (waveform, np.nan if confidence is None else confidence)
+
+    ids = sorted(rows)
+    waveforms = np.array([rows[i][0] for i in ids], dtype=np.float32).reshape(len(ids), length)
+    confidences = np.array([rows[i][1] for i in ids], dtype=np.float32)
+    return ids, waveforms, confidences
+
+
+def _lock_path(path):
+    return Path(path).with_suffix(".lock")
+
+
+def rebuild(path=WAVEFORMS_PATH, analysis_dir=PROCESSED_DIR):
+    """
+    Rewrite the bundle from the analysis files.
+
+    Returns:
+        Number of waveforms in the bundle
+    """
+    with file_lock(_lock_path(path)):
+        ids, waveforms, confidences = scan_analysis_files(analysis_dir)
+        atomic_write_bytes(path, encode_bundle(ids, waveforms, confidences))
+    return len(ids)
+
+
+def update_waveform(iris_id, waveform, confidence=None, path=WAVEFORMS_PATH, analysis_dir=PROCESSED_DIR):
+    """
+    Insert or replace one iris's waveform and confidence in the bundle.
+
+    Args:
+        iris_id: Iris ID (e.g. "iris-001")
+        waveform: Sequence of WAVEFORM_LENGTH floats
+        confidence: Pupil detection confidence (None = unknown)
+        path: Bundle path
+        analysis_dir: Where analysis files are found if the bundle has to be rebuilt
+    """
+    row = np.asarray(waveform, dtype=np.float32)
+    if row.shape != (WAVEFORM_LENGTH,):
+        raise ValueError(f"waveform has {row.size} points, the bundle holds {WAVEFORM_LENGTH}")
+
+    confidence = np.nan if confidence is None else confidence
+
+    with file_lock(_lock_path(path)):
+        try:
+            ids, waveforms, confidences = decode_bundle(Path(path).read_bytes())
+        except (FileNotFoundError, ValueError):
+            # First waveform, or an old/damaged bundle: include every iris analyzed so far
+            ids, waveforms, confidences = scan_analysis_files(analysis_dir)
+        ids = list(ids)
+
+        position = bisect.bisect_left(ids, iris_id)
+        if position < len(ids) and ids[position] == iris_id:
+            waveforms = waveforms.copy()
+            waveforms[position] = row
+            confidences = confidences.copy()
+            confidences[position] = confidence
+        else:
+            ids.insert(position, iris_id)
+            waveforms = np.insert(waveforms, position, row, axis=0)
+            confidences = np.insert(confidences, position, confidence)
+
+        atomic_write_bytes(path, encode_bundle(ids, waveforms, confidences))
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Inspect or rebuild the packed waveform bundle.")
+    parser.add_argument("command", choices=["show", "rebuild"])
+    args = parser.parse_args(argv)
+
+    if args.command == "rebuild":
+        count = rebuild()
+        print(f"✓ Rebuilt {WAVEFORMS_PATH.name}: {count} waveforms")
+        return
+
+    ids, waveforms, confidences = read_bundle()
+    print(f"{WAVEFORMS_PATH.name}: {len(ids)} waveforms x {waveforms.shape[1]} floats")
+    for iris_id, waveform, confidence in zip(ids, waveforms, confidences):
+        confidence = "n/a" if np.isnan(confidence) else f"{confidence:.2f}"
+        print(f"  {iris_id:<12} {waveform.min():.3f} - {waveform.max():.3f}  confidence {confidence}")
+
+
+if __name__ == "__main__":
+    main()
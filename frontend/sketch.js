@@ -18,6 +18,16 @@ const CODES_INDEX_URLS = [
     'data/codes_index.json'          // Same directory (fallback)
 ];
 let currentUrlIndex = 0;
+// Delta polling (start_server.py): only codes added after codesCursor are downloaded
+const CODES_API_URL = '/api/codes';
+let codesApiAvailable = true;
+let codesCursor = 0;
+let codesById = new Map();
+let codesRequestPending = false;
+// Push channel (start_server.py /api/events): new codes arrive without polling
+const CODES_EVENTS_URL = '/api/events';
+let codesEvents = null;
+let codesEventsConnected = false;
 
 // For generating random test codes (fallback)
 let currentCodeIndex = 0;
@@ -36,8 +46,9 @@ function setup() {
         console.error("✗ Error initializing:", e);
     }
     
-    // Load codes from backend
+    // Load codes from backend, then subscribe to new ones
     loadCodesFromBackend();
+    subscribeToCodeEvents();
     
     lastFrameTime = millis();
     codesLoadTime = millis();
@@ -47,9 +58,101 @@ function setup() {
 }
 
 /**
- * Load latent codes from backend JSON index file
+ * Load latent codes from backend.
+ * Uses the delta API when available, the full JSON index file otherwise.
  */
 function loadCodesFromBackend() {
+    if (!codesApiAvailable) {
+        loadCodesFromIndex();
+        return;
+    }
+    if (codesRequestPending) {
+        return;
+    }
+    
+    codesRequestPending = true;
+    codesLoadTime = millis();
+    fetch(`${CODES_API_URL}?since=${codesCursor}`)
+        .then(response => {
+            if (!response.ok) {
+                throw new Error(`HTTP ${response.status}`);
+            }
+            return response.json();
+        })
+        .then(data => {
+            applyCodesDelta(data);
+            codesRequestPending = false;
+        })
+        .catch(error => {
+            // e.g. Live Server without the API: fall back to the static index
+            console.warn(`⚠ Codes API unavailable (${error.message}), using codes_index.json`);
+            codesApiAvailable = false;
+            codesRequestPending = false;
+            loadCodesFromIndex();
+        });
+}
+
+/**
+ * Subscribe to the Server-Sent Events stream of new codes.
+ * While connected, the periodic poll is skipped; EventSource reconnects on its
+ * own and the server replays missed events (Last-Event-ID).
+ */
+function subscribeToCodeEvents() {
+    if (typeof EventSource === 'undefined') {
+        return;
+    }
+    
+    codesEvents = new EventSource(CODES_EVENTS_URL);
+    
+    codesEvents.onopen = () => {
+        codesEventsConnected = true;
+        console.log("✓ Subscribed to new codes");
+    };
+    
+    codesEvents.onerror = () => {
+        // Fall back to polling until the stream is back
+        codesEventsConnected = false;
+    };
+    
+    codesEvents.addEventListener('code', (event) => {
+        const item = JSON.parse(event.data);
+        codesById.set(item.id, item.code);
+        const ids = [...codesById.keys()].sort();
+        loadedCodes = ids.map(id => codesById.get(id));
+        stateMachine.digitalIrises = [...loadedCodes];
+        console.log(`✓ New Digital Iris pushed: ${item.id}`);
+    });
+    
+    // Index rebuilt (e.g. batch run): fetch what changed
+    codesEvents.addEventListener('index', () => {
+        loadCodesFromBackend();
+    });
+}
+
+/**
+ * Merge a delta from /api/codes into the loaded codes (entries replace by id)
+ */
+function applyCodesDelta(data) {
+    if (data.reset) {
+        codesById.clear();
+    }
+    for (const item of data.codes) {
+        codesById.set(item.id, item.code);
+    }
+    codesCursor = data.cursor;
+    
+    if (data.codes.length > 0 || data.reset || loadedCodes.length === 0) {
+        const ids = [...codesById.keys()].sort();
+        loadedCodes = ids.map(id => codesById.get(id));
+        stateMachine.digitalIrises = [...loadedCodes];
+        console.log(`✓ ${data.codes.length} new Digital Irises from backend (${loadedCodes.length} total)`);
+    }
+}
+
+/**
+ * Load latent codes from backend JSON index file
+ */
+function loadCodesFromIndex() {
     if (currentUrlIndex >= CODES_INDEX_URLS.length) {
         console.warn("⚠ All code index URLs failed, using fallback");
         useFallbackCodes();
@@ -68,7 +171,7 @@ function loadCodesFromBackend() {
         } else {
             console.warn(`⚠ Could not parse codes index from ${url}, trying next...`);
             currentUrlIndex++;
-            loadCodesFromBackend(); // Try next URL
+            loadCodesFromIndex(); // Try next URL
         }
     }, function(error) {
         console.warn(`⚠ Could not load codes from ${url}, trying next...`);
@@ -77,7 +180,7 @@ function loadCodesFromBackend() {
             console.log("All URLs failed, using fallback codes");
             useFallbackCodes();
         } else {
-            loadCodesFromBackend(); // Try next URL
+            loadCodesFromIndex(); // Try next URL
         }
     });
 }
@@ -113,9 +216,9 @@ function draw() {
         console.log(`draw: Frame ${frameCount}, State: ${stateMachine.getState()}, Irises: ${stateMachine.getDigitalIrises().length}`);
     }
     
-    // Auto-refresh codes from backend periodically
+    // Auto-refresh codes from backend periodically (not needed while events are pushed)
     const currentTime = millis();
-    if (currentTime - codesLoadTime > CODES_REFRESH_INTERVAL) {
+    if (!codesEventsConnected && currentTime - codesLoadTime > CODES_REFRESH_INTERVAL) {
         loadCodesFromBackend();
     }
     
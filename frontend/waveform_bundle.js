@@ -0,0 +1,76 @@
+/**
+ * IRIS#1 - Digital Biometrics
+ * Loader for data/waveforms.bin: every iris waveform and confidence in one request.
+ * Layout (little-endian): "IRWF", version, count, length (uint32 each),
+ * count x 16-byte ASCII iris IDs, a count x length float32 block, then
+ * count float32 confidences (NaN = not recorded).
+ */
+
+const WAVEFORM_BUNDLE_URL = '/data/waveforms.bin';
+
+/**
+ * Parse a waveform bundle.
+ * The float block is viewed in place (no copy); each waveform is a subarray of it.
+ *
+ * @param {ArrayBuffer} buffer - Contents of waveforms.bin
+ * @returns {{ids: string[], length: number, data: Float32Array, confidences: Float32Array,
+ *            get: function(string): (Float32Array|null), confidence: function(string): (number|null)}}
+ */
+function parseWaveformBundle(buffer) {
+    const view = new DataView(buffer);
+    const magic = String.fromCharCode(...new Uint8Array(buffer, 0, 4));
+    if (magic !== 'IRWF' || view.getUint32(4, true) !== 2) {
+        throw new Error('Not a version 2 waveform bundle');
+    }
+    const count = view.getUint32(8, true);
+    const length = view.getUint32(12, true);
+
+    const decoder = new TextDecoder('ascii');
+    const ids = [];
+    const rows = new Map();
+    for (let i = 0; i < count; i++) {
+        const raw = new Uint8Array(buffer, 16 + i * 16, 16);
+        const end = raw.indexOf(0);
+        const id = decoder.decode(end === -1 ? raw : raw.subarray(0, end));
+        ids.push(id);
+        rows.set(id, i);
+    }
+
+    const data = new Float32Array(buffer, 16 + count * 16, count * length);
+    const confidences = new Float32Array(buffer, 16 + count * 16 + count * length * 4, count);
+    return {
+        ids,
+        length,
+        data,
+        confidences,
+        get(id) {
+            const row = rows.get(id);
+            return row === undefined ? null : data.subarray(row * length, (row + 1) * length);
+        },
+        confidence(id) {
+            const row = rows.get(id);
+            return row === undefined || Number.isNaN(confidences[row]) ? null : confidences[row];
+        }
+    };
+}
+
+/**
+ * Fetch and parse the waveform bundle.
+ *
+ * @param {string} url - Bundle URL
+ * @returns {Promise<object|null>} Parsed bundle, or null if unavailable
+ */
+async function loadWaveformBundle(url = WAVEFORM_BUNDLE_URL) {
+    try {
+        const response = await fetch(url);
+        if (!response.ok) {
+            throw new Error(`HTTP ${response.status}`);
+        }
+        const bundle = parseWaveformBundle(await response.arrayBuffer());
+        console.log(`✓ Loaded ${bundle.ids.length} waveforms in one request`);
+        return bundle;
+    } catch (error) {
+        console.warn(`⚠ Waveform bundle unavailable (${error.message}), using analysis files`);
+        return null;
+    }
+}
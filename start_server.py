@@ -3,12 +3,39 @@
 IRIS#1 - Digital Biometrics
 Simple HTTP server to serve frontend and data files.
 This allows the frontend to load codes_index.json via HTTP.
+
+Connections are served concurrently (bounded thread pool, HTTP/1.1 keep-alive):
+
+    python start_server.py [--port 8000] [--max-connections 64] [--keepalive-timeout 15] [--legacy]
+
+Files are served with ETag / Last-Modified, so unchanged files cost a 304, and
+with Range support (206). Files revalidate on every use (Cache-Control: no-cache),
+since artifacts such as iris-001.jpg are rewritten in place when a capture is
+reprocessed.
+JSON is sent from the backend's precompressed .json.gz copy to clients that accept gzip.
+Images can be requested at a smaller width, resized once and cached on disk:
+
+    GET /data/processed/iris-001.jpg?w=256
+
+Displays poll only what is new, or get it pushed:
+
+    GET /api/codes?since=<cursor>   -> {"cursor": ..., "codes": [entries with seq > cursor], ...}
+    GET /api/events                 -> Server-Sent Events stream of new codes (tails data/events.log)
 """
 
+import argparse
 import http.server
 import socketserver
+import json
 import os
+import threading
+import time
+from collections import OrderedDict
+from email.utils import formatdate, parsedate_to_datetime
 from pathlib import Path
+from urllib.parse import urlsplit, parse_qs
+from backend.events import read_events, end_offset
+from backend.resize_cache import RESIZABLE_SUFFIXES, get_resized, parse_width
 
 # Get project root
 PROJECT_ROOT = Path(__file__).parent
@@ -16,6 +43,192 @@ FRONTEND_DIR = PROJECT_ROOT / "frontend"
 DATA_DIR = PROJECT_ROOT / "data"
 
 PORT = 8000
+CODES_INDEX_PATH = DATA_DIR / "codes_index.json"
+EVENTS_LOG_PATH = DATA_DIR / "events.log"
+EVENTS_POLL_INTERVAL = 0.2  # Seconds between checks of the event log
+EVENTS_HEARTBEAT = 15  # Seconds between keep-alive comments on an idle stream
+MAX_CONNECTIONS = 64  # Concurrent connections (each display holds one for its event stream)
+KEEPALIVE_TIMEOUT = 15  # Seconds an idle keep-alive connection keeps its slot
+LISTEN_BACKLOG = 128  # Connections waiting while every slot is busy
+MAX_EVENT_STREAMS = 48  # Open event streams; the remaining slots stay free for polls and downloads
+HOT_FILE_CACHE_BYTES = 4 * 1024 * 1024  # In-memory LRU budget for frontend files
+HOT_FILE_MAX_BYTES = 512 * 1024  # Larger files are always streamed from disk
+HOT_FILE_SUFFIXES = {'.html', '.js', '.css'}
+CACHE_CONTROL = 'no-cache'  # Artifacts are rewritten in place: always revalidate (ETag -> 304)
+CONTENT_TYPES = {
+    '.html': 'text/html',
+    '.js': 'application/javascript',
+    '.json': 'application/json',
+    '.css': 'text/css',
+    '.jpg': 'image/jpeg',
+    '.jpeg': 'image/jpeg',
+    '.png': 'image/png',
+    '.webp': 'image/webp',
+    '.txt': 'text/plain; charset=utf-8',
+}
+
+# Parsed codes index, reused until the file changes
+_index_cache = {"key": None, "index": None}
+
+
+def file_etag(stat):
+    """Validator for a file version: changes whenever the file is replaced or rewritten"""
+    return f'"{stat.st_mtime_ns:x}-{stat.st_size:x}"'
+
+
+def load_codes_index():
+    """
+    Read codes_index.json, parsing it again only when it has changed on disk.
+    
+    Returns:
+        Index dictionary (empty index if the file does not exist yet)
+    """
+    try:
+        stat = CODES_INDEX_PATH.stat()
+    except FileNotFoundError:
+        return {"cursor": 0, "count": 0, "codes": []}
+    
+    key = (stat.st_mtime_ns, stat.st_size)
+    if _index_cache["key"] != key:
+        with open(CODES_INDEX_PATH, 'r') as f:
+            index = json.load(f)
+        # Indexes written before cursors existed: number entries in file order
+        if "cursor" not in index:
+            for seq, code in enumerate(index.get("codes", []), start=1):
+                code.setdefault("seq", seq)
+            index["cursor"] = len(index.get("codes", []))
+        _index_cache["key"] = key
+        _index_cache["index"] = index
+    return _index_cache["index"]
+
+
+def codes_since(index, since):
+    """
+    Delta of the codes index after a cursor.
+    
+    Args:
+        index: Codes index dictionary
+        since: Cursor the client already has (0 = everything)
+    
+    Returns:
+        Response dictionary: cursor, count, reset and the new/changed codes in seq order.
+        reset is True when the client's cursor is ahead of the index (index rebuilt
+        from scratch); the client then replaces its list with the codes returned.
+    """
+    cursor = index.get("cursor", 0)
+    reset = since > cursor
+    if reset:
+        since = 0
+    codes = sorted((c for c in index.get("codes", []) if c.get("seq", 0) > since),
+                   key=lambda c: c["seq"])
+    return {"cursor": cursor, "count": index.get("count", len(index.get("codes", []))),
+            "reset": reset, "codes": codes}
+
+
+def parse_range(header, size):
+    """
+    Parse a single-range Range header ("bytes=0-499", "bytes=500-", "bytes=-500").
+    
+    Args:
+        header: Range header value
+        size: File size in bytes
+    
+    Returns:
+        (start, end) inclusive byte positions, or None to send the whole file
+        (other units, multiple ranges, malformed headers)
+    
+    Raises:
+        ValueError: The range lies outside the file (416)
+    """
+    unit, _, spec = header.partition('=')
+    if unit.strip().lower() != 'bytes' or ',' in spec:
+        return None
+    first, dash, last = spec.strip().partition('-')
+    try:
+        start = int(first) if first else None
+        end = int(last) if last else None
+    except ValueError:
+        return None
+    if not dash or (start is None and end is None) or (start is not None and start < 0):
+        return None
+    
+    if start is None:
+        # Suffix range: the last N bytes
+        if end <= 0 or size == 0:
+            raise ValueError("unsatisfiable suffix range")
+        return max(0, size - end), size - 1
+    if end is not None and end < start:
+        return None
+    if start >= size:
+        raise ValueError("range starts after the end of the file")
+    return start, size - 1 if end is None else min(end, size - 1)
+
+
+def accepts_gzip(accept_encoding):
+    """True if an Accept-Encoding header allows gzip (and does not set q=0 for it)"""
+    for part in accept_encoding.split(','):
+        coding, _, params = part.strip().partition(';')
+        if coding.strip().lower() in ('gzip', '*'):
+            q = params.strip().replace(' ', '')
+            return q not in ('q=0', 'q=0.0', 'q=0.00', 'q=0.000')
+    return False
+
+
+def precompressed_copy(file_path):
+    """
+    The backend's .gz copy of a JSON file, if it is at least as new as the file.
+    The copy is written after the JSON, so an older copy is one still being replaced.
+    """
+    compressed = file_path.with_name(file_path.name + '.gz')
+    try:
+        if compressed.stat().st_mtime_ns >= file_path.stat().st_mtime_ns:
+            return compressed
+    except FileNotFoundError:
+        pass
+    return None
+
+
+class HotFileCache:
+    """
+    Small thread-safe LRU of file contents, keyed by path and validated by ETag,
+    for the frontend files every screen requests (HTML, JS, CSS).
+    """
+    
+    def __init__(self, max_bytes=HOT_FILE_CACHE_BYTES):
+        self.max_bytes = max_bytes
+        self._entries = OrderedDict()  # path -> (etag, content)
+        self._bytes = 0
+        self._lock = threading.Lock()
+    
+    def get(self, path, etag):
+        """Cached content of `path`, or None if missing or stale"""
+        with self._lock:
+            entry = self._entries.get(path)
+            if entry is None or entry[0] != etag:
+                return None
+            self._entries.move_to_end(path)
+            return entry[1]
+    
+    def put(self, path, etag, content):
+        """Cache content, evicting least recently used files over the size budget"""
+        with self._lock:
+            old = self._entries.pop(path, None)
+            if old is not None:
+                self._bytes -= len(old[1])
+            self._entries[path] = (etag, content)
+            self._bytes += len(content)
+            while self._bytes > self.max_bytes and self._entries:
+                _, (_, evicted) = self._entries.popitem(last=False)
+                self._bytes -= len(evicted)
+
+
+HOT_FILES = HotFileCache()
+
+
+def is_hot_file(file_path, size):
+    """Small frontend files served from memory"""
+    return file_path.suffix.lower() in HOT_FILE_SUFFIXES and size <= HOT_FILE_MAX_BYTES
+
 
 class CustomHTTPRequestHandler(http.server.SimpleHTTPRequestHandler):
     """Custom handler to serve files from multiple directories"""
@@ -32,11 +245,23 @@ class CustomHTTPRequestHandler(http.server.SimpleHTTPRequestHandler):
         # Parse the path
         path = self.path.split('?')[0]  # Remove query string
         
+        if path == '/api/codes':
+            self.serve_codes_delta()
+            return
+        
+        if path == '/api/events':
+            self.serve_events()
+            return
+        
         # Route /data/ requests to data directory
         if path.startswith('/data/'):
             file_path = DATA_DIR / path[6:]  # Remove '/data/' prefix
             if file_path.exists() and file_path.is_file():
-                self.serve_file(file_path)
+                width = parse_qs(urlsplit(self.path).query).get('w')
+                if width and file_path.suffix.lower() in RESIZABLE_SUFFIXES:
+                    self.serve_resized(file_path, width[0])
+                else:
+                    self.serve_file(file_path)
                 return
         
         # Route root and /frontend/ to frontend directory
@@ -56,48 +281,320 @@ class CustomHTTPRequestHandler(http.server.SimpleHTTPRequestHandler):
         # Default: serve from current directory
         super().do_GET()
     
-    def serve_file(self, file_path):
-        """Serve a file with appropriate content type"""
+    def serve_codes_delta(self):
+        """GET /api/codes?since=<cursor>: only the codes added or changed after the cursor"""
+        query = parse_qs(urlsplit(self.path).query)
+        try:
+            since = int(query.get('since', ['0'])[0])
+        except ValueError:
+            self.send_error(400, "since must be an integer cursor")
+            return
+        
         try:
-            with open(file_path, 'rb') as f:
-                content = f.read()
-            
-            # Determine content type
-            content_type = 'application/octet-stream'
-            if file_path.suffix == '.html':
-                content_type = 'text/html'
-            elif file_path.suffix == '.js':
-                content_type = 'application/javascript'
-            elif file_path.suffix == '.json':
-                content_type = 'application/json'
-            elif file_path.suffix == '.css':
-                content_type = 'text/css'
-            elif file_path.suffix == '.jpg' or file_path.suffix == '.jpeg':
-                content_type = 'image/jpeg'
-            elif file_path.suffix == '.png':
-                content_type = 'image/png'
-            
-            self.send_response(200)
-            self.send_header('Content-Type', content_type)
-            self.send_header('Content-Length', len(content))
+            body = json.dumps(codes_since(load_codes_index(), since), separators=(',', ':')).encode('utf-8')
+        except Exception as e:
+            self.send_error(500, f"Error reading codes index: {e}")
+            return
+        
+        self.send_response(200)
+        self.send_header('Content-Type', 'application/json')
+        self.send_header('Content-Length', len(body))
+        self.send_header('Cache-Control', 'no-store')
+        self.end_headers()
+        self.wfile.write(body)
+    
+    def serve_events(self):
+        """
+        GET /api/events: Server-Sent Events stream tailing data/events.log.
+        A reconnecting EventSource sends Last-Event-ID (a log offset) and gets
+        every event it missed; new subscribers start at the end of the log.
+        """
+        # Streams hold their connection for good: past the cap the display polls instead
+        slots = getattr(self.server, 'event_stream_slots', None)
+        if slots is not None and not slots.acquire(blocking=False):
+            self.send_response(503)
+            self.send_header('Retry-After', '30')
+            self.send_header('Content-Length', '0')
             self.end_headers()
-            self.wfile.write(content)
+            return
+        try:
+            self.stream_events()
+        finally:
+            if slots is not None:
+                slots.release()
+    
+    def stream_events(self):
+        """Write the event stream until the client disconnects"""
+        last_event_id = self.headers.get('Last-Event-ID')
+        try:
+            offset = int(last_event_id) if last_event_id else end_offset(EVENTS_LOG_PATH)
+        except ValueError:
+            offset = end_offset(EVENTS_LOG_PATH)
+        
+        self.send_response(200)
+        self.send_header('Content-Type', 'text/event-stream')
+        self.send_header('Cache-Control', 'no-store')
+        self.send_header('X-Accel-Buffering', 'no')
+        # No Content-Length: the stream ends when the connection closes
+        self.send_header('Connection', 'close')
+        self.close_connection = True
+        self.end_headers()
+        
+        try:
+            self.wfile.write(b"retry: 2000\n\n")
+            self.wfile.flush()
+            last_write = time.monotonic()
+            while True:
+                events, offset = read_events(offset, EVENTS_LOG_PATH)
+                for event_id, event in events:
+                    payload = json.dumps(event.get("data", {}), separators=(',', ':'))
+                    message = f"id: {event_id}\nevent: {event.get('type', 'message')}\ndata: {payload}\n\n"
+                    self.wfile.write(message.encode('utf-8'))
+                if events:
+                    self.wfile.flush()
+                    last_write = time.monotonic()
+                elif time.monotonic() - last_write > EVENTS_HEARTBEAT:
+                    # Comment line: keeps proxies from closing the stream, detects gone clients
+                    self.wfile.write(b": ping\n\n")
+                    self.wfile.flush()
+                    last_write = time.monotonic()
+                time.sleep(EVENTS_POLL_INTERVAL)
+        except (BrokenPipeError, ConnectionResetError, TimeoutError):
+            pass  # Display disconnected
+    
+    def is_not_modified(self, etag, mtime):
+        """True if the client's cached copy (If-None-Match / If-Modified-Since) is current"""
+        if_none_match = self.headers.get('If-None-Match')
+        if if_none_match is not None:
+            return etag in [tag.strip() for tag in if_none_match.split(',')] or if_none_match.strip() == '*'
+        
+        if_modified_since = self.headers.get('If-Modified-Since')
+        if if_modified_since is not None:
+            try:
+                return int(mtime) <= parsedate_to_datetime(if_modified_since).timestamp()
+            except (TypeError, ValueError):
+                return False
+        return False
+    
+    def serve_resized(self, file_path, width):
+        """GET /data/<image>?w=<width>: the image scaled to `width` pixels wide, from the resize cache"""
+        try:
+            width = parse_width(width)
+        except ValueError as e:
+            self.send_error(400, f"Invalid width: {e}")
+            return
+        
+        try:
+            resized_path = get_resized(file_path, width)
         except Exception as e:
-            self.send_error(500, f"Error serving file: {e}")
+            self.send_error(500, f"Error resizing image: {e}")
+            return
+        self.serve_file(resized_path)
+    
+    def send_vary(self, file_path):
+        """JSON has a gzip variant: caches must key on Accept-Encoding"""
+        if file_path.suffix == '.json':
+            self.send_header('Vary', 'Accept-Encoding')
+    
+    def serve_file(self, file_path):
+        """
+        Serve a file: conditional (304), Range (206/416) and caching headers.
+        Large files are streamed with sendfile, so memory stays flat however many
+        screens download full-resolution images; small frontend files come from
+        an in-memory LRU.
+        """
+        # JSON: send the precompressed copy written by the backend when the client takes gzip
+        content_encoding = None
+        source_path = file_path
+        if file_path.suffix == '.json' and accepts_gzip(self.headers.get('Accept-Encoding', '')):
+            compressed = precompressed_copy(file_path)
+            if compressed is not None:
+                source_path = compressed
+                content_encoding = 'gzip'
+        
+        response_started = False  # Once the status line is out, an error can no longer become a 500
+        try:
+            with open(source_path, 'rb') as f:
+                # Validators from the open file, so they always describe the bytes sent
+                stat = os.fstat(f.fileno())
+                etag = file_etag(stat)
+                last_modified = formatdate(stat.st_mtime, usegmt=True)
+                
+                # Conditional request: the client's copy is current
+                if self.is_not_modified(etag, stat.st_mtime):
+                    response_started = True
+                    self.send_response(304)
+                    self.send_header('ETag', etag)
+                    self.send_header('Last-Modified', last_modified)
+                    self.send_header('Cache-Control', CACHE_CONTROL)
+                    self.send_vary(file_path)
+                    self.end_headers()
+                    return
+                
+                size = stat.st_size
+                byte_range = None
+                range_header = self.headers.get('Range')
+                # If-Range: only a range of the version the client already has
+                if range_header and self.headers.get('If-Range', etag) in (etag, last_modified):
+                    try:
+                        byte_range = parse_range(range_header, size)
+                    except ValueError:
+                        response_started = True
+                        self.send_response(416)
+                        self.send_header('Content-Range', f'bytes */{size}')
+                        self.send_header('Content-Length', '0')
+                        self.end_headers()
+                        return
+                
+                content = None
+                if is_hot_file(source_path, size):
+                    content = HOT_FILES.get(source_path, etag)
+                    if content is None:
+                        content = f.read()
+                        HOT_FILES.put(source_path, etag, content)
+                
+                start, end = byte_range if byte_range else (0, size - 1)
+                length = end - start + 1 if size else 0
+                
+                response_started = True
+                self.send_response(206 if byte_range else 200)
+                self.send_header('Content-Type', CONTENT_TYPES.get(file_path.suffix.lower(), 'application/octet-stream'))
+                self.send_header('Content-Length', length)
+                if content_encoding:
+                    self.send_header('Content-Encoding', content_encoding)
+                self.send_vary(file_path)
+                if byte_range:
+                    self.send_header('Content-Range', f'bytes {start}-{end}/{size}')
+                self.send_header('Accept-Ranges', 'bytes')
+                self.send_header('ETag', etag)
+                self.send_header('Last-Modified', last_modified)
+                self.send_header('Cache-Control', CACHE_CONTROL)
+                self.end_headers()
+                
+                if content is not None:
+                    self.wfile.write(content[start:end + 1])
+                elif length:
+                    # Kernel copies file -> socket; falls back to send() where sendfile is unavailable
+                    self.connection.sendfile(f, start, length)
+        except (ConnectionError, TimeoutError):
+            self.close_connection = True  # Display went away mid-download (broken pipe, reset)
+        except Exception as e:
+            if not response_started:
+                self.send_error(500, f"Error serving file: {e}")
+                return
+            # Headers (and maybe part of the body) are out: the client only learns
+            # something went wrong from a short response, so drop the connection
+            self.log_error("Error serving %s after the response started: %s", file_path.name, e)
+            self.close_connection = True
+
+
+class IrisHTTPServer(socketserver.ThreadingMixIn, socketserver.TCPServer):
+    """
+    One thread per connection, at most `max_connections` at a time.
+    At the limit the server stops accepting: further connections wait in the
+    listen backlog instead of spawning unbounded threads. Idle keep-alive
+    connections give their slot back after the handler's timeout.
+    While waiting for a slot, shutdown() is checked every `slot_poll_interval`
+    seconds, so stopping the server (or Ctrl+C) never hangs at the limit.
+    """
+    daemon_threads = True
+    allow_reuse_address = True
+    slot_poll_interval = 0.5
+    
+    def __init__(self, server_address, handler_class, max_connections=MAX_CONNECTIONS,
+                 backlog=LISTEN_BACKLOG, max_event_streams=MAX_EVENT_STREAMS):
+        self.request_queue_size = backlog
+        self.max_connections = max_connections
+        self._slots = threading.BoundedSemaphore(max_connections)
+        self.event_stream_slots = threading.BoundedSemaphore(max(0, min(max_event_streams, max_connections - 1)))
+        self._stopping = threading.Event()
+        super().__init__(server_address, handler_class)
+    
+    def serve_forever(self, poll_interval=0.5):
+        self._stopping.clear()
+        super().serve_forever(poll_interval)
+    
+    def shutdown(self):
+        # Set first: serve_forever may be blocked in process_request waiting for a slot
+        self._stopping.set()
+        super().shutdown()
+    
+    def process_request(self, request, client_address):
+        while not self._slots.acquire(timeout=self.slot_poll_interval):
+            if self._stopping.is_set():
+                self.shutdown_request(request)
+                return
+        try:
+            super().process_request(request, client_address)
+        except BaseException:
+            self._slots.release()
+            raise
+    
+    def process_request_thread(self, request, client_address):
+        try:
+            super().process_request_thread(request, client_address)
+        finally:
+            self._slots.release()
+
+
+class LegacyHTTPServer(socketserver.TCPServer):
+    """The original server: one request at a time, one connection per request"""
+    allow_reuse_address = True
+    # An event stream would block every other request: displays poll instead
+    event_stream_slots = threading.Semaphore(0)
+
 
-def start_server():
+def make_server(port=PORT, legacy=False, max_connections=MAX_CONNECTIONS,
+                keepalive_timeout=KEEPALIVE_TIMEOUT, backlog=LISTEN_BACKLOG,
+                max_event_streams=MAX_EVENT_STREAMS):
+    """
+    Build the HTTP server (not started yet).
+    
+    Args:
+        port: Port to listen on (0 = any free port)
+        legacy: Single-threaded HTTP/1.0 server, as before
+        max_connections: Concurrent connections served (open event streams count)
+        keepalive_timeout: Seconds an idle keep-alive connection stays open
+        backlog: Listen backlog for connections waiting on a free slot
+        max_event_streams: Open /api/events streams (kept below max_connections)
+    
+    Returns:
+        socketserver.TCPServer instance
+    """
+    if legacy:
+        handler = type("LegacyRequestHandler", (CustomHTTPRequestHandler,),
+                       {"protocol_version": "HTTP/1.0"})
+        return LegacyHTTPServer(("", port), handler)
+    
+    # TCP_NODELAY: headers and body are separate writes, which on a kept-alive
+    # connection would otherwise wait on the client's delayed ACK (~40 ms per request)
+    handler = type("KeepAliveRequestHandler", (CustomHTTPRequestHandler,),
+                   {"protocol_version": "HTTP/1.1", "timeout": keepalive_timeout,
+                    "disable_nagle_algorithm": True})
+    return IrisHTTPServer(("", port), handler, max_connections=max_connections, backlog=backlog,
+                          max_event_streams=max_event_streams)
+
+
+def start_server(port=PORT, legacy=False, max_connections=MAX_CONNECTIONS,
+                 keepalive_timeout=KEEPALIVE_TIMEOUT, backlog=LISTEN_BACKLOG,
+                 max_event_streams=MAX_EVENT_STREAMS):
     """Start the HTTP server"""
     os.chdir(PROJECT_ROOT)
     
-    handler = CustomHTTPRequestHandler
-    
-    with socketserver.TCPServer(("", PORT), handler) as httpd:
+    with make_server(port, legacy, max_connections, keepalive_timeout, backlog, max_event_streams) as httpd:
         print("=" * 60)
         print("IRIS#1 - Digital Biometrics Server")
         print("=" * 60)
-        print(f"\n🌐 Server running at: http://localhost:{PORT}")
-        print(f"📁 Frontend: http://localhost:{PORT}/index.html")
-        print(f"📊 Data API: http://localhost:{PORT}/data/codes_index.json")
+        print(f"\n🌐 Server running at: http://localhost:{port}")
+        print(f"📁 Frontend: http://localhost:{port}/index.html")
+        print(f"📊 Data API: http://localhost:{port}/data/codes_index.json")
+        print(f"🔁 Delta API: http://localhost:{port}/api/codes?since=0")
+        print(f"📡 Events:    http://localhost:{port}/api/events")
+        if legacy:
+            print("\n⚠️  Legacy mode: one request at a time, no keep-alive (event streams block other requests)")
+        else:
+            print(f"\n⚙️  Up to {max_connections} connections ({max_event_streams} event streams), "
+                  f"keep-alive {keepalive_timeout:g}s")
         print("\nPress Ctrl+C to stop\n")
         
         try:
@@ -105,6 +602,25 @@ def start_server():
         except KeyboardInterrupt:
             print("\n\n👋 Server stopped")
 
-if __name__ == "__main__":
-    start_server()
 
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Serve the frontend and data files.")
+    parser.add_argument("--port", type=int, default=PORT)
+    parser.add_argument("--max-connections", type=int, default=MAX_CONNECTIONS,
+                        help="concurrent connections, including open event streams")
+    parser.add_argument("--keepalive-timeout", type=float, default=KEEPALIVE_TIMEOUT,
+                        help="seconds an idle keep-alive connection stays open")
+    parser.add_argument("--backlog", type=int, default=LISTEN_BACKLOG,
+                        help="connections queued while all slots are busy")
+    parser.add_argument("--max-event-streams", type=int, default=MAX_EVENT_STREAMS,
+                        help="open /api/events streams; displays beyond this poll instead")
+    parser.add_argument("--legacy", action="store_true",
+                        help="original single-threaded HTTP/1.0 server")
+    args = parser.parse_args(argv)
+    
+    start_server(args.port, args.legacy, args.max_connections, args.keepalive_timeout, args.backlog,
+                 args.max_event_streams)
+
+
+if __name__ == "__main__":
+    main()